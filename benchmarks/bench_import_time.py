@@ -0,0 +1,81 @@
+"""
+Benchmark of the import time of the modules of each function, as paid at the
+cold start of its Lambda: pydantic, the models package of the common layer,
+the deferred diff models on first use, and the modules of the function using
+the models.
+
+    python benchmarks/bench_import_time.py [--runs 5]
+
+Every run imports the modules in a fresh process, and the median time per step
+is reported in milliseconds. The index modules aren't imported, as they fetch
+secrets at import.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAYER = os.path.join(ROOT, "resources", "layers", "common", "src")
+
+# The modules of each function that import the models, in import order
+FUNCTIONS = {
+    "fetcher": ["controllers.session_controller"],
+    "slack_notifier": ["slack_message"],
+}
+
+MEASURE = """
+import importlib, json, sys, time
+sys.path[:0] = {paths!r}
+times = {{}}
+started = time.perf_counter()
+import pydantic
+times["pydantic"] = time.perf_counter() - started
+started = time.perf_counter()
+import models
+times["models"] = time.perf_counter() - started
+started = time.perf_counter()
+for module in {modules!r}:
+    importlib.import_module(module)
+times["function modules"] = time.perf_counter() - started
+started = time.perf_counter()
+models.ReInventSessionListDiff
+times["diff models on first use"] = time.perf_counter() - started
+print(json.dumps(times))
+"""
+
+
+def measure(function: str) -> dict:
+    paths = [os.path.join(ROOT, "resources", "functions", function), LAYER]
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            MEASURE.format(paths=paths, modules=FUNCTIONS[function]),
+        ],
+        env=os.environ | {"AWS_DEFAULT_REGION": "us-east-1"},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'function':<16}{'step':<28}{'import time':>14}")
+    for function in FUNCTIONS:
+        runs = [measure(function) for _ in range(args.runs)]
+        for step in runs[0]:
+            milliseconds = statistics.median(run[step] for run in runs) * 1000
+            print(f"{function:<16}{step:<28}{milliseconds:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
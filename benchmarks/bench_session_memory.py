@@ -0,0 +1,106 @@
+"""
+Memory benchmark of the sessions held by the fetcher during a sync: the
+baseline loaded from the database and the list of the API, with and without
+the interning of the tags and repeated strings (SESSION_INTERNING).
+
+    python benchmarks/bench_session_memory.py [--sessions 2500]
+
+Every mode runs in its own process, which reports its peak RSS and the RSS
+still used by the sessions once the raw inputs are freed.
+"""
+
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "resources", "layers", "common", "src"))
+sys.path.append(os.path.join(ROOT, "tools", "replay"))
+
+MODES = ("off", "on")
+
+
+def current_rss() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize()
+
+
+def write_inputs(directory: str, count: int) -> None:
+    """The body of the API list and the items of the database, as JSON"""
+    from catalog import generate_sessions
+    from models import ReInventSession
+
+    raw_sessions = generate_sessions(count)
+    with open(os.path.join(directory, "body.json"), "w") as body:
+        json.dump({"data": raw_sessions}, body)
+    items = [
+        {"PK": "ReInventSession", "SK": raw["thirdPartyID"]}
+        | ReInventSession(**raw).model_dump(mode="json")
+        for raw in raw_sessions
+    ]
+    with open(os.path.join(directory, "items.json"), "w") as items_file:
+        json.dump(items, items_file)
+
+
+def measure(directory: str) -> None:
+    """Load both lists, like a sync, and print the RSS in bytes as JSON"""
+    from models import classify_sessions, validate_session_list_json
+
+    gc.collect()
+    started_rss = current_rss()
+    with open(os.path.join(directory, "body.json"), "rb") as body_file:
+        body = body_file.read()
+    with open(os.path.join(directory, "items.json")) as items_file:
+        items = json.load(items_file)
+
+    baseline = classify_sessions(items)
+    sessions = validate_session_list_json(body)
+    del body, items
+    gc.collect()
+
+    print(
+        json.dumps(
+            {
+                "sessions": len(baseline) + len(sessions),
+                "peak": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+                "retained": current_rss() - started_rss,
+            }
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=2500)
+    parser.add_argument("--measure", metavar="DIRECTORY", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_inputs(directory, args.sessions)
+        print(f"{'SESSION_INTERNING':<20}{'peak RSS':>12}{'retained RSS':>16}")
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", directory],
+                env=os.environ | {"SESSION_INTERNING": mode},
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.splitlines()[-1])
+            print(
+                f"{mode:<20}{result['peak'] / 1e6:>9.1f} MB"
+                f"{result['retained'] / 1e6:>13.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
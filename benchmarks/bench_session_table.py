@@ -0,0 +1,97 @@
+"""
+Benchmark of filters and aggregates over the sessions: a Python loop over the
+list of sessions against the NumPy operations of their SessionTable.
+
+    python benchmarks/bench_session_table.py [--sessions 2500] [--number 100]
+
+Reports the best time per operation in milliseconds, and the time to build the
+table of the sessions and to convert it back. The sessions are generated, see
+tools/replay/catalog.py.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from collections import Counter, defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "resources", "layers", "common", "src"))
+sys.path.append(os.path.join(ROOT, "tools", "analysis"))
+sys.path.append(os.path.join(ROOT, "tools", "replay"))
+
+from catalog import generate_sessions  # noqa: E402
+from models import classify_sessions  # noqa: E402
+from session_table import SessionTable  # noqa: E402
+
+
+def loop_filter(sessions, topic):
+    return [
+        index
+        for index, session in enumerate(sessions)
+        if topic in session.topics and session.level == 300
+    ]
+
+
+def table_filter(table, topic):
+    return (table.contains("topics", topic) & table.equals("level", 300)).nonzero()[0]
+
+
+def loop_group_by(sessions):
+    groups = defaultdict(list)
+    for index, session in enumerate(sessions):
+        for service in session.services:
+            groups[service].append(index)
+    return groups
+
+
+def loop_value_counts(sessions):
+    return Counter(session.trackName for session in sessions)
+
+
+def best_milliseconds(function, number: int, repeat: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=2500)
+    parser.add_argument("--number", type=int, default=100, help="calls per repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sessions = classify_sessions(generate_sessions(args.sessions))
+    table = SessionTable.from_sessions(sessions)
+    topic = table.lists["topics"].values[0]
+    assert loop_filter(sessions, topic) == table_filter(table, topic).tolist()
+
+    operations = {
+        "filter by topic and level": (
+            lambda: loop_filter(sessions, topic),
+            lambda: table_filter(table, topic),
+        ),
+        "group by service": (
+            lambda: loop_group_by(sessions),
+            lambda: table.group_by("services"),
+        ),
+        "count by track": (
+            lambda: loop_value_counts(sessions),
+            lambda: table.value_counts("trackName"),
+        ),
+    }
+    print(f"{args.sessions} sessions")
+    for name, function in (
+        ("SessionTable.from_sessions", lambda: SessionTable.from_sessions(sessions)),
+        ("SessionTable.to_sessions", table.to_sessions),
+    ):
+        milliseconds = best_milliseconds(function, 1, args.repeat)
+        print(f"{name:<30}{milliseconds:>9.2f} ms")
+    print(f"{'operation':<30}{'loop':>12}{'table':>12}")
+    for name, (loop, vectorized) in operations.items():
+        loop_milliseconds = best_milliseconds(loop, args.number, args.repeat)
+        table_milliseconds = best_milliseconds(vectorized, args.number, args.repeat)
+        print(f"{name:<30}{loop_milliseconds:>9.3f} ms{table_milliseconds:>9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark of the validation of the sessions list response into sessions: the
+per-dict construction of the decoded response, the validation of the dicts as
+a batch, the sessions streamed from the body chunks by ijson, and the
+validation of the raw body bytes as a batch, also into lazy sessions.
+
+    python benchmarks/bench_session_validation.py [--sessions 2500] [--number 3]
+
+Reports the best time per response in milliseconds, and the peak of the memory
+allocated while validating, as traced by tracemalloc. The body is a generated
+catalog shaped like the portal's sessions list, see tools/replay/catalog.py.
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "resources", "functions", "fetcher"))
+sys.path.append(os.path.join(ROOT, "resources", "layers", "common", "src"))
+sys.path.append(os.path.join(ROOT, "tools", "replay"))
+
+from catalog import generate_sessions  # noqa: E402
+from models import (  # noqa: E402
+    ReInventSession,
+    classify_sessions,
+    to_session,
+    validate_session_list_json,
+)
+from sessions_api.json_stream import iter_json_items  # noqa: E402
+from sessions_api.session_list import SESSIONS_STREAM_CHUNK_SIZE  # noqa: E402
+
+
+def per_dict_construction(body: bytes):
+    return [ReInventSession(**raw) for raw in json.loads(body)["data"]]
+
+
+def batch_validation(body: bytes):
+    return classify_sessions(json.loads(body)["data"])
+
+
+def streamed_batch_validation(body: bytes):
+    chunks = (
+        body[start : start + SESSIONS_STREAM_CHUNK_SIZE]
+        for start in range(0, len(body), SESSIONS_STREAM_CHUNK_SIZE)
+    )
+    return classify_sessions(iter_json_items(chunks, "data.item"))
+
+
+def lazy_streamed_batch_validation(body: bytes):
+    chunks = (
+        body[start : start + SESSIONS_STREAM_CHUNK_SIZE]
+        for start in range(0, len(body), SESSIONS_STREAM_CHUNK_SIZE)
+    )
+    return classify_sessions(iter_json_items(chunks, "data.item"), lazy=True)
+
+
+def json_batch_validation(body: bytes):
+    return validate_session_list_json(body)
+
+
+def lazy_json_batch_validation(body: bytes):
+    return validate_session_list_json(body, lazy=True)
+
+
+def traced_peak(function, body: bytes) -> int:
+    tracemalloc.start()
+    function(body)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=2500)
+    parser.add_argument("--number", type=int, default=3, help="calls per repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = json.dumps({"data": generate_sessions(args.sessions)}).encode("utf-8")
+    functions = {
+        "json.loads + ReInventSession(**raw)": per_dict_construction,
+        "json.loads + classify_sessions": batch_validation,
+        "ijson stream + classify_sessions": streamed_batch_validation,
+        "ijson stream + classify_sessions (lazy)": lazy_streamed_batch_validation,
+        "validate_session_list_json": json_batch_validation,
+        "validate_session_list_json (lazy)": lazy_json_batch_validation,
+    }
+    expected = per_dict_construction(body)
+    print(f"{args.sessions} sessions, {len(body)} bytes")
+    print(f"{'validation':<40}{'time':>12}{'peak memory':>16}")
+    for name, function in functions.items():
+        assert [to_session(session) for session in function(body)] == expected
+        times = timeit.repeat(
+            lambda: function(body), number=args.number, repeat=args.repeat
+        )
+        milliseconds = min(times) / args.number * 1000
+        megabytes = traced_peak(function, body) / 1e6
+        print(f"{name:<40}{milliseconds:>9.1f} ms{megabytes:>13.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
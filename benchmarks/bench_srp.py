@@ -0,0 +1,96 @@
+"""
+Microbenchmarks of the SRP math of the Cognito authentication, for every
+available big integer backend.
+
+    python benchmarks/bench_srp.py [--number 20] [--repeat 5]
+
+Reports the best time per call in milliseconds, so the CPU cost of the
+authentication can be tracked for small Lambda memory sizes (which get a
+proportional share of a vCPU).
+"""
+
+import argparse
+import base64
+import os
+import sys
+import timeit
+from typing import Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "resources", "functions", "fetcher"))
+sys.path.append(os.path.join(ROOT, "resources", "layers", "common", "src"))
+
+from srp import aws_srp, bigint  # noqa: E402
+from srp.key_pool import EphemeralKeyPool  # noqa: E402
+
+POOL_ID = "us-east-1_benchmark"
+USERNAME = "benchmark-user"
+PASSWORD = "benchmark-password"
+SALT_HEX = "8f3e6b2a1c5d4e7f9a0b1c2d3e4f5a6b"
+SECRET_BLOCK = base64.standard_b64encode(bytes(range(256)) * 4).decode("utf-8")
+
+
+def available_backends():
+    backends = ["python"]
+    if bigint.gmpy2 is not None:
+        backends.append("gmpy2")
+    return backends
+
+
+def create_srp(key_pool: Optional[EphemeralKeyPool] = None) -> aws_srp.AWSSRP:
+    if key_pool is None:
+        # Without keys in the pool, the key pair is generated on the spot
+        key_pool = EphemeralKeyPool(aws_srp.generate_ephemeral_key, size=0)
+    # The client is never called by the benchmarked functions
+    return aws_srp.AWSSRP(
+        username=USERNAME,
+        password=PASSWORD,
+        pool_id=POOL_ID,
+        client_id="benchmark",
+        client=object(),
+        key_pool=key_pool,
+    )
+
+
+def benchmarks(calls: int):
+    key_pool = EphemeralKeyPool(aws_srp.generate_ephemeral_key, size=calls)
+    key_pool.fill()
+    srp = create_srp()
+    server_b = pow(aws_srp.G, 0xC0FFEE, aws_srp.BIG_N)
+    challenge = {
+        "USER_ID_FOR_SRP": USERNAME,
+        "SALT": SALT_HEX,
+        "SRP_B": aws_srp.long_to_hex(server_b),
+        "SECRET_BLOCK": SECRET_BLOCK,
+    }
+    return {
+        "generate_ephemeral_key": aws_srp.generate_ephemeral_key,
+        "calculate_u": lambda: aws_srp.calculate_u(srp.large_a_value, server_b),
+        "get_password_authentication_key": lambda: (
+            srp.get_password_authentication_key(USERNAME, PASSWORD, server_b, SALT_HEX)
+        ),
+        "process_challenge": lambda: srp.process_challenge(challenge),
+        "AWSSRP()": create_srp,
+        "AWSSRP() with a filled key pool": lambda: create_srp(key_pool=key_pool),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=20, help="calls per repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'benchmark':<36}" + "".join(f"{b:>12}" for b in available_backends()))
+    results = {}
+    for backend in available_backends():
+        bigint.mod_pow = bigint.load_backend(backend)
+        for name, function in benchmarks(args.number * args.repeat).items():
+            times = timeit.repeat(function, number=args.number, repeat=args.repeat)
+            results.setdefault(name, []).append(min(times) / args.number * 1000)
+    for name, milliseconds in results.items():
+        print(f"{name:<36}" + "".join(f"{ms:>9.3f} ms" for ms in milliseconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark of the hashing steps of the SRP key derivation: the hex string
+based implementation (kept here as the reference) against the bytes based
+one of srp.aws_srp.
+
+    python benchmarks/bench_srp_hashing.py [--number 2000]
+
+Reports the time per call, and the peak of the memory allocated by a call as
+traced by tracemalloc, which grows with the intermediate strings and buffers.
+The modular exponentiations are not part of it, they are the same for both.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "resources", "functions", "fetcher"))
+sys.path.append(os.path.join(ROOT, "resources", "layers", "common", "src"))
+
+from srp.aws_srp import (  # noqa: E402
+    BIG_N,
+    G,
+    bytes_hash_to_long,
+    calculate_u,
+    compute_hkdf,
+    hash_sha256,
+    hex_hash,
+    hex_to_long,
+    long_to_hex,
+    pad_bytes,
+    pad_hex,
+    pad_hex_bytes,
+)
+
+BIG_A = pow(G, 0xA11CE, BIG_N)
+BIG_B = pow(G, 0xB0B, BIG_N)
+S_VALUE = pow(G, 0x5EC12E7, BIG_N)
+SALT = "8f3e6b2a1c5d4e7f9a0b1c2d3e4f5a6b"
+USERNAME_PASSWORD = "poolbenchmark-user:benchmark-password".encode("utf-8")
+
+
+def hex_hashing():
+    u_value = hex_to_long(hex_hash(pad_hex(BIG_A) + pad_hex(BIG_B)))
+    username_password_hash = hash_sha256(USERNAME_PASSWORD)
+    x_value = hex_to_long(hex_hash(pad_hex(SALT) + username_password_hash))
+    hkdf = compute_hkdf(
+        bytearray.fromhex(pad_hex(S_VALUE)),
+        bytearray.fromhex(pad_hex(long_to_hex(u_value))),
+    )
+    return u_value, x_value, hkdf
+
+
+def bytes_hashing():
+    u_value = calculate_u(BIG_A, BIG_B)
+    username_password_hash = hashlib.sha256(USERNAME_PASSWORD).digest()
+    x_value = bytes_hash_to_long(pad_hex_bytes(SALT) + username_password_hash)
+    hkdf = compute_hkdf(pad_bytes(S_VALUE), pad_bytes(u_value))
+    return u_value, x_value, hkdf
+
+
+def traced_peak(function) -> int:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - baseline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=2000, help="calls per repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    assert hex_hashing() == bytes_hashing()
+    print(f"{'implementation':<16}{'time per call':>16}{'peak memory':>16}")
+    for name, function in (("hex strings", hex_hashing), ("bytes", bytes_hashing)):
+        times = timeit.repeat(function, number=args.number, repeat=args.repeat)
+        microseconds = min(times) / args.number * 1e6
+        print(f"{name:<16}{microseconds:>13.1f} us{traced_peak(function):>10} bytes")
+
+
+if __name__ == "__main__":
+    main()
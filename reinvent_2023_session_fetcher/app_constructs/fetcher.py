@@ -1,6 +1,7 @@
 from aws_cdk import (
     Duration,
     aws_lambda as lambda_,
+    aws_s3 as s3,
     aws_secretsmanager as secretsmanager,
     aws_dynamodb as dynamodb,
 )
@@ -13,7 +14,10 @@ class Fetcher(Construct):
         scope: Construct,
         id: str,
         ddb_table: dynamodb.Table,
+        state_table: dynamodb.Table,
         credential_secret: secretsmanager.Secret,
+        auth_secret: secretsmanager.Secret,
+        archive_bucket: s3.Bucket,
         common_layer: lambda_.LayerVersion,
         **kwargs
     ):
@@ -32,10 +36,17 @@ class Fetcher(Construct):
                 "POWERTOOLS_SERVICE_NAME": "reinvent2023_session_fetcher",
                 "LOG_LEVEL": "INFO",
                 "CREDENTIAL_SECRET_NAME": credential_secret.secret_name,
+                "STATE_TABLE_NAME": state_table.table_name,
+                "AUTH_SECRET_NAME": auth_secret.secret_name,
+                "ARCHIVE_BUCKET_NAME": archive_bucket.bucket_name,
             },
             memory_size=1024,
             timeout=Duration.seconds(30),
         )
 
         credential_secret.grant_read(function)
+        auth_secret.grant_read(function)
+        auth_secret.grant_write(function)
         ddb_table.grant_read_write_data(function)
+        state_table.grant_read_write_data(function)
+        archive_bucket.grant_read_write(function)
@@ -2,6 +2,7 @@ from aws_cdk import (
     RemovalPolicy,
     aws_dynamodb as dynamodb,
     aws_lambda as lambda_,
+    aws_s3 as s3,
     aws_secretsmanager as secretsmanager,
 )
 from constructs import Construct
@@ -25,6 +26,21 @@ class Storage(Construct):
             removal_policy=RemovalPolicy.DESTROY,
         )
 
+        # Table for the state of the fetcher kept across invocations. It is
+        # separate from the sessions table, so the state never reaches the
+        # consumers of the sessions stream.
+        self.state_table = dynamodb.Table(
+            scope=self,
+            id="FetcherStateTable",
+            partition_key=dynamodb.Attribute(
+                name="PK", type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(name="SK", type=dynamodb.AttributeType.STRING),
+            encryption=dynamodb.TableEncryption.AWS_MANAGED,
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+
         # Secret for the Reinvent website user credentials
         self.credentials_secret = secretsmanager.Secret(
             scope=self,
@@ -32,6 +48,24 @@ class Storage(Construct):
             removal_policy=RemovalPolicy.DESTROY,
         )
 
+        # Secret for the portal authentication of the fetcher: the cookies and
+        # the Cognito refresh token
+        self.auth_secret = secretsmanager.Secret(
+            scope=self,
+            id="FetcherAuthSecret",
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+
+        # Bucket for the archive of the raw sessions list responses
+        self.archive_bucket = s3.Bucket(
+            scope=self,
+            id="ReInventSessionArchiveBucket",
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            enforce_ssl=True,
+            removal_policy=RemovalPolicy.DESTROY,
+            auto_delete_objects=True,
+        )
+
         self.common_layer = lambda_.LayerVersion(
             scope=self,
             id="CommonFunctionLayer",
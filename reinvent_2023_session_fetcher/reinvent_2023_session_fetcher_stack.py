@@ -21,7 +21,10 @@ class Reinvent2023SessionFetcherStack(Stack):
             scope=self,
             id="Fetcher",
             credential_secret=storage.credentials_secret,
+            auth_secret=storage.auth_secret,
             ddb_table=storage.table,
+            state_table=storage.state_table,
+            archive_bucket=storage.archive_bucket,
             common_layer=storage.common_layer,
         )
 
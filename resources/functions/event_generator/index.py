@@ -3,10 +3,11 @@ import json
 from decimal import Decimal
 import os
 from typing import Any, Dict
-import boto3
 from boto3.dynamodb.types import TypeDeserializer
 from deepdiff import DeepDiff
 
+from aws_clients import get_client
+
 
 class EventType(enum.Enum):
     SessionAdded = "SessionAdded"
@@ -23,6 +24,10 @@ class DecimalEncoder(json.JSONEncoder):
 
 EVENT_BUS_NAME = os.environ["EVENT_BUS_NAME"]
 EVENT_SOURCE = "ReInventSessionFetcher"
+SESSION_ITEM_PK = "ReInventSession"
+# Attributes the fetcher stores with a session for its own bookkeeping, which
+# are not part of the session
+BOOKKEEPING_ATTRIBUTES = ("contentHash",)
 
 
 EVENT_TYPE_MAP = {
@@ -31,12 +36,16 @@ EVENT_TYPE_MAP = {
     "REMOVE": EventType.SessionRemoved,
 }
 
-client = boto3.client("events")
 deserializer = TypeDeserializer()
 
 
 def handler(event: Dict[str, Any], _context: Any) -> None:
     for session_mutation_event in event["Records"]:
+        # Only sessions result in events, e.g. not the fetcher state that the
+        # table used to hold
+        if session_mutation_event["dynamodb"]["Keys"]["PK"]["S"] != SESSION_ITEM_PK:
+            continue
+
         match EVENT_TYPE_MAP.get(session_mutation_event["eventName"]):
             case EventType.SessionAdded:
                 _handle_session_added(session_mutation_event)
@@ -46,23 +55,22 @@ def handler(event: Dict[str, Any], _context: Any) -> None:
                 _handle_session_removed(session_mutation_event)
 
 
-def _handle_session_added(event: dict):
-    deserialized_session = {
+def _deserialize_session(image: dict) -> dict:
+    return {
         key: deserializer.deserialize(value)
-        for key, value in event["dynamodb"]["NewImage"].items()
+        for key, value in image.items()
+        if key not in BOOKKEEPING_ATTRIBUTES
     }
+
+
+def _handle_session_added(event: dict):
+    deserialized_session = _deserialize_session(event["dynamodb"]["NewImage"])
     _send_event_to_event_bridge(EventType.SessionAdded, deserialized_session)
 
 
 def _handle_session_update(event: dict):
-    deserialized_old_session = {
-        key: deserializer.deserialize(value)
-        for key, value in event["dynamodb"]["OldImage"].items()
-    }
-    deserialized_new_session = {
-        key: deserializer.deserialize(value)
-        for key, value in event["dynamodb"]["NewImage"].items()
-    }
+    deserialized_old_session = _deserialize_session(event["dynamodb"]["OldImage"])
+    deserialized_new_session = _deserialize_session(event["dynamodb"]["NewImage"])
 
     diff = DeepDiff(
         deserialized_old_session,
@@ -81,15 +89,12 @@ def _handle_session_update(event: dict):
 
 
 def _handle_session_removed(event: dict):
-    deserialized_session = {
-        key: deserializer.deserialize(value)
-        for key, value in event["dynamodb"]["OldImage"].items()
-    }
+    deserialized_session = _deserialize_session(event["dynamodb"]["OldImage"])
     _send_event_to_event_bridge(EventType.SessionRemoved, deserialized_session)
 
 
 def _send_event_to_event_bridge(detail_type: EventType, event: dict):
-    client.put_events(
+    get_client("events").put_events(
         Entries=[
             {
                 "Source": EVENT_SOURCE,
@@ -0,0 +1,145 @@
+import json
+import os
+import shutil
+import tempfile
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import BinaryIO, Optional
+
+from aws_clients import get_client
+from botocore.exceptions import ClientError
+
+# zlib window bits that produce a gzip container
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class ArchiveBackend(ABC):
+    """Storage for the archived responses and the index of the runs"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def put(self, key: str, file: BinaryIO) -> None:
+        ...
+
+    @abstractmethod
+    def add_index_entry(self, timestamp: str, digest: str) -> None:
+        ...
+
+
+class LocalDirectoryArchive(ArchiveBackend):
+    """Archive in a local directory, with the index as a JSON lines file"""
+
+    def __init__(self, directory: str):
+        self._directory = directory
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self._directory, key))
+
+    def put(self, key: str, file: BinaryIO) -> None:
+        path = os.path.join(self._directory, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as archive_file:
+            shutil.copyfileobj(file, archive_file)
+        os.replace(path + ".tmp", path)
+
+    def add_index_entry(self, timestamp: str, digest: str) -> None:
+        os.makedirs(self._directory, exist_ok=True)
+        with open(os.path.join(self._directory, "index.jsonl"), "a") as index_file:
+            index_file.write(json.dumps({"timestamp": timestamp, "digest": digest}))
+            index_file.write("\n")
+
+
+class S3Archive(ArchiveBackend):
+    """
+    Archive in an S3 bucket. An endpoint URL can be given to use an S3
+    compatible store instead, e.g. a local MinIO. Every index entry is a
+    separate object, so runs never have to read and rewrite the index.
+    """
+
+    def __init__(self, bucket_name: str, endpoint_url: Optional[str] = None):
+        self._bucket_name = bucket_name
+        self._s3_client = get_client("s3", endpoint_url=endpoint_url)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self._s3_client.head_object(Bucket=self._bucket_name, Key=key)
+            return True
+        except ClientError as error:
+            if error.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return False
+            raise
+
+    def put(self, key: str, file: BinaryIO) -> None:
+        self._s3_client.upload_fileobj(
+            file,
+            self._bucket_name,
+            key,
+            ExtraArgs={"ContentType": "application/json", "ContentEncoding": "gzip"},
+        )
+
+    def add_index_entry(self, timestamp: str, digest: str) -> None:
+        self._s3_client.put_object(
+            Bucket=self._bucket_name,
+            Key=f"index/{timestamp}.json",
+            Body=json.dumps({"timestamp": timestamp, "digest": digest}),
+            ContentType="application/json",
+        )
+
+
+class ArchiveWriter:
+    """Gzip compresses a response body into a temporary file while it streams"""
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._compressor = zlib.compressobj(wbits=GZIP_WBITS)
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(self._compressor.compress(chunk))
+
+    def finish(self) -> BinaryIO:
+        self._file.write(self._compressor.flush())
+        self._file.seek(0)
+        return self._file
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ResponseArchive:
+    """
+    Content addressed archive of raw sessions list responses. Responses are
+    stored compressed under their SHA-256 digest, so identical responses are
+    stored once, and every run adds an entry to the index.
+    """
+
+    def __init__(self, backend: ArchiveBackend):
+        self._backend = backend
+
+    @staticmethod
+    def object_key(digest: str) -> str:
+        return f"objects/{digest[:2]}/{digest}.json.gz"
+
+    def open_writer(self) -> ArchiveWriter:
+        return ArchiveWriter()
+
+    def store(self, writer: ArchiveWriter, digest: str) -> None:
+        """Store the response written to the writer, unless it is archived already"""
+        try:
+            key = self.object_key(digest)
+            if self._backend.exists(key):
+                print(f"Response {digest} is already archived")
+            else:
+                print(f"Archiving response {digest}")
+                self._backend.put(key, writer.finish())
+        finally:
+            writer.close()
+        self.add_run(digest)
+
+    def add_run(self, digest: str) -> None:
+        """Record that the current run received the response with the given digest"""
+        timestamp = datetime.now(timezone.utc).isoformat()
+        self._backend.add_index_entry(timestamp, digest)
@@ -1,18 +1,26 @@
 from decimal import Decimal
-from typing import List, Optional, Dict
-import boto3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 import json
 import re
 from deepdiff import DeepDiff
 from boto3.dynamodb.types import TypeDeserializer
 
+from aws_clients import get_client, get_resource
+
 from models import (
+    AnySession,
     ReInventSession,
     ReInventSessionListDiff,
     ReInventSessionDiff,
     ReInventSessionFieldDiff,
+    classify_sessions,
+    content_hash,
+    to_session,
 )
 
+# Attribute of the session items with the content hash of the session
+CONTENT_HASH_ATTRIBUTE = "contentHash"
+
 
 class DecimalEncoder(json.JSONEncoder):
     def default(self, o):
@@ -22,16 +30,20 @@ class DecimalEncoder(json.JSONEncoder):
 
 
 class SessionController:
-    def __init__(self, ddb_table_name: str):
+    def __init__(self, ddb_table_name: str, lazy: bool = False):
+        """With lazy=True, the sessions are loaded as LazyReInventSession"""
         self._ddb_table_name = ddb_table_name
-        self._ddb_client = boto3.client("dynamodb")
-        self._ddb_resource = boto3.resource("dynamodb")
+        self._lazy = lazy
+        self._ddb_client = get_client("dynamodb")
+        self._ddb_resource = get_resource("dynamodb")
         self._deserializer = TypeDeserializer()
+        # Content hashes of the sessions of the database, by session UID
+        self._content_hashes: Dict[str, str] = {}
 
         self._table = self._ddb_resource.Table(self._ddb_table_name)
         self.sessions = self._init_from_db()
 
-    def _init_from_db(self) -> List[ReInventSession]:
+    def _init_from_db(self) -> List[AnySession]:
         """Load all sessions from the database"""
         paginator = self._ddb_client.get_paginator("query")
         response_iterator = paginator.paginate(
@@ -41,29 +53,31 @@ class SessionController:
             ExpressionAttributeValues={":val": {"S": "ReInventSession"}},
         )
 
-        session_list = []
-        # Iterate through the paginated results
+        # Deserialize the items of the paginated results as they are classified
+        return classify_sessions(
+            self._deserialize_items(response_iterator), lazy=self._lazy
+        )
+
+    def _deserialize_items(
+        self, response_iterator: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """The items of the pages, without their content hash, which is kept"""
         for page in response_iterator:
-            items = page["Items"]
-            # Do something with the items returned (e.g., print them)
-            for item in items:
-                deserialized_item = {
+            for item in page["Items"]:
+                stored_hash = item.pop(CONTENT_HASH_ATTRIBUTE, None)
+                if stored_hash is not None and "sessionUid" in item:
+                    self._content_hashes[item["sessionUid"]["S"]] = stored_hash["S"]
+                yield {
                     key: self._deserializer.deserialize(value)
                     for key, value in item.items()
                 }
 
-                session_list.append(ReInventSession(**deserialized_item))
-        return session_list
-
     def insert_new_sessions(self, new_session_list: List[ReInventSession]):
         """Insert new sessions into the database"""
         # Use the DDB batch write API to insert new sessions
 
         for session in new_session_list:
-            item_data = {
-                "PK": "ReInventSession",
-                "SK": session.thirdPartyID,
-            } | session.model_dump()
+            item_data = self._session_item(session)
 
             # Add a condition expression to prevent overwriting existing items
             condition_expression = (
@@ -83,13 +97,19 @@ class SessionController:
     def update_sessions(self, updated_session_list: List[ReInventSession]):
         """Update sessions in the database"""
         for session in updated_session_list:
-            item_data = {
-                "PK": "ReInventSession",
-                "SK": session.thirdPartyID,
-            } | session.model_dump()
+            item_data = self._session_item(session)
 
             self._table.put_item(Item=item_data)
 
+    @staticmethod
+    def _session_item(session: ReInventSession) -> Dict[str, Any]:
+        """The item of a session, with its content hash to diff it later"""
+        return (
+            {"PK": "ReInventSession", "SK": session.thirdPartyID}
+            | session.model_dump()
+            | {CONTENT_HASH_ATTRIBUTE: content_hash(session)}
+        )
+
     def remove_sessions(self, session_list: List[ReInventSession]):
         """Insert new sessions into the database"""
         # Use the DDB batch write API to insert new sessions
@@ -102,23 +122,30 @@ class SessionController:
             )
 
     def generate_diff(
-        self, new_session_list: List[ReInventSession]
+        self, new_session_list: Sequence[AnySession]
     ) -> ReInventSessionListDiff:
-        """Generate a diff between the current sessions and the new ones."""
+        """
+        Generate a diff between the current sessions and the new ones. The
+        sessions present in both are compared by their content hash first, the
+        stored one for the sessions of the database, and only diffed field by
+        field when it differs. Lazy sessions are only decoded when they are
+        added, removed or changed.
+        """
         added_sessions: Dict[str, ReInventSession] = {}
         removed_sessions: Dict[str, ReInventSession] = {}
         updated_sessions: Dict[str, ReInventSessionDiff] = {}
         not_updated_sessions: List[str] = []
 
         old_sessions_map = {session.sessionUid: session for session in self.sessions}
+        new_session_ids = {session.sessionUid for session in new_session_list}
 
         # If a session from the database is not present in the new list, it is removed
         for old_session_id in old_sessions_map:
-            if old_session_id not in [
-                session.sessionUid for session in new_session_list
-            ]:
+            if old_session_id not in new_session_ids:
                 # Add it to the list of removed sessions
-                removed_sessions[old_session_id] = old_sessions_map[old_session_id]
+                removed_sessions[old_session_id] = to_session(
+                    old_sessions_map[old_session_id]
+                )
                 print(
                     f"Session {old_session_id} ({old_sessions_map[old_session_id].thirdPartyID}) is removed"
                 )
@@ -127,16 +154,28 @@ class SessionController:
             # If a new session is not present in the old list, it is added
             if new_session.sessionUid not in old_sessions_map:
                 # Add it to the list of added sessions
-                added_sessions[new_session.sessionUid] = new_session
+                added_sessions[new_session.sessionUid] = to_session(new_session)
                 print(
                     f"Session {new_session.sessionUid} ({new_session.thirdPartyID}) is added"
                 )
 
             # If a session is present in both lists, it might be updated
             if new_session.sessionUid in old_sessions_map:
+                old_session = old_sessions_map[new_session.sessionUid]
+                # Sessions with equal content hashes have no diff, the items
+                # written before the hashes were stored get theirs computed
+                old_hash = self._content_hashes.get(new_session.sessionUid)
+                if old_hash is None:
+                    old_hash = content_hash(old_session)
+                if content_hash(new_session) == old_hash:
+                    not_updated_sessions.append(new_session.sessionUid)
+                    continue
+                old_session = to_session(old_session)
+                new_session = to_session(new_session)
+
                 # Check if there are differences between the old session and the new one
                 session_field_diff = self.get_session_diff(
-                    session_a=old_sessions_map[new_session.sessionUid],
+                    session_a=old_session,
                     session_b=new_session,
                 )
 
@@ -144,7 +183,7 @@ class SessionController:
                 # including the differences found.
                 if session_field_diff:
                     updated_sessions[new_session.sessionUid] = ReInventSessionDiff(
-                        old_session=old_sessions_map[new_session.sessionUid],
+                        old_session=old_session,
                         new_session=new_session,
                         changed_fields=session_field_diff,
                     )
@@ -1,19 +1,54 @@
 import json
 import os
-from typing import Any, Dict, Tuple, List
+from typing import Any, Callable, Dict, Optional, Tuple, List
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+from archive import LocalDirectoryArchive, ResponseArchive, S3Archive
 from sessions_api import fetch_sessions
+from sessions_api.auth_cache import AuthCache
+from sessions_api.deadline import Deadline
+from sessions_api.metrics import metrics
+from sessions_api.session_list import SessionList, SessionListPartitioning, SyncState
+from sessions_api.timing import timed
+from sessions_api.state_store import (
+    DynamoDBStateStore,
+    FileStateStore,
+    InMemoryStateStore,
+    SecretsManagerStateStore,
+    StateStore,
+)
 from controllers.session_controller import SessionController
-from models import ReInventSession
-import boto3
+from srp.aws_srp import EPHEMERAL_KEY_POOL
+from models import LazyReInventSession, classify_sessions, validate_session_list_json
+from aws_clients import get_client
 
 CREDENTIAL_SECRET_NAME = os.environ["CREDENTIAL_SECRET_NAME"]
 DDB_TABLE_NAME = os.environ["DDB_TABLE_NAME"]
+# Optional persistent storage for state kept across invocations, like the
+# portal authentication. Without it, state only survives in warm containers.
+STATE_TABLE_NAME = os.environ.get("STATE_TABLE_NAME")
+STATE_DIRECTORY = os.environ.get("STATE_DIRECTORY")
+# Optional secret for the portal authentication (cookies and refresh token),
+# which is otherwise kept in the state store
+AUTH_SECRET_NAME = os.environ.get("AUTH_SECRET_NAME")
+# Optional partitioning of the sessions list request: a query parameter and a
+# comma separated list of its values, which are requested concurrently.
+SESSIONS_PARTITION_PARAMETER = os.environ.get("SESSIONS_PARTITION_PARAMETER")
+SESSIONS_PARTITION_VALUES = os.environ.get("SESSIONS_PARTITION_VALUES")
+SESSIONS_PARTITION_WORKERS = int(os.environ.get("SESSIONS_PARTITION_WORKERS", "4"))
+# Optional archive of the raw sessions list responses: an S3 bucket (with an
+# optional endpoint URL for S3 compatible stores) or a local directory.
+ARCHIVE_BUCKET_NAME = os.environ.get("ARCHIVE_BUCKET_NAME")
+ARCHIVE_ENDPOINT_URL = os.environ.get("ARCHIVE_ENDPOINT_URL")
+ARCHIVE_DIRECTORY = os.environ.get("ARCHIVE_DIRECTORY")
+# Minimal remaining time to start fetching the sessions, and to start syncing
+# them to the database
+MIN_FETCH_SECONDS = 5.0
+MIN_SYNC_SECONDS = 5.0
 
 
 def load_credentials() -> Tuple[str, str]:
-    secretsmanager_client = boto3.client("secretsmanager")
+    secretsmanager_client = get_client("secretsmanager")
     secret_value = secretsmanager_client.get_secret_value(
         SecretId=CREDENTIAL_SECRET_NAME
     )
@@ -26,23 +61,150 @@ def load_credentials() -> Tuple[str, str]:
     return username, password
 
 
+def create_state_store() -> StateStore:
+    if STATE_TABLE_NAME:
+        return DynamoDBStateStore(table_name=STATE_TABLE_NAME)
+    if STATE_DIRECTORY:
+        return FileStateStore(directory=STATE_DIRECTORY)
+    return InMemoryStateStore()
+
+
+def create_auth_store(state_store: StateStore) -> StateStore:
+    if AUTH_SECRET_NAME:
+        return SecretsManagerStateStore(secret_id=AUTH_SECRET_NAME)
+    return state_store
+
+
+def create_partitioning() -> Optional[SessionListPartitioning]:
+    if not SESSIONS_PARTITION_PARAMETER or not SESSIONS_PARTITION_VALUES:
+        return None
+    return SessionListPartitioning(
+        parameter=SESSIONS_PARTITION_PARAMETER,
+        values=[value.strip() for value in SESSIONS_PARTITION_VALUES.split(",")],
+        max_workers=SESSIONS_PARTITION_WORKERS,
+    )
+
+
+def create_archive() -> Optional[ResponseArchive]:
+    if ARCHIVE_BUCKET_NAME:
+        return ResponseArchive(
+            S3Archive(
+                bucket_name=ARCHIVE_BUCKET_NAME, endpoint_url=ARCHIVE_ENDPOINT_URL
+            )
+        )
+    if ARCHIVE_DIRECTORY:
+        return ResponseArchive(LocalDirectoryArchive(directory=ARCHIVE_DIRECTORY))
+    return None
+
+
+def archive_best_effort(step: str, action: Callable[[], None]) -> None:
+    """Run a step of the archive, which must never fail the sync"""
+    try:
+        action()
+    except Exception as error:
+        print(f"{step} failed, continuing without it: {error!r}")
+
+
 USERNAME, PASSWORD = load_credentials()
+STATE_STORE = create_state_store()
+AUTH_CACHE = AuthCache(store=create_auth_store(STATE_STORE))
+PARTITIONING = create_partitioning()
+ARCHIVE = create_archive()
+# Precompute the SRP ephemeral keys during the init phase
+EPHEMERAL_KEY_POOL.fill()
+
+
+@metrics.log_metrics
+def handler(_event: Dict[str, Any], context: LambdaContext) -> None:
+    deadline = Deadline.from_context(context)
+    # Abort early when the invocation can't even cover the fetch
+    deadline.check("Fetching the sessions", MIN_FETCH_SECONDS)
+
+    sync_state = SyncState.load(STATE_STORE)
+
+    # Fetch sessions from the API. The response body is downloaded as a whole
+    # before it is validated, see below.
+    raw_sessions = fetch_sessions(
+        username=USERNAME,
+        password=PASSWORD,
+        stream=True,
+        auth_cache=AUTH_CACHE,
+        sync_state=sync_state,
+        partitioning=PARTITIONING,
+        deadline=deadline,
+    )
+    if raw_sessions.not_modified:
+        print("Sessions list is not modified since the last sync, bailing.")
+        raw_sessions.close()
+        if ARCHIVE is not None and sync_state.digest is not None:
+            archive_best_effort(
+                "Archiving the run", lambda: ARCHIVE.add_run(sync_state.digest)
+            )
+        return
+
+    # Archive the raw response while it streams. The partitions of a
+    # partitioned fetch are already consumed, so they are not archived.
+    archive_writer = None
+    if ARCHIVE is not None and isinstance(raw_sessions, SessionList):
+        archive_writer = ARCHIVE.open_writer()
+        raw_sessions.add_chunk_listener(archive_writer.write)
+
+    # The whole body is downloaded before it is validated. Its digest is then
+    # known first, so an unchanged list is not validated at all, which is the
+    # common case. Validating the downloaded body in one pass is also faster
+    # than validating the sessions while they stream, for a higher peak memory:
+    # about 150 ms and 28 MB instead of 250 ms and 8 MB for 2500 sessions, see
+    # benchmarks/bench_session_validation.py. The sessions are lazy, their
+    # description and tags are only decoded for the sessions that are added,
+    # removed or changed.
+    session_models_from_api: List[LazyReInventSession] = []
+    try:
+        body = raw_sessions.read() if isinstance(raw_sessions, SessionList) else None
+        unchanged = raw_sessions.digest == sync_state.digest
+        if not unchanged and body is not None:
+            with timed("SessionsListDecode"):
+                session_models_from_api = validate_session_list_json(body, lazy=True)
+        elif not unchanged:
+            session_models_from_api = classify_sessions(raw_sessions, lazy=True)
+        # Don't keep the body in memory during the sync
+        del body
+    except Exception:
+        # Remove the temporary file of a response that won't be archived
+        if archive_writer is not None:
+            archive_writer.close()
+        raise
 
+    if (
+        archive_writer is not None
+        and archive_writer.write in raw_sessions.failed_listeners
+    ):
+        # The writer missed chunks of the response, don't archive a partial copy
+        print("Archiving the response skipped, writing it failed")
+        archive_writer.close()
+    elif archive_writer is not None:
+        archive_best_effort(
+            "Archiving the response",
+            lambda: ARCHIVE.store(archive_writer, raw_sessions.digest),
+        )
 
-def handler(_event: Dict[str, Any], _context: LambdaContext) -> None:
-    # Fetch sessions from the API
-    raw_sessions = fetch_sessions(username=USERNAME, password=PASSWORD)
-    session_models_from_api: List[ReInventSession] = [
-        ReInventSession(**raw_session) for raw_session in raw_sessions
-    ]
+    # If the response is identical to the one of the last sync, there is
+    # nothing to compare with the database.
+    if unchanged:
+        print("Sessions list is identical to the last sync, bailing.")
+        raw_sessions.sync_state().save(STATE_STORE)
+        return
 
     # If no sessions are found, bail. This is defensive, to avoid purging
     # the table in case of a bug.
     if not session_models_from_api:
         raise RuntimeError("No sessions found, bailing.")
 
+    # Abort before touching the database when the sync does not fit anymore,
+    # the next run will pick up the changes
+    deadline.check("Syncing the sessions", MIN_SYNC_SECONDS)
+
     # Create a SessionController instance
-    session_controller = SessionController(ddb_table_name=DDB_TABLE_NAME)
+    session_controller = SessionController(ddb_table_name=DDB_TABLE_NAME, lazy=True)
 
     # Generate the diff between the sessions in the databaseand the sessions from the API
     diff = session_controller.generate_diff(new_session_list=session_models_from_api)
@@ -58,6 +220,9 @@ def handler(_event: Dict[str, Any], _context: LambdaContext) -> None:
         ]
     )
 
+    # Remember the synced list, so an unchanged list can be skipped next time
+    raw_sessions.sync_state().save(STATE_STORE)
+
     ## ??? Profit
 
 
@@ -1,47 +1,85 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from requests.sessions import RequestsCookieJar
-from srp.aws_srp import AWSSRP
-from typing import Dict, Tuple
+from urllib3.util.request import ACCEPT_ENCODING
+from srp.aws_srp import (
+    AWSSRP,
+    EPHEMERAL_KEY_POOL,
+    authenticate_with_refresh_token,
+)
+from typing import Any, Dict, List, Optional, Tuple, Union
+from botocore.config import Config
+import boto3
+from aws_clients import get_client
 import json
+import os
 import re
 import requests
 
+from .auth_cache import AuthCache, AuthState
+from .deadline import MAX_ATTEMPTS, Deadline
+from .http_client import create_http_session
+from .timing import instrument_client, timed
+from .session_list import (
+    MergedSessionList,
+    SessionList,
+    SessionListPartitioning,
+    SyncState,
+)
+
 
 COGNITO_CLIENT_ID = "4mbpjh0cd78jbbu5kc5i9717v"
 USER_POOL_ID = "us-east-1_iu3YTdfT3"
 
-ROOT_DOMAIN = "https://hub.reinvent.awsevents.com"
+# The portal URLs can be overridden to run against a local stand-in of the
+# portal, see tools/replay
+ROOT_DOMAIN = os.environ.get("PORTAL_ROOT_URL", "https://hub.reinvent.awsevents.com")
 ATTENDEE_PORTAL_URL = f"{ROOT_DOMAIN}/attendee-portal/"
 SESSIONS_URL = f"{ROOT_DOMAIN}/attendee-portal-api/sessions/list/"
-GET_COOKIES_URL = (
-    "https://hub.reinvent.awsevents.com/auth/login/cognito/?code={code}&state={state}"
+GET_COOKIES_URL = ROOT_DOMAIN + "/auth/login/cognito/?code={code}&state={state}"
+STORAGE_URL = os.environ.get(
+    "PORTAL_STORAGE_URL",
+    "https://28ym3tywek.execute-api.us-east-1.amazonaws.com/storage",
 )
-STORAGE_URL = "https://28ym3tywek.execute-api.us-east-1.amazonaws.com/storage"
 REDACT_LOGS = True
+# Status codes of the sessions list call when the cookies are not (or no longer) valid
+UNAUTHENTICATED_STATUS_CODES = (401, 302)
+# Timeouts of the individual calls, they are capped by the remaining time of
+# the invocation. The sessions list timeout applies to every read of the body.
+HANDSHAKE_STEP_TIMEOUT_SECONDS = 5.0
+COGNITO_TIMEOUT_SECONDS = 5.0
+SESSIONS_LIST_TIMEOUT_SECONDS = 10.0
 
 
-def call_attendee_portal_url(session: requests.Session) -> str:
+def call_attendee_portal_url(session: requests.Session, deadline: Deadline) -> str:
     print(f"Calling Attendee Portal URL: {ATTENDEE_PORTAL_URL}")
-    response = session.get(
-        ATTENDEE_PORTAL_URL,
-        allow_redirects=False,
-        headers={
-            "accept-encoding": "deflate, gzip",
-            "authority": "hub.reinvent.awsevents.com",
-            "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-            "accept-language": "en-US,en;q=0.9",
-            "cache-control": "no-cache",
-            "pragma": "no-cache",
-            "sec-ch-ua": '"Not/A)Brand";v="99", "Google Chrome";v="115", "Chromium";v="115"',
-            "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": '"macOS"',
-            "sec-fetch-dest": "document",
-            "sec-fetch-mode": "navigate",
-            "sec-fetch-site": "none",
-            "sec-fetch-user": "?1",
-            "upgrade-insecure-requests": "1",
-            "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
-        },
-    )
+    with timed("AttendeePortal") as timing:
+        response = deadline.call(
+            "Attendee Portal URL",
+            lambda timeout: session.get(
+                ATTENDEE_PORTAL_URL,
+                timeout=timeout,
+                allow_redirects=False,
+                headers={
+                    "accept-encoding": "deflate, gzip",
+                    "authority": "hub.reinvent.awsevents.com",
+                    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+                    "accept-language": "en-US,en;q=0.9",
+                    "cache-control": "no-cache",
+                    "pragma": "no-cache",
+                    "sec-ch-ua": '"Not/A)Brand";v="99", "Google Chrome";v="115", "Chromium";v="115"',
+                    "sec-ch-ua-mobile": "?0",
+                    "sec-ch-ua-platform": '"macOS"',
+                    "sec-fetch-dest": "document",
+                    "sec-fetch-mode": "navigate",
+                    "sec-fetch-site": "none",
+                    "sec-fetch-user": "?1",
+                    "upgrade-insecure-requests": "1",
+                    "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
+                },
+            ),
+            budget_seconds=HANDSHAKE_STEP_TIMEOUT_SECONDS,
+        )
+        timing.observe(response)
 
     if response.status_code != 302:
         raise Exception(
@@ -62,12 +100,19 @@ def call_attendee_portal_url(session: requests.Session) -> str:
     return redirect_location
 
 
-def call_login_url(session: requests.Session, url) -> str:
+def call_login_url(session: requests.Session, url, deadline: Deadline) -> str:
     print(f"Calling login URL: {redact(url)}")
-    response = session.get(
-        url,
-        allow_redirects=False,
-    )
+    with timed("Login") as timing:
+        response = deadline.call(
+            "Login URL",
+            lambda timeout: session.get(
+                url,
+                timeout=timeout,
+                allow_redirects=False,
+            ),
+            budget_seconds=HANDSHAKE_STEP_TIMEOUT_SECONDS,
+        )
+        timing.observe(response)
 
     if response.status_code != 302:
         raise Exception(
@@ -88,12 +133,21 @@ def call_login_url(session: requests.Session, url) -> str:
     return redirect_location
 
 
-def call_authorize_url(session: requests.Session, url) -> Tuple[str, str]:
+def call_authorize_url(
+    session: requests.Session, url, deadline: Deadline
+) -> Tuple[str, str]:
     print(f"Calling Authorize URL: {redact(url)}")
-    response = session.get(
-        url,
-        allow_redirects=False,
-    )
+    with timed("Authorize") as timing:
+        response = deadline.call(
+            "Authorize URL",
+            lambda timeout: session.get(
+                url,
+                timeout=timeout,
+                allow_redirects=False,
+            ),
+            budget_seconds=HANDSHAKE_STEP_TIMEOUT_SECONDS,
+        )
+        timing.observe(response)
 
     if response.status_code != 302:
         raise Exception(
@@ -143,21 +197,63 @@ def redact(string: str) -> str:
         return string
 
 
-def get_tokens(username: str, password: str) -> Tuple[str, str, str]:
+def get_tokens(
+    username: str,
+    password: str,
+    deadline: Deadline,
+    refresh_token: Optional[str] = None,
+) -> Tuple[str, str, str]:
+    """
+    Get the cognito tokens. When a refresh token is given, the tokens are
+    renewed with it and the SRP authentication is only the fallback.
+    """
     print(f"Getting cognito tokens")
-
-    # Get tokens
-    aws = AWSSRP(
-        username=username,
-        password=password,
-        pool_id=USER_POOL_ID,
-        client_id=COGNITO_CLIENT_ID,
-        pool_region="us-east-1",
+    timeout = deadline.timeout("Cognito authentication", COGNITO_TIMEOUT_SECONDS)
+    config = Config(
+        connect_timeout=timeout,
+        read_timeout=timeout,
+        retries={"total_max_attempts": MAX_ATTEMPTS, "mode": "standard"},
     )
-    tokens = aws.authenticate_user()
+    if timeout >= COGNITO_TIMEOUT_SECONDS:
+        cognito_client = get_client(
+            "cognito-idp", region_name="us-east-1", config=config
+        )
+    else:
+        # Close to the deadline, a dedicated client with the capped timeouts
+        cognito_client = boto3.client(
+            "cognito-idp", region_name="us-east-1", config=config
+        )
+    # Time the SRP initiate and respond calls, and the refresh token call
+    instrument_client(cognito_client, "Cognito")
+
+    tokens = None
+    if refresh_token is not None:
+        try:
+            tokens = authenticate_with_refresh_token(
+                client=cognito_client,
+                client_id=COGNITO_CLIENT_ID,
+                refresh_token=refresh_token,
+            )
+            print(" - Renewed tokens with refresh token")
+        except cognito_client.exceptions.NotAuthorizedException:
+            print(" - Refresh token was rejected, falling back to SRP")
+
+    if tokens is None:
+        deadline.check("SRP authentication")
+        aws = AWSSRP(
+            username=username,
+            password=password,
+            pool_id=USER_POOL_ID,
+            client_id=COGNITO_CLIENT_ID,
+            client=cognito_client,
+        )
+        tokens = aws.authenticate_user()
+        # Replace the used ephemeral key, while the handshake waits for the network
+        EPHEMERAL_KEY_POOL.refill_in_background()
 
     access_token = tokens["AuthenticationResult"]["AccessToken"]
-    refresh_token = tokens["AuthenticationResult"]["RefreshToken"]
+    # REFRESH_TOKEN_AUTH does not return a new refresh token, keep using the old one
+    refresh_token = tokens["AuthenticationResult"].get("RefreshToken", refresh_token)
     id_token = tokens["AuthenticationResult"]["IdToken"]
     print(f" - access_token: {redact(access_token)}")
     print(f" - refresh_token: {redact(refresh_token)}")
@@ -167,58 +263,74 @@ def get_tokens(username: str, password: str) -> Tuple[str, str, str]:
 
 
 def perform_storage_call(
-    session: requests.Session, authorization_code, access_token, refresh_token, id_token
+    session: requests.Session,
+    authorization_code,
+    access_token,
+    refresh_token,
+    id_token,
+    deadline: Deadline,
 ) -> None:
     print(f"Calling Storage URL: {STORAGE_URL}")
-    response = session.post(
-        url=STORAGE_URL,
-        headers={
-            "accept": "application/json, text/plain, */*",
-            "accept-language": "en-US,en;q=0.9",
-            "cache-control": "no-cache",
-            "content-type": "application/json",
-            "pragma": "no-cache",
-            "sec-ch-ua": '"Not/A)Brand";v="99", "Google Chrome";v="115", "Chromium";v="115"',
-            "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": '"macOS"',
-            "sec-fetch-dest": "empty",
-            "sec-fetch-mode": "cors",
-            "sec-fetch-site": "cross-site",
-        },
-        data=json.dumps(
-            {
-                "authorization_code": authorization_code,
-                "id_token": id_token,
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-            }
-        ),
-    )
+    # Not retried, the call is not known to be idempotent
+    with timed("Storage") as timing:
+        response = session.post(
+            url=STORAGE_URL,
+            timeout=deadline.timeout("Storage URL", HANDSHAKE_STEP_TIMEOUT_SECONDS),
+            headers={
+                "accept": "application/json, text/plain, */*",
+                "accept-language": "en-US,en;q=0.9",
+                "cache-control": "no-cache",
+                "content-type": "application/json",
+                "pragma": "no-cache",
+                "sec-ch-ua": '"Not/A)Brand";v="99", "Google Chrome";v="115", "Chromium";v="115"',
+                "sec-ch-ua-mobile": "?0",
+                "sec-ch-ua-platform": '"macOS"',
+                "sec-fetch-dest": "empty",
+                "sec-fetch-mode": "cors",
+                "sec-fetch-site": "cross-site",
+            },
+            data=json.dumps(
+                {
+                    "authorization_code": authorization_code,
+                    "id_token": id_token,
+                    "access_token": access_token,
+                    "refresh_token": refresh_token,
+                }
+            ),
+        )
+        timing.observe(response)
     print(f" - Status code: {response.status_code}")
 
 
 def get_cookies(
-    session: requests.Session, authorization_code, state_code
+    session: requests.Session, authorization_code, state_code, deadline: Deadline
 ) -> RequestsCookieJar:
     cookies_url = GET_COOKIES_URL.format(code=authorization_code, state=state_code)
     print(f"Cookies URL: {redact(cookies_url)}")
-    response = session.get(
-        cookies_url,
-        allow_redirects=False,
-        headers={
-            "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-            "accept-language": "en-US,en;q=0.9",
-            "cache-control": "no-cache",
-            "pragma": "no-cache",
-            "sec-ch-ua": '"Not/A)Brand";v="99", "Google Chrome";v="115", "Chromium";v="115"',
-            "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": '"macOS"',
-            "sec-fetch-dest": "document",
-            "sec-fetch-mode": "navigate",
-            "sec-fetch-site": "same-site",
-            "upgrade-insecure-requests": "1",
-        },
-    )
+    with timed("Cookies") as timing:
+        response = deadline.call(
+            "Cookies URL",
+            lambda timeout: session.get(
+                cookies_url,
+                timeout=timeout,
+                allow_redirects=False,
+                headers={
+                    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+                    "accept-language": "en-US,en;q=0.9",
+                    "cache-control": "no-cache",
+                    "pragma": "no-cache",
+                    "sec-ch-ua": '"Not/A)Brand";v="99", "Google Chrome";v="115", "Chromium";v="115"',
+                    "sec-ch-ua-mobile": "?0",
+                    "sec-ch-ua-platform": '"macOS"',
+                    "sec-fetch-dest": "document",
+                    "sec-fetch-mode": "navigate",
+                    "sec-fetch-site": "same-site",
+                    "upgrade-insecure-requests": "1",
+                },
+            ),
+            budget_seconds=HANDSHAKE_STEP_TIMEOUT_SECONDS,
+        )
+        timing.observe(response)
     if response.status_code != 302:
         raise Exception(
             f"Response status code should be 302, but is {response.status_code}"
@@ -229,20 +341,271 @@ def get_cookies(
     return response.cookies
 
 
-def fetch_sessions(username: str, password: str):
-    session = requests.Session()
-    attendee_portal_redirect_location = call_attendee_portal_url(session)
-    login_redirect_location = call_login_url(session, attendee_portal_redirect_location)
-    authorization_code, state_code = call_authorize_url(
-        session, login_redirect_location
+def log_abandoned_tokens(tokens_future: Future) -> None:
+    """Log the error of a cognito authentication the handshake gave up on"""
+    if not tokens_future.cancelled() and tokens_future.exception() is not None:
+        print(f"Abandoned cognito authentication failed: {tokens_future.exception()!r}")
+
+
+def perform_handshake(
+    username: str,
+    password: str,
+    deadline: Deadline,
+    previous_auth_state: Optional[AuthState] = None,
+) -> AuthState:
+    """
+    Run the full portal login flow and return the resulting authentication.
+    The refresh token of a previous authentication is reused while it is valid.
+    """
+    previous_refresh_token = None
+    if (
+        previous_auth_state is not None
+        and previous_auth_state.has_valid_refresh_token()
+    ):
+        previous_refresh_token = previous_auth_state.refresh_token
+
+    session = create_http_session()
+    # The handshake consists of two independent branches that join at the
+    # storage call: the cognito authentication runs in a worker thread, while
+    # the portal redirect chain runs on this thread.
+    executor = ThreadPoolExecutor(max_workers=1)
+    tokens_future = executor.submit(
+        get_tokens,
+        username,
+        password,
+        deadline,
+        refresh_token=previous_refresh_token,
     )
-    access_token, refresh_token, id_token = get_tokens(username, password)
+    try:
+        attendee_portal_redirect_location = call_attendee_portal_url(session, deadline)
+        login_redirect_location = call_login_url(
+            session, attendee_portal_redirect_location, deadline
+        )
+        authorization_code, state_code = call_authorize_url(
+            session, login_redirect_location, deadline
+        )
+    except BaseException:
+        # Fail without waiting for cognito, its outcome is only logged
+        tokens_future.add_done_callback(log_abandoned_tokens)
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    try:
+        access_token, refresh_token, id_token = tokens_future.result()
+    finally:
+        executor.shutdown(wait=False)
+
     perform_storage_call(
-        session, authorization_code, access_token, refresh_token, id_token
+        session, authorization_code, access_token, refresh_token, id_token, deadline
     )
 
-    cookies = get_cookies(session, authorization_code, state_code)
+    cookies = get_cookies(session, authorization_code, state_code, deadline)
+
+    return AuthState.from_handshake(
+        cookies=cookies,
+        access_token=access_token,
+        refresh_token=refresh_token,
+        # A renewed authentication keeps the expiry of the refresh token it used
+        refresh_token_expires_at=(
+            previous_auth_state.refresh_token_expires_at
+            if previous_refresh_token is not None
+            and refresh_token == previous_refresh_token
+            else None
+        ),
+    )
+
+
+def call_sessions_url(
+    cookies: RequestsCookieJar,
+    stream: bool,
+    deadline: Deadline,
+    sync_state: Optional[SyncState] = None,
+    params: Optional[Dict[str, str]] = None,
+) -> requests.Response:
+    print(f"Calling Sessions URL: {SESSIONS_URL}")
+    with timed("SessionsList") as timing:
+        # Don't follow redirects, a redirect means the cookies are not accepted
+        response = deadline.call(
+            "Sessions URL",
+            lambda timeout: create_http_session().get(
+                SESSIONS_URL,
+                timeout=timeout,
+                cookies=cookies,
+                allow_redirects=False,
+                stream=stream,
+                # Negotiate a compressed body, brotli is only offered when the
+                # brotli package is installed
+                headers={"accept-encoding": ACCEPT_ENCODING}
+                | (sync_state.conditional_headers() if sync_state is not None else {}),
+                params=params,
+            ),
+            budget_seconds=SESSIONS_LIST_TIMEOUT_SECONDS,
+        )
+        timing.observe(response, body_read=not stream)
+    print(f" - Status code: {response.status_code}")
+    return response
+
+
+def read_partition(
+    response: requests.Response, deadline: Deadline
+) -> Optional[Tuple[List[Dict[str, Any]], str]]:
+    """Read the sessions and digest of a partition, None if it is not available"""
+    if response.status_code != 200:
+        response.close()
+        return None
+    session_list = SessionList(response, deadline)
+    return list(session_list), session_list.digest
+
+
+def partition_coverage_problem(
+    partitioning: SessionListPartitioning,
+    partitions: List[Tuple[List[Dict[str, Any]], str]],
+) -> Optional[str]:
+    """
+    Why the partitions can't be trusted to cover the whole list, None if they
+    can. An empty partition means the partition values are wrong or incomplete,
+    and partitions with the same body or with sessions of other partitions
+    mean the portal ignores the parameter. Merging them would drop sessions,
+    which the sync then deletes.
+    """
+    digests = set()
+    for value, (sessions, digest) in zip(partitioning.values, partitions):
+        if not sessions:
+            return f"partition {value} is empty"
+        if digest in digests:
+            return f"partition {value} is identical to another partition"
+        digests.add(digest)
+        for session in sessions:
+            session_value = session.get(partitioning.parameter)
+            if session_value is not None and str(session_value) != value:
+                return f"partition {value} has sessions of {session_value}"
+    return None
+
+
+def fetch_session_partitions(
+    cookies: RequestsCookieJar,
+    partitioning: SessionListPartitioning,
+    first_response: requests.Response,
+    deadline: Deadline,
+) -> Optional[MergedSessionList]:
+    """
+    Fetch the partitions of the sessions list concurrently, given the response
+    for the first partition. Returns None when a partition is not available, or
+    when the partitions don't cover the whole list.
+    """
+
+    def fetch_partition(value: str) -> Optional[Tuple[List[Dict[str, Any]], str]]:
+        return read_partition(
+            call_sessions_url(
+                cookies, True, deadline, params={partitioning.parameter: value}
+            ),
+            deadline,
+        )
+
+    with ThreadPoolExecutor(max_workers=partitioning.max_workers) as executor:
+        futures = [executor.submit(read_partition, first_response, deadline)] + [
+            executor.submit(fetch_partition, value) for value in partitioning.values[1:]
+        ]
+        partitions = [future.result() for future in futures]
+
+    if any(partition is None for partition in partitions):
+        return None
+    problem = partition_coverage_problem(partitioning, partitions)
+    if problem is not None:
+        print(f" - Partitions don't cover the sessions list: {problem}")
+        return None
+    return MergedSessionList(partitions)
+
+
+def fetch_sessions(
+    username: str,
+    password: str,
+    stream: bool = False,
+    auth_cache: Optional[AuthCache] = None,
+    sync_state: Optional[SyncState] = None,
+    partitioning: Optional[SessionListPartitioning] = None,
+    deadline: Optional[Deadline] = None,
+) -> Union[List[Dict[str, Any]], SessionList, MergedSessionList]:
+    """
+    Fetch all sessions from the attendee portal.
+
+    With stream=True a SessionList is returned that yields the sessions one at
+    a time while the response body is still being downloaded, instead of the
+    fully decoded list. In this mode the sync state of the last successful sync
+    can be given, to make the list call conditional.
+
+    When an auth cache is given, a still valid cached authentication is used
+    for the list call directly. The login handshake only runs when there is no
+    valid cached authentication, or when the portal rejects it.
+
+    When a partitioning is given, the list is requested once per partition
+    value, concurrently, and the results are merged into a MergedSessionList.
+    If a partition is not available, or the partitions don't cover the whole
+    list, a single list request is made instead.
+
+    Every call gets a timeout within the given deadline, and a
+    DeadlineExceededError is raised when the remaining time runs out.
+    """
+    if deadline is None:
+        deadline = Deadline.from_context(None)
+
+    if partitioning is not None:
+        # The partitions are always streamed, and can't be conditional
+        stream_list = True
+        list_sync_state = None
+        params = {partitioning.parameter: partitioning.values[0]}
+    else:
+        stream_list = stream
+        list_sync_state = sync_state if stream else None
+        params = None
+
+    list_response = None
+
+    auth_state = auth_cache.load() if auth_cache is not None else None
+    if auth_state is not None:
+        print("Using cached portal authentication")
+        list_response = call_sessions_url(
+            auth_state.cookie_jar(), stream_list, deadline, list_sync_state, params
+        )
+        if list_response.status_code in UNAUTHENTICATED_STATUS_CODES:
+            print(" - Cached portal authentication was rejected")
+            list_response.close()
+            auth_cache.invalidate()
+            list_response = None
+
+    if list_response is None:
+        auth_state = perform_handshake(
+            username,
+            password,
+            deadline,
+            previous_auth_state=auth_cache.get() if auth_cache is not None else None,
+        )
+        if auth_cache is not None:
+            auth_cache.save(auth_state)
+        list_response = call_sessions_url(
+            auth_state.cookie_jar(), stream_list, deadline, list_sync_state, params
+        )
+
+    if partitioning is not None:
+        merged_sessions = fetch_session_partitions(
+            auth_state.cookie_jar(), partitioning, list_response, deadline
+        )
+        if merged_sessions is not None:
+            return merged_sessions if stream else list(merged_sessions)
+
+        print("Partitioned fetch is not available, falling back to a single request")
+        list_response = call_sessions_url(
+            auth_state.cookie_jar(), stream, deadline, sync_state if stream else None
+        )
+
+    if list_response.status_code not in (200, 304):
+        list_response.close()
+        raise Exception(
+            f"Response status code should be 200 or 304, but is {list_response.status_code}"
+        )
+
+    if stream:
+        return SessionList(list_response, deadline)
 
-    list_response = requests.get(SESSIONS_URL, cookies=cookies)
-    sessions: Dict = list_response.json()["data"]
+    with timed("SessionsListDecode"):
+        sessions: List[Dict[str, Any]] = list_response.json()["data"]
     return sessions
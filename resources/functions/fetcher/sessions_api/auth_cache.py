@@ -0,0 +1,121 @@
+import base64
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+from requests.cookies import RequestsCookieJar, create_cookie
+
+from .state_store import StateStore
+
+AUTH_CACHE_KEY = "portal-auth"
+# Consider the cached authentication expired a bit earlier than it actually
+# is, so it does not run out in the middle of a fetch.
+EXPIRY_MARGIN_SECONDS = 60
+# Cognito does not expose the validity of refresh tokens, this is the default
+# of Cognito app clients. A refresh token that is rejected earlier only costs
+# a fallback to the SRP authentication.
+REFRESH_TOKEN_VALIDITY_SECONDS = 30 * 24 * 60 * 60
+
+
+def get_token_expiry(token: str) -> float:
+    """Read the expiry timestamp ("exp" claim) of a JWT, without verifying it"""
+    payload = token.split(".")[1]
+    # JWTs use unpadded base64url encoding
+    payload += "=" * (-len(payload) % 4)
+    return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+
+
+class AuthState(BaseModel):
+    """The outcome of the portal authentication handshake"""
+
+    cookies: List[Dict[str, Any]]
+    expires_at: float
+    refresh_token: Optional[str] = None
+    refresh_token_expires_at: float = 0.0
+
+    @classmethod
+    def from_handshake(
+        cls,
+        cookies: RequestsCookieJar,
+        access_token: str,
+        refresh_token: Optional[str] = None,
+        refresh_token_expires_at: Optional[float] = None,
+    ) -> "AuthState":
+        if refresh_token is not None and refresh_token_expires_at is None:
+            refresh_token_expires_at = time.time() + REFRESH_TOKEN_VALIDITY_SECONDS
+
+        expiries = [get_token_expiry(access_token)] + [
+            cookie.expires for cookie in cookies if cookie.expires
+        ]
+        return cls(
+            cookies=[
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "expires": cookie.expires,
+                    "secure": cookie.secure,
+                }
+                for cookie in cookies
+            ],
+            expires_at=min(expiries),
+            refresh_token=refresh_token,
+            refresh_token_expires_at=refresh_token_expires_at or 0.0,
+        )
+
+    def is_valid(self, now: Optional[float] = None) -> bool:
+        """Whether the cookies can still be used"""
+        now = time.time() if now is None else now
+        return now < self.expires_at - EXPIRY_MARGIN_SECONDS
+
+    def has_valid_refresh_token(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return (
+            self.refresh_token is not None
+            and now < self.refresh_token_expires_at - EXPIRY_MARGIN_SECONDS
+        )
+
+    def cookie_jar(self) -> RequestsCookieJar:
+        jar = RequestsCookieJar()
+        for cookie in self.cookies:
+            jar.set_cookie(create_cookie(**cookie))
+        return jar
+
+
+class AuthCache:
+    """
+    Caches the portal authentication in memory for warm containers, and
+    optionally in a persistent state store for cold starts.
+    """
+
+    def __init__(self, store: Optional[StateStore] = None):
+        self._store = store
+        self._state: Optional[AuthState] = None
+
+    def get(self) -> Optional[AuthState]:
+        """Return the cached authentication, also when its cookies are expired"""
+        if self._state is None and self._store is not None:
+            document = self._store.get(AUTH_CACHE_KEY)
+            if document is not None:
+                self._state = AuthState(**document)
+        return self._state
+
+    def load(self) -> Optional[AuthState]:
+        """Return the cached authentication, if its cookies are still valid"""
+        auth_state = self.get()
+        if auth_state is None or not auth_state.is_valid():
+            return None
+        return auth_state
+
+    def save(self, state: AuthState) -> None:
+        self._state = state
+        if self._store is not None:
+            self._store.put(AUTH_CACHE_KEY, state.model_dump())
+
+    def invalidate(self) -> None:
+        """Mark the cached cookies as expired, the refresh token is kept"""
+        auth_state = self.get()
+        if auth_state is not None:
+            self.save(auth_state.model_copy(update={"expires_at": 0.0}))
@@ -0,0 +1,69 @@
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+import requests
+
+# Time kept free at the end of the invocation, to fail with a clear error
+# instead of being killed by the Lambda timeout
+SAFETY_MARGIN_SECONDS = 1.0
+# Budget used when there is no Lambda context, e.g. when running locally
+DEFAULT_BUDGET_SECONDS = 30.0
+# Don't start a request when less than this is left for it
+MIN_TIMEOUT_SECONDS = 0.5
+# Number of attempts for requests that fail with a connection error or timeout
+MAX_ATTEMPTS = 2
+
+T = TypeVar("T")
+
+
+class DeadlineExceededError(Exception):
+    """Raised when the remaining time can't cover the next step"""
+
+
+class Deadline:
+    """The point in time the current invocation has to be done by"""
+
+    def __init__(self, budget_seconds: float):
+        self._expires_at = time.monotonic() + budget_seconds - SAFETY_MARGIN_SECONDS
+
+    @classmethod
+    def from_context(cls, context: Optional[Any]) -> "Deadline":
+        """Create the deadline from the remaining time of a LambdaContext"""
+        if context is None:
+            return cls(DEFAULT_BUDGET_SECONDS)
+        return cls(context.get_remaining_time_in_millis() / 1000)
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def check(self, step: str, required_seconds: float = MIN_TIMEOUT_SECONDS) -> None:
+        """Raise a DeadlineExceededError if less than the required time is left"""
+        remaining = self.remaining()
+        if remaining < required_seconds:
+            raise DeadlineExceededError(
+                f"{step} needs {required_seconds:.1f}s, but only {remaining:.1f}s is left"
+            )
+
+    def timeout(self, step: str, budget_seconds: float) -> float:
+        """The timeout for a step: its budget, capped by the remaining time"""
+        self.check(step)
+        return min(budget_seconds, self.remaining())
+
+    def call(
+        self,
+        step: str,
+        request: Callable[[float], T],
+        budget_seconds: float,
+        attempts: int = MAX_ATTEMPTS,
+    ) -> T:
+        """
+        Call request with the timeout for the step, and retry it when it fails
+        with a connection error or timeout, as long as the deadline allows.
+        """
+        for attempt in range(1, attempts + 1):
+            try:
+                return request(self.timeout(step, budget_seconds))
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if attempt == attempts:
+                    raise
+                print(f" - {step} failed ({error.__class__.__name__}), retrying")
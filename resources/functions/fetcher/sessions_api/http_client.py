@@ -0,0 +1,46 @@
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Number of hosts a connection pool is kept for (portal, storage API, ...)
+POOL_CONNECTIONS = 4
+# Number of keep-alive connections kept per host
+POOL_MAXSIZE = 8
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter that sets connection_reused on its responses. A response is
+    counted as reused when its pool did not open a new connection for it, which
+    is approximate while requests to the same host run concurrently.
+    """
+
+    def send(self, request, **kwargs) -> requests.Response:
+        pool = self.poolmanager.connection_from_url(request.url)
+        connections = pool.num_connections
+        response = super().send(request, **kwargs)
+        response.connection_reused = pool.num_connections == connections
+        return response
+
+
+_http_adapter: Optional[HTTPAdapter] = None
+
+
+def create_http_session() -> requests.Session:
+    """
+    Create an HTTP session for portal calls. All sessions share one connection
+    pool, which is created once per container, so warm invocations reuse its
+    keep-alive connections instead of setting up new TCP and TLS connections.
+    Each session has its own cookie jar, so concurrent fetches don't mix up
+    their cookies.
+    """
+    global _http_adapter
+    if _http_adapter is None:
+        _http_adapter = InstrumentedHTTPAdapter(
+            pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE
+        )
+    session = requests.Session()
+    session.mount("https://", _http_adapter)
+    session.mount("http://", _http_adapter)
+    return session
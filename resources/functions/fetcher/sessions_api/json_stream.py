@@ -0,0 +1,23 @@
+from typing import Any, Iterable, Iterator
+
+import ijson
+
+
+def iter_json_items(chunks: Iterable[bytes], prefix: str) -> Iterator[Any]:
+    """
+    Incrementally parse a JSON document delivered in chunks, yielding every
+    item found under the given ijson prefix (e.g. "data.item") as soon as it
+    is complete. Only the items that are not yet consumed are kept in memory.
+    """
+    items = ijson.sendable_list()
+    coroutine = ijson.items_coro(items, prefix, use_float=True)
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        coroutine.send(chunk)
+        yield from items
+        del items[:]
+
+    coroutine.close()
+    yield from items
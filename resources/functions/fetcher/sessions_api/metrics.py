@@ -0,0 +1,7 @@
+from aws_lambda_powertools import Metrics
+
+METRICS_NAMESPACE = "ReInventSessionFetcher"
+
+# Metrics are written as CloudWatch embedded metric format logs, when the
+# handler decorated with metrics.log_metrics returns
+metrics = Metrics(namespace=METRICS_NAMESPACE)
@@ -0,0 +1,211 @@
+import hashlib
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import requests
+from aws_lambda_powertools.metrics import MetricUnit
+from pydantic import BaseModel
+
+from .deadline import Deadline
+from .json_stream import iter_json_items
+from .metrics import metrics
+from .state_store import StateStore
+from .timing import PhaseTiming, record_phase
+
+SYNC_STATE_KEY = "sessions-sync"
+# Size of the chunks read from the sessions list response when streaming
+SESSIONS_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class SyncState(BaseModel):
+    """What is known about the sessions list of the last successful sync"""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    digest: Optional[str] = None
+
+    @classmethod
+    def load(cls, store: StateStore) -> "SyncState":
+        document = store.get(SYNC_STATE_KEY)
+        return cls(**document) if document is not None else cls()
+
+    def save(self, store: StateStore) -> None:
+        store.put(SYNC_STATE_KEY, self.model_dump())
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class SessionList:
+    """
+    The sessions of a streamed list response. Iterating yields the raw sessions
+    while the body is downloaded, and computes the digest of the body on the way.
+    """
+
+    def __init__(self, response: requests.Response, deadline: Deadline):
+        self._response = response
+        self._deadline = deadline
+        self._hash = hashlib.sha256()
+        self.not_modified = response.status_code == 304
+        self.etag: Optional[str] = response.headers.get("ETag")
+        self.last_modified: Optional[str] = response.headers.get("Last-Modified")
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self._download_seconds = 0.0
+        self._parse_seconds = 0.0
+        self._chunk_listeners: List[Callable[[bytes], None]] = []
+        # Listeners that raised, they missed the chunks from their failure on
+        self.failed_listeners: List[Callable[[bytes], None]] = []
+
+    def add_chunk_listener(self, listener: Callable[[bytes], None]) -> None:
+        """
+        Have the listener called with every chunk of the decoded body. A listener
+        that raises is detached and added to failed_listeners, the download goes on.
+        """
+        self._chunk_listeners.append(listener)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        try:
+            if self.not_modified:
+                return
+            sessions = iter_json_items(self._chunks(), "data.item")
+            while True:
+                # Only the time spent in the parser (which includes the
+                # download) counts, not the time of the consumer
+                started = time.perf_counter()
+                session = next(sessions, None)
+                self._parse_seconds += time.perf_counter() - started
+                if session is None:
+                    break
+                yield session
+            self._record_timings()
+        finally:
+            self._response.close()
+
+    def read(self) -> bytes:
+        """
+        The whole decoded body, for parsing it in one pass instead of per session
+        while it streams. The chunk listeners and the digest still see every chunk.
+        """
+        try:
+            if self.not_modified:
+                return b""
+            body = b"".join(self._chunks())
+            self._record_timings(record_decode=False)
+            return body
+        finally:
+            self._response.close()
+
+    def close(self) -> None:
+        """Release the connection without reading the body, e.g. of a 304"""
+        self._response.close()
+
+    def _chunks(self) -> Iterator[bytes]:
+        # iter_content decompresses the body while it is downloaded
+        chunks = self._response.iter_content(chunk_size=SESSIONS_STREAM_CHUNK_SIZE)
+        while True:
+            started = time.perf_counter()
+            chunk = next(chunks, None)
+            self._download_seconds += time.perf_counter() - started
+            if chunk is None:
+                break
+            self._hash.update(chunk)
+            self.decoded_bytes += len(chunk)
+            for listener in list(self._chunk_listeners):
+                try:
+                    listener(chunk)
+                except Exception as error:
+                    print(f" - Chunk listener failed, detaching it: {error!r}")
+                    self._chunk_listeners.remove(listener)
+                    self.failed_listeners.append(listener)
+            yield chunk
+            # Abort the download when it does not fit in the invocation anymore
+            self._deadline.check("Sessions list download")
+
+        # The raw response counts the (compressed) bytes received on the wire
+        self.wire_bytes = self._response.raw.tell()
+
+    def _record_timings(self, record_decode: bool = True) -> None:
+        """
+        Record the download and decoding, once the whole body is parsed. When
+        the body is read as a whole, the caller records the decoding itself.
+        """
+        print(
+            f" - Downloaded {self.wire_bytes} bytes "
+            f"({self._response.headers.get('Content-Encoding', 'identity')}), "
+            f"{self.decoded_bytes} bytes decoded"
+        )
+        metrics.add_metric(
+            name="SessionsListWireBytes", unit=MetricUnit.Bytes, value=self.wire_bytes
+        )
+        metrics.add_metric(
+            name="SessionsListDecodedBytes",
+            unit=MetricUnit.Bytes,
+            value=self.decoded_bytes,
+        )
+
+        # The download is timed inside the parsing, the rest is decoding
+        download = PhaseTiming("SessionsListDownload")
+        download.seconds = self._download_seconds
+        download.response_bytes = self.wire_bytes
+        record_phase(download)
+        if record_decode:
+            decode = PhaseTiming("SessionsListDecode")
+            decode.seconds = max(0.0, self._parse_seconds - self._download_seconds)
+            record_phase(decode)
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the response body, complete once the sessions are consumed"""
+        return self._hash.hexdigest()
+
+    def sync_state(self) -> SyncState:
+        return SyncState(
+            etag=self.etag, last_modified=self.last_modified, digest=self.digest
+        )
+
+
+class SessionListPartitioning(BaseModel):
+    """How the sessions list request is split into concurrent requests"""
+
+    # Query parameter the list is filtered by, e.g. the session type
+    parameter: str
+    # Values of the query parameter, together they must cover the whole list.
+    # Each partition must have sessions, and sessions that have the parameter
+    # as a field must have the value of their partition.
+    values: List[str]
+    max_workers: int = 4
+
+
+class MergedSessionList:
+    """The sessions of all partitions of the list, deduplicated by sessionUid"""
+
+    not_modified = False
+
+    def __init__(self, partitions: List[Tuple[List[Dict[str, Any]], str]]):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        digest = hashlib.sha256()
+        for sessions, partition_digest in partitions:
+            digest.update(partition_digest.encode("utf-8"))
+            for session in sessions:
+                self._sessions.setdefault(session["sessionUid"], session)
+        self.digest = digest.hexdigest()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._sessions.values())
+
+    def sync_state(self) -> SyncState:
+        return SyncState(digest=self.digest)
@@ -0,0 +1,139 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from aws_clients import get_client, get_resource
+
+
+STATE_ITEM_PK = "FetcherState"
+
+
+class StateStore(ABC):
+    """Persists small JSON documents across invocations, keyed by name"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+
+class InMemoryStateStore(StateStore):
+    """State store that only lives as long as the (warm) container"""
+
+    def __init__(self):
+        self._documents: Dict[str, str] = {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        document = self._documents.get(key)
+        return json.loads(document) if document is not None else None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        self._documents[key] = json.dumps(value)
+
+    def delete(self, key: str) -> None:
+        self._documents.pop(key, None)
+
+
+class FileStateStore(StateStore):
+    """State store keeping one JSON file per key in a local directory"""
+
+    def __init__(self, directory: str):
+        self._directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        os.makedirs(self._directory, exist_ok=True)
+        # Write to a temporary file first, so readers never see a partial document
+        temporary_path = self._path(key) + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(value, file)
+        os.replace(temporary_path, self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class DynamoDBStateStore(StateStore):
+    """
+    State store keeping one item per key in a DynamoDB table. The table should
+    be a dedicated one, without a stream: the documents can hold secrets.
+    """
+
+    def __init__(self, table_name: str):
+        self._table = get_resource("dynamodb").Table(table_name)
+
+    def _key(self, key: str) -> Dict[str, str]:
+        return {"PK": STATE_ITEM_PK, "SK": key}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        response = self._table.get_item(Key=self._key(key), ConsistentRead=True)
+        if "Item" not in response:
+            return None
+        return json.loads(response["Item"]["value"])
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        self._table.put_item(Item=self._key(key) | {"value": json.dumps(value)})
+
+    def delete(self, key: str) -> None:
+        self._table.delete_item(Key=self._key(key))
+
+
+class SecretsManagerStateStore(StateStore):
+    """
+    State store keeping the documents in one Secrets Manager secret, as a JSON
+    object by key. Meant for state that holds credentials, like the portal
+    cookies and the Cognito refresh token.
+    """
+
+    def __init__(self, secret_id: str):
+        self._secret_id = secret_id
+        self._client = get_client("secretsmanager")
+
+    def _documents(self) -> Dict[str, Any]:
+        try:
+            response = self._client.get_secret_value(SecretId=self._secret_id)
+        except self._client.exceptions.ResourceNotFoundException:
+            # The secret has no value yet
+            return {}
+        try:
+            documents = json.loads(response.get("SecretString") or "{}")
+        except ValueError:
+            # E.g. the random value generated when the secret was created
+            return {}
+        return documents if isinstance(documents, dict) else {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._documents().get(key)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        documents = self._documents() | {key: value}
+        self._client.put_secret_value(
+            SecretId=self._secret_id, SecretString=json.dumps(documents)
+        )
+
+    def delete(self, key: str) -> None:
+        documents = self._documents()
+        if documents.pop(key, None) is not None:
+            self._client.put_secret_value(
+                SecretId=self._secret_id, SecretString=json.dumps(documents)
+            )
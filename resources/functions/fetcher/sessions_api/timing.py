@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence
+
+import requests
+from aws_lambda_powertools.metrics import MetricUnit
+
+from .metrics import metrics
+
+# Number of durations kept per phase, for the percentiles over the invocations
+# of a warm container, or over the runs of a replay
+PHASE_HISTORY_SIZE = 1000
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+_phase_durations: Dict[str, Deque[float]] = {}
+_phase_durations_lock = threading.Lock()
+
+
+class PhaseTiming:
+    """The measurements of one phase of the fetch, filled in while it runs"""
+
+    def __init__(self, phase: str):
+        self.phase = phase
+        self.seconds = 0.0
+        self.response_bytes: Optional[int] = None
+        self.connection_reused: Optional[bool] = None
+
+    def observe(self, response: requests.Response, body_read: bool = True) -> None:
+        """
+        Take the response size and connection reuse from a response. The size
+        is the number of bytes received on the wire, so it is only known once
+        the body is read.
+        """
+        self.connection_reused = getattr(response, "connection_reused", None)
+        if body_read:
+            self.response_bytes = response.raw.tell()
+
+
+def record_phase(timing: PhaseTiming) -> None:
+    """Emit the measurements of a phase as metrics, and keep its duration"""
+    milliseconds = timing.seconds * 1000
+    metrics.add_metric(
+        name=f"{timing.phase}Duration",
+        unit=MetricUnit.Milliseconds,
+        value=milliseconds,
+    )
+    details = [f"{milliseconds:.0f} ms"]
+    if timing.response_bytes is not None:
+        metrics.add_metric(
+            name=f"{timing.phase}ResponseBytes",
+            unit=MetricUnit.Bytes,
+            value=timing.response_bytes,
+        )
+        details.append(f"{timing.response_bytes} bytes")
+    if timing.connection_reused is not None:
+        metrics.add_metric(
+            name=f"{timing.phase}ConnectionReused",
+            unit=MetricUnit.Count,
+            value=int(timing.connection_reused),
+        )
+        details.append(
+            "reused connection" if timing.connection_reused else "new connection"
+        )
+    print(f" - {timing.phase}: {', '.join(details)}")
+
+    with _phase_durations_lock:
+        durations = _phase_durations.setdefault(
+            timing.phase, deque(maxlen=PHASE_HISTORY_SIZE)
+        )
+        durations.append(timing.seconds)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[PhaseTiming]:
+    """
+    Measure the duration of a phase with a monotonic clock. The phase is
+    recorded when the block exits, also when it fails.
+    """
+    timing = PhaseTiming(phase)
+    started = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        timing.seconds = time.perf_counter() - started
+        record_phase(timing)
+
+
+def instrument_client(client: Any, phase_prefix: str) -> None:
+    """
+    Record every API call of a boto3 client as a phase, named after the
+    prefix and the operation, e.g. CognitoInitiateAuth. Calls that fail, e.g.
+    with a connection error, are recorded too. Instrumenting a client again,
+    like a shared client on every invocation, has no effect.
+    """
+
+    def start_call(context: Dict[str, Any], model: Any, **_kwargs: Any) -> None:
+        # Unlike before-call, before-parameter-build is emitted for every call,
+        # also when a handler (like botocore's Stubber) answers the call itself
+        context["phase"] = f"{phase_prefix}{model.name}"
+        context["phase_started"] = time.perf_counter()
+
+    def end_call(context: Dict[str, Any], http_response: Any = None) -> None:
+        if "phase_started" not in context:
+            return
+        timing = PhaseTiming(context["phase"])
+        timing.seconds = time.perf_counter() - context.pop("phase_started")
+        # Stubbed responses (botocore's Stubber) have no body
+        if http_response is not None and http_response.raw is not None:
+            timing.response_bytes = len(http_response.content)
+        record_phase(timing)
+
+    def after_call(
+        context: Dict[str, Any], http_response: Any = None, **_kwargs: Any
+    ) -> None:
+        end_call(context, http_response)
+
+    def after_call_error(context: Dict[str, Any], **_kwargs: Any) -> None:
+        # Only gets the exception and the context, the exception propagates
+        end_call(context)
+
+    events = client.meta.events
+    events.register(
+        "before-parameter-build", start_call, f"{phase_prefix}-before-parameter-build"
+    )
+    events.register("after-call", after_call, f"{phase_prefix}-after-call")
+    events.register(
+        "after-call-error", after_call_error, f"{phase_prefix}-after-call-error"
+    )
+
+
+def phase_percentiles(
+    percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+) -> Dict[str, Dict[str, float]]:
+    """
+    The percentiles of the durations (in seconds) of each phase, over the
+    recorded runs. CloudWatch computes the same percentiles from the metrics.
+    """
+    with _phase_durations_lock:
+        durations_by_phase = {
+            phase: sorted(durations) for phase, durations in _phase_durations.items()
+        }
+    return {
+        phase: {f"p{p}": _percentile(durations, p) for p in percentiles}
+        | {"count": len(durations)}
+        for phase, durations in durations_by_phase.items()
+    }
+
+
+def _percentile(sorted_values: List[float], percentile: int) -> float:
+    # Nearest rank percentile
+    rank = max(1, -(-percentile * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
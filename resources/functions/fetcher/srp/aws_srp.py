@@ -1,17 +1,19 @@
 # Source https://github.com/capless/warrant/blob/master/warrant/aws_srp.py
 
+import asyncio
 import base64
-import binascii
 import datetime
 import hashlib
 import hmac
 import re
 
-import boto3
 import os
 import six
+from aws_clients import get_client
 
+from . import bigint
 from .exceptions import ForceChangePasswordException
+from .key_pool import EphemeralKeyPool
 
 # https://github.com/aws/amazon-cognito-identity-js/blob/master/src/AuthenticationHelper.js#L22
 n_hex = (
@@ -35,6 +37,7 @@ n_hex = (
 # https://github.com/aws/amazon-cognito-identity-js/blob/master/src/AuthenticationHelper.js#L49
 g_hex = "2"
 info_bits = bytearray("Caldera Derived Key", "utf-8")
+INFO_BITS_UPDATE = bytes(info_bits) + b"\x01"
 
 
 def hash_sha256(buf):
@@ -56,8 +59,7 @@ def long_to_hex(long_num):
 
 
 def get_random(nbytes):
-    random_hex = binascii.hexlify(os.urandom(nbytes))
-    return hex_to_long(random_hex)
+    return int.from_bytes(os.urandom(nbytes), "big")
 
 
 def pad_hex(long_int):
@@ -77,6 +79,35 @@ def pad_hex(long_int):
     return hash_str
 
 
+def pad_bytes(long_int):
+    """
+    Converts a Long integer to big endian bytes, padded like pad_hex: with a
+    leading zero byte when the highest bit is set, so it is never negative
+    :param {Long integer} long_int Number to pad.
+    :return {Bytes} Padded bytes.
+    """
+    return long_int.to_bytes((long_int.bit_length() + 8) // 8, "big")
+
+
+def pad_hex_bytes(hex_string):
+    """
+    Converts a hex string to bytes, padded like pad_hex. Unlike pad_bytes,
+    leading zeroes of the string are kept.
+    :param {String} hex_string Hex string to pad.
+    :return {Bytes} Padded bytes.
+    """
+    if len(hex_string) % 2 == 1:
+        return bytes.fromhex("0" + hex_string)
+    if hex_string[0] in "89ABCDEFabcdef":
+        return b"\x00" + bytes.fromhex(hex_string)
+    return bytes.fromhex(hex_string)
+
+
+def bytes_hash_to_long(buf):
+    """The SHA-256 digest of the bytes as a Long integer, like hex_hash"""
+    return int.from_bytes(hashlib.sha256(buf).digest(), "big")
+
+
 def compute_hkdf(ikm, salt):
     """
     Standard hkdf algorithm
@@ -86,11 +117,33 @@ def compute_hkdf(ikm, salt):
     @private
     """
     prk = hmac.new(salt, ikm, hashlib.sha256).digest()
-    info_bits_update = info_bits + bytearray(chr(1), "utf-8")
-    hmac_hash = hmac.new(prk, info_bits_update, hashlib.sha256).digest()
+    hmac_hash = hmac.new(prk, INFO_BITS_UPDATE, hashlib.sha256).digest()
     return hmac_hash[:16]
 
 
+# The group constants are the same for every authentication, compute them once
+BIG_N = hex_to_long(n_hex)
+G = hex_to_long(g_hex)
+K = hex_to_long(hex_hash("00" + n_hex + "0" + g_hex))
+
+
+def generate_ephemeral_key():
+    """
+    Generate a random small a and the public value A = g^a%N of the client
+    :return {Tuple} The small a and large A values.
+    """
+    small_a = get_random(128) % BIG_N
+    big_a = bigint.mod_pow(G, small_a, BIG_N)
+    # safety check
+    if (big_a % BIG_N) == 0:
+        raise ValueError("Safety check for A failed")
+    return small_a, big_a
+
+
+# Key pairs computed ahead of the authentications, see EphemeralKeyPool
+EPHEMERAL_KEY_POOL = EphemeralKeyPool(generate_ephemeral_key)
+
+
 def calculate_u(big_a, big_b):
     """
     Calculate the client's value U which is the hash of A and B
@@ -98,8 +151,29 @@ def calculate_u(big_a, big_b):
     :param {Long integer} big_b Server B value.
     :return {Long integer} Computed U value.
     """
-    u_hex_hash = hex_hash(pad_hex(big_a) + pad_hex(big_b))
-    return hex_to_long(u_hex_hash)
+    return bytes_hash_to_long(pad_bytes(big_a) + pad_bytes(big_b))
+
+
+def authenticate_with_refresh_token(
+    client, client_id, refresh_token, username=None, client_secret=None
+):
+    """
+    Renew the tokens with a single REFRESH_TOKEN_AUTH call, instead of the
+    two round trips and modular exponentiations of the SRP authentication.
+    The response does not contain a new refresh token.
+    :param {String} refresh_token Refresh token of an earlier authentication.
+    :return {Dict} The initiate_auth response.
+    """
+    auth_params = {"REFRESH_TOKEN": refresh_token}
+    if client_secret is not None:
+        auth_params.update(
+            {"SECRET_HASH": AWSSRP.get_secret_hash(username, client_id, client_secret)}
+        )
+    return client.initiate_auth(
+        AuthFlow="REFRESH_TOKEN_AUTH",
+        AuthParameters=auth_params,
+        ClientId=client_id,
+    )
 
 
 class AWSSRP(object):
@@ -115,6 +189,7 @@ class AWSSRP(object):
         pool_region=None,
         client=None,
         client_secret=None,
+        key_pool=None,
     ):
         if pool_region is not None and client is not None:
             raise ValueError(
@@ -128,34 +203,16 @@ class AWSSRP(object):
         self.client_id = client_id
         self.client_secret = client_secret
         self.client = (
-            client if client else boto3.client("cognito-idp", region_name=pool_region)
+            client if client else get_client("cognito-idp", region_name=pool_region)
         )
-        self.big_n = hex_to_long(n_hex)
-        self.g = hex_to_long(g_hex)
-        self.k = hex_to_long(hex_hash("00" + n_hex + "0" + g_hex))
-        self.small_a_value = self.generate_random_small_a()
-        self.large_a_value = self.calculate_a()
-
-    def generate_random_small_a(self):
-        """
-        helper function to generate a random big integer
-        :return {Long integer} a random value.
-        """
-        random_long_int = get_random(128)
-        return random_long_int % self.big_n
-
-    def calculate_a(self):
-        """
-        Calculate the client's public value A = g^a%N
-        with the generated random number a
-        :param {Long integer} a Randomly generated small A.
-        :return {Long integer} Computed large A.
-        """
-        big_a = pow(self.g, self.small_a_value, self.big_n)
-        # safety check
-        if (big_a % self.big_n) == 0:
-            raise ValueError("Safety check for A failed")
-        return big_a
+        self.big_n = BIG_N
+        self.g = G
+        self.k = K
+        # The ephemeral key pair is taken from the pool (used only once), so the
+        # exponentiation for A is not on the authentication path
+        self.small_a_value, self.large_a_value = (
+            key_pool if key_pool is not None else EPHEMERAL_KEY_POOL
+        ).take()
 
     def get_password_authentication_key(self, username, password, server_b_value, salt):
         """
@@ -170,16 +227,17 @@ class AWSSRP(object):
         if u_value == 0:
             raise ValueError("U cannot be zero.")
         username_password = "%s%s:%s" % (self.pool_id.split("_")[1], username, password)
-        username_password_hash = hash_sha256(username_password.encode("utf-8"))
+        username_password_hash = hashlib.sha256(username_password.encode("utf-8"))
 
-        x_value = hex_to_long(hex_hash(pad_hex(salt) + username_password_hash))
-        g_mod_pow_xn = pow(self.g, x_value, self.big_n)
+        x_value = bytes_hash_to_long(
+            pad_hex_bytes(salt) + username_password_hash.digest()
+        )
+        g_mod_pow_xn = bigint.mod_pow(self.g, x_value, self.big_n)
         int_value2 = server_b_value - self.k * g_mod_pow_xn
-        s_value = pow(int_value2, self.small_a_value + u_value * x_value, self.big_n)
-        hkdf = compute_hkdf(
-            bytearray.fromhex(pad_hex(s_value)),
-            bytearray.fromhex(pad_hex(long_to_hex(u_value))),
+        s_value = bigint.mod_pow(
+            int_value2, self.small_a_value + u_value * x_value, self.big_n
         )
+        hkdf = compute_hkdf(pad_bytes(s_value), pad_bytes(u_value))
         return hkdf
 
     def get_auth_params(self):
@@ -219,10 +277,10 @@ class AWSSRP(object):
         )
         secret_block_bytes = base64.standard_b64decode(secret_block_b64)
         msg = (
-            bytearray(self.pool_id.split("_")[1], "utf-8")
-            + bytearray(user_id_for_srp, "utf-8")
-            + bytearray(secret_block_bytes)
-            + bytearray(timestamp, "utf-8")
+            self.pool_id.split("_")[1].encode("utf-8")
+            + user_id_for_srp.encode("utf-8")
+            + secret_block_bytes
+            + timestamp.encode("utf-8")
         )
         hmac_obj = hmac.new(hkdf, msg, digestmod=hashlib.sha256)
         signature_string = base64.standard_b64encode(hmac_obj.digest())
@@ -242,32 +300,67 @@ class AWSSRP(object):
             )
         return response
 
-    def authenticate_user(self, client=None):
-        boto_client = self.client or client
-        auth_params = self.get_auth_params()
-        response = boto_client.initiate_auth(
-            AuthFlow="USER_SRP_AUTH",
-            AuthParameters=auth_params,
-            ClientId=self.client_id,
-        )
-        if response["ChallengeName"] == self.PASSWORD_VERIFIER_CHALLENGE:
-            challenge_response = self.process_challenge(response["ChallengeParameters"])
-            tokens = boto_client.respond_to_auth_challenge(
-                ClientId=self.client_id,
-                ChallengeName=self.PASSWORD_VERIFIER_CHALLENGE,
-                ChallengeResponses=challenge_response,
-            )
-
-            if tokens.get("ChallengeName") == self.NEW_PASSWORD_REQUIRED_CHALLENGE:
-                raise ForceChangePasswordException(
-                    "Change password before authenticating"
-                )
+    def _initiate_auth_request(self):
+        return {
+            "AuthFlow": "USER_SRP_AUTH",
+            "AuthParameters": self.get_auth_params(),
+            "ClientId": self.client_id,
+        }
 
-            return tokens
-        else:
+    def _password_verifier_parameters(self, response):
+        if response["ChallengeName"] != self.PASSWORD_VERIFIER_CHALLENGE:
             raise NotImplementedError(
                 "The %s challenge is not supported" % response["ChallengeName"]
             )
+        return response["ChallengeParameters"]
+
+    def _respond_to_auth_challenge_request(self, challenge_response):
+        return {
+            "ClientId": self.client_id,
+            "ChallengeName": self.PASSWORD_VERIFIER_CHALLENGE,
+            "ChallengeResponses": challenge_response,
+        }
+
+    def _check_tokens(self, tokens):
+        if tokens.get("ChallengeName") == self.NEW_PASSWORD_REQUIRED_CHALLENGE:
+            raise ForceChangePasswordException("Change password before authenticating")
+        return tokens
+
+    def authenticate_user(self, client=None):
+        boto_client = self.client or client
+        response = boto_client.initiate_auth(**self._initiate_auth_request())
+        challenge_response = self.process_challenge(
+            self._password_verifier_parameters(response)
+        )
+        tokens = boto_client.respond_to_auth_challenge(
+            **self._respond_to_auth_challenge_request(challenge_response)
+        )
+        return self._check_tokens(tokens)
+
+    async def authenticate_user_async(self, client=None, executor=None):
+        """
+        Async variant of authenticate_user. The blocking boto3 calls run in
+        worker threads, and the modular exponentiation of process_challenge
+        runs in the given executor (the loop's default executor when None), so
+        the event loop can serve other I/O during the authentication.
+        :param {Executor} executor Executor for process_challenge.
+        :return {Dict} The respond_to_auth_challenge response.
+        """
+        boto_client = self.client or client
+        loop = asyncio.get_running_loop()
+        response = await asyncio.to_thread(
+            boto_client.initiate_auth, **self._initiate_auth_request()
+        )
+        challenge_response = await loop.run_in_executor(
+            executor,
+            self.process_challenge,
+            self._password_verifier_parameters(response),
+        )
+        tokens = await asyncio.to_thread(
+            boto_client.respond_to_auth_challenge,
+            **self._respond_to_auth_challenge_request(challenge_response),
+        )
+        return self._check_tokens(tokens)
 
     def set_new_password_challenge(self, new_password, client=None):
         boto_client = self.client or client
@@ -0,0 +1,41 @@
+"""
+Big integer backend of the SRP math. The 3072-bit modular exponentiations
+dominate the CPU time of the authentication, gmpy2 (GMP) runs them several
+times faster than Python's pow(). Without gmpy2 the built-in pow() is used.
+"""
+
+import os
+from typing import Callable
+
+try:
+    import gmpy2
+except ImportError:  # pragma: no cover - depends on the environment
+    gmpy2 = None
+
+# "auto" uses gmpy2 when it is installed, "gmpy2" requires it, and "python"
+# always uses the built-in pow(), e.g. to compare the backends
+BACKEND = os.environ.get("SRP_BIGINT_BACKEND", "auto")
+
+
+def _python_mod_pow(base: int, exponent: int, modulus: int) -> int:
+    return pow(base, exponent, modulus)
+
+
+def _gmpy2_mod_pow(base: int, exponent: int, modulus: int) -> int:
+    return int(gmpy2.powmod(base, exponent, modulus))
+
+
+def load_backend(name: str) -> Callable[[int, int, int], int]:
+    """The modular exponentiation of the named backend"""
+    if name == "python" or (name == "auto" and gmpy2 is None):
+        return _python_mod_pow
+    if name in ("auto", "gmpy2"):
+        if gmpy2 is None:
+            raise ImportError("The gmpy2 SRP backend requires the gmpy2 package")
+        return _gmpy2_mod_pow
+    raise ValueError(f"Unknown SRP big integer backend '{name}'")
+
+
+# (base ** exponent) % modulus, the result is in [0, modulus) also for a
+# negative base
+mod_pow = load_backend(BACKEND)
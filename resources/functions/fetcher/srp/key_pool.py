@@ -0,0 +1,54 @@
+import threading
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+# Number of key pairs kept ready. Every SRP authentication uses one, and most
+# invocations don't authenticate at all, thanks to the cached authentication.
+DEFAULT_POOL_SIZE = 2
+
+
+class EphemeralKeyPool:
+    """
+    Pool of precomputed SRP ephemeral key pairs (a, A = g^a % N). Computing A
+    is a 3072-bit modular exponentiation, the pool moves it off the
+    authentication path. Every pair is handed out once and then discarded.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[], Tuple[int, int]],
+        size: int = DEFAULT_POOL_SIZE,
+    ):
+        self._generate = generate
+        self._size = size
+        self._pairs: Deque[Tuple[int, int]] = deque()
+        self._refill_lock = threading.Lock()
+        self._refill_thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def take(self) -> Tuple[int, int]:
+        """Take a key pair, it is generated on the spot when the pool is empty"""
+        try:
+            return self._pairs.popleft()
+        except IndexError:
+            return self._generate()
+
+    def fill(self) -> None:
+        """Generate key pairs until the pool is full, e.g. during the init phase"""
+        with self._refill_lock:
+            while len(self._pairs) < self._size:
+                self._pairs.append(self._generate())
+
+    def refill_in_background(self) -> None:
+        """
+        Fill the pool in a daemon thread, if it is not full. Start it once the
+        authentication is done, so it does not compete with it for the CPU.
+        """
+        if len(self._pairs) >= self._size:
+            return
+        if self._refill_thread is not None and self._refill_thread.is_alive():
+            return
+        self._refill_thread = threading.Thread(target=self.fill, daemon=True)
+        self._refill_thread.start()
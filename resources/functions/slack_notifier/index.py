@@ -5,7 +5,7 @@ from typing import Any, Dict
 
 import requests
 from _example_payload import example_payload
-from models import ReInventSession
+from models import LazyReInventSession
 from aws_lambda_powertools.utilities import parameters
 
 from slack_message import map_session_to_slack_block
@@ -23,7 +23,7 @@ def handler(event: Dict[str, Any], _context: Any):
     event_detail_type = body_json["detail-type"]
     if event_detail_type == "SessionUpdated":
         new_session = event_detail["new"]
-        session = ReInventSession(**new_session)
+        session = LazyReInventSession.model_validate(new_session)
         slack_message = map_session_to_slack_block(
             session=session, change_type=event_detail_type
         )
@@ -37,7 +37,7 @@ def handler(event: Dict[str, Any], _context: Any):
             }
         )
     else:
-        session = ReInventSession(**event_detail)
+        session = LazyReInventSession.model_validate(event_detail)
         slack_message = map_session_to_slack_block(
             session=session, change_type=event_detail_type
         )
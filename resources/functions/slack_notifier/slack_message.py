@@ -1,10 +1,8 @@
 from typing import Any, Dict
-from models import ReInventSession
+from models import AnySession
 
 
-def map_session_to_slack_block(
-    session: ReInventSession, change_type: str
-) -> Dict[str, Any]:
+def map_session_to_slack_block(session: AnySession, change_type: str) -> Dict[str, Any]:
     match change_type:
         case "SessionUpdated":
             change_type = ":recycle: Updated"
@@ -13,6 +13,11 @@ pip install -r requirements.txt -t python/lib/python3.10/site-packages/
 exit
 EOF
 
+# Add the shared modules and packages of the layer, /opt/python is on the
+# Lambda's sys.path
+cp -r src/. python/
+find python -name __pycache__ -prune -exec rm -rf {} +
+
 # Compress the result into a zip file
 zip -r python.zip python > /dev/null;
 # Remove the python dir again, we don't need it anymore
@@ -0,0 +1,99 @@
+"""
+Registry of the boto3 clients and resources of the functions. Every client is
+created lazily, once per container, and then reused by all invocations, so
+the cost of creating it (tens of milliseconds, plus its memory) is only paid
+by the first invocation that needs it.
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+# Connections kept per client, enough for the concurrent calls of a function
+MAX_POOL_CONNECTIONS = 10
+CONNECT_TIMEOUT_SECONDS = 5
+READ_TIMEOUT_SECONDS = 10
+MAX_ATTEMPTS = 3
+
+DEFAULT_CONFIG = Config(
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+    connect_timeout=CONNECT_TIMEOUT_SECONDS,
+    read_timeout=READ_TIMEOUT_SECONDS,
+    retries={"total_max_attempts": MAX_ATTEMPTS, "mode": "standard"},
+    tcp_keepalive=True,
+)
+
+ClientKey = Tuple[str, Optional[str], Optional[str]]
+
+_session: Optional[boto3.session.Session] = None
+_clients: Dict[ClientKey, Any] = {}
+_resources: Dict[ClientKey, Any] = {}
+# Creating clients from one session is not thread safe, using them is
+_lock = threading.Lock()
+
+
+def _get_session() -> boto3.session.Session:
+    global _session
+    if _session is None:
+        _session = boto3.session.Session()
+    return _session
+
+
+def get_client(
+    service_name: str,
+    region_name: Optional[str] = None,
+    endpoint_url: Optional[str] = None,
+    config: Optional[Config] = None,
+) -> Any:
+    """
+    The client of a service, created on the first call. A config is merged
+    into the default config when the client is created, so only the config of
+    the first call for a service, region and endpoint applies.
+    """
+    key = (service_name, region_name, endpoint_url)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _get_session().client(
+                    service_name,
+                    region_name=region_name,
+                    endpoint_url=endpoint_url,
+                    config=DEFAULT_CONFIG.merge(config) if config else DEFAULT_CONFIG,
+                )
+                _clients[key] = client
+    return client
+
+
+def get_resource(
+    service_name: str,
+    region_name: Optional[str] = None,
+    endpoint_url: Optional[str] = None,
+) -> Any:
+    """The resource of a service, created on the first call"""
+    key = (service_name, region_name, endpoint_url)
+    resource = _resources.get(key)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(key)
+            if resource is None:
+                resource = _get_session().resource(
+                    service_name,
+                    region_name=region_name,
+                    endpoint_url=endpoint_url,
+                    config=DEFAULT_CONFIG,
+                )
+                _resources[key] = resource
+    return resource
+
+
+def reset() -> None:
+    """Forget all clients and resources, e.g. after the environment changed"""
+    global _session
+    with _lock:
+        _session = None
+        _clients.clear()
+        _resources.clear()
@@ -0,0 +1,420 @@
+import hashlib
+import importlib
+import json
+import os
+import sys
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    ConfigDict,
+    Field,
+    PlainValidator,
+    TypeAdapter,
+    ValidationInfo,
+    ValidatorFunctionWrapHandler,
+    WrapValidator,
+    model_validator,
+)
+from typing_extensions import Annotated, TypedDict
+
+# Identical tags share one instance, and repeated strings (e.g. track and tag
+# names) one string object. "off" disables it, e.g. to compare the memory use.
+SESSION_INTERNING = os.environ.get("SESSION_INTERNING", "on") != "off"
+
+PARENT_TAG_UIDS = {
+    "AREA_OF_INTEREST": "3428EB86-4D79-4EFE-9F33-E911FCC500A4",
+    "TOPIC": "F2BB2A9C-8783-4072-A0A4-5621D1A481A6",
+    "SERVICES": "7A26869A-A0C9-48CC-9731-541C3AFA9DF4",
+    "ROLE": "22A77ABD-348D-4E44-800F-846017E75A5D",
+    "INDUSTRY": "B78A961D-DC03-42C9-A32E-DA576734A89E",
+    "LEVEL": "2634F5B6-B8E0-4208-92C3-FAE426C930F7",
+}
+
+LEVEL_MAPPING = {
+    "0F1F69D2-692C-4B25-AEDA-89A0919B8167": 100,
+    "79C488FF-B9FC-471C-992C-DE6C35671BDE": 200,
+    "2CABCC3D-F2BB-490C-9265-8CBB7660C579": 300,
+    "6F2C43D3-196B-4957-82C5-9F46BAC3DE5E": 400,
+}
+
+# Field of the session that collects the names of the tags of a parent tag
+TAG_FIELDS = {
+    PARENT_TAG_UIDS["TOPIC"]: "topics",
+    PARENT_TAG_UIDS["INDUSTRY"]: "industries",
+    PARENT_TAG_UIDS["ROLE"]: "roles",
+    PARENT_TAG_UIDS["AREA_OF_INTEREST"]: "areas_of_interest",
+    PARENT_TAG_UIDS["SERVICES"]: "services",
+}
+KNOWN_PARENT_TAG_UIDS = frozenset(PARENT_TAG_UIDS.values())
+# Key of the unmapped parent tags reported so far in the validation context
+UNMAPPED_PARENT_TAGS = "unmapped_parent_tags"
+
+TagKey = Tuple[str, str, str, str]
+
+
+def _no_intern(value: str) -> str:
+    return value
+
+
+intern: Callable[[str], str] = sys.intern if SESSION_INTERNING else _no_intern
+
+# A string of which the sessions have many equal copies
+InternedStr = Annotated[str, AfterValidator(intern)]
+
+
+# Define the Pydantic model
+class ReInventSessionTag(BaseModel):
+    """A tag of a session, shared by all sessions with an identical tag"""
+
+    model_config = ConfigDict(frozen=True)
+
+    scheduleTagUid: InternedStr
+    tagName: InternedStr
+    parentTagName: InternedStr
+    parentTagUid: InternedStr
+
+
+# The tags seen by this container, there are a few hundred distinct ones
+_tags: Dict[TagKey, ReInventSessionTag] = {}
+
+
+def _intern_tag(value: Any, handler: ValidatorFunctionWrapHandler) -> Any:
+    """Validate a raw tag into the shared instance of identical tags"""
+    if not SESSION_INTERNING or not isinstance(value, dict):
+        return handler(value)
+    try:
+        key: TagKey = (
+            value["scheduleTagUid"],
+            value["tagName"],
+            value["parentTagName"],
+            value["parentTagUid"],
+        )
+        tag = _tags.get(key)
+    except (KeyError, TypeError):
+        # Not a valid tag, the validation reports it
+        return handler(value)
+    if tag is None:
+        # Only validated tags are kept, so an equal key is an identical tag
+        tag = _tags[key] = handler(value)
+    return tag
+
+
+InternedTag = Annotated[ReInventSessionTag, WrapValidator(_intern_tag)]
+
+
+class ReInventSession(BaseModel):
+    sessionType: InternedStr
+    thirdPartyID: str
+    trackName: InternedStr
+    scheduleTrackUid: InternedStr
+    description: str
+    scheduleUid: str
+    sessionUid: str
+    title: str
+    level: Decimal = -1
+    tags: List[InternedTag]
+    topics: List[InternedStr] = []
+    industries: List[InternedStr] = []
+    roles: List[InternedStr] = []
+    areas_of_interest: List[InternedStr] = []
+    services: List[InternedStr] = []
+
+    @model_validator(mode="after")
+    def _classify(self, info: ValidationInfo) -> "ReInventSession":
+        # Runs once per validated session. Pydantic calls an __init__ override
+        # too when it validates a session, so that would classify it twice.
+        classify_tags(self, _unmapped_parent_tags(info))
+        return self
+
+
+def _unmapped_parent_tags(info: ValidationInfo) -> Optional[Set[str]]:
+    # The validation of a list reports every unmapped parent tag once
+    return info.context.get(UNMAPPED_PARENT_TAGS) if info.context else None
+
+
+def _validation_context() -> Dict[str, Any]:
+    return {UNMAPPED_PARENT_TAGS: set()}
+
+
+def classify_tags(
+    session: ReInventSession, unmapped_parent_tags: Optional[Set[str]] = None
+) -> None:
+    """
+    Derive the level and the tag name lists of a session from its tags. The
+    lists keep the order of the tags, without duplicates. A parent tag without
+    a mapping is reported once per unmapped_parent_tags, if it is given.
+    """
+    _classify_tag_keys(
+        session,
+        (
+            (tag.scheduleTagUid, tag.tagName, tag.parentTagName, tag.parentTagUid)
+            for tag in session.tags
+        ),
+        unmapped_parent_tags,
+    )
+
+
+def _classify_tag_keys(
+    session: Union[ReInventSession, "LazyReInventSession"],
+    tag_keys: Iterable[TagKey],
+    unmapped_parent_tags: Optional[Set[str]],
+) -> None:
+    level = None
+    # Names by field, the keys of a dict are a set that keeps the order
+    names_by_field: Dict[str, Dict[str, None]] = {}
+    for schedule_tag_uid, tag_name, parent_tag_name, parent_tag_uid in tag_keys:
+        level = LEVEL_MAPPING.get(schedule_tag_uid, level)
+
+        field = TAG_FIELDS.get(parent_tag_uid)
+        if field is None:
+            # Report missing mappings
+            if parent_tag_uid in KNOWN_PARENT_TAG_UIDS:
+                continue
+            if unmapped_parent_tags is not None:
+                if parent_tag_uid in unmapped_parent_tags:
+                    continue
+                unmapped_parent_tags.add(parent_tag_uid)
+            print(f"Did not find Parent tag UID for '{parent_tag_name}'")
+            continue
+
+        names = names_by_field.get(field)
+        if names is None:
+            names = names_by_field[field] = dict.fromkeys(getattr(session, field))
+        names[intern(tag_name.strip())] = None
+
+    if level is not None:
+        session.level = level
+    for field, names in names_by_field.items():
+        # Update the list in place, like the default list of the field
+        getattr(session, field)[:] = names
+
+
+class ReInventSessionListBody(TypedDict):
+    """The body of the sessions list response, other keys are ignored"""
+
+    data: List[ReInventSession]
+
+
+# The key tuples of the tags seen by this container, shared by the lazy sessions
+_tag_keys: Dict[TagKey, TagKey] = {}
+
+
+def _tag_key(tag: Any) -> TagKey:
+    key = (
+        tag["scheduleTagUid"],
+        tag["tagName"],
+        tag["parentTagName"],
+        tag["parentTagUid"],
+    )
+    if not all(isinstance(value, str) for value in key):
+        raise ValueError("the fields of a tag should be strings")
+    return _tag_keys.setdefault(key, key) if SESSION_INTERNING else key
+
+
+def _validate_tag_keys(tags: Any) -> Tuple[TagKey, ...]:
+    """The raw tags of a session as their keys, without validating tag models"""
+    if isinstance(tags, tuple):
+        # Already keys, e.g. when a lazy session is copied
+        return tags
+    if not isinstance(tags, list):
+        raise ValueError("tags should be a list")
+    try:
+        return tuple([_tag_key(tag) for tag in tags])
+    except (KeyError, TypeError) as error:
+        raise ValueError(f"a tag is missing a field: {error}")
+
+
+def _validate_utf8(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if not isinstance(value, str):
+        raise ValueError("the description should be a string")
+    return value.encode("utf-8")
+
+
+def _tag_from_key(key: TagKey) -> ReInventSessionTag:
+    tag = _tags.get(key)
+    if tag is None:
+        schedule_tag_uid, tag_name, parent_tag_name, parent_tag_uid = key
+        tag = ReInventSessionTag(
+            scheduleTagUid=schedule_tag_uid,
+            tagName=tag_name,
+            parentTagName=parent_tag_name,
+            parentTagUid=parent_tag_uid,
+        )
+        if SESSION_INTERNING:
+            _tags[key] = tag
+    return tag
+
+
+# Unmapped parent tags of the lazy sessions are reported once per container
+_unmapped_lazy_parent_tags: Set[str] = set()
+
+
+class LazyReInventSession(BaseModel):
+    """
+    Lazy mode of ReInventSession. The description is kept as its UTF-8 bytes
+    and the tags as the tuples of their fields, shared with other sessions,
+    and both are only decoded when read. The derived fields are classified
+    at validation, like for ReInventSession.
+    """
+
+    sessionType: InternedStr
+    thirdPartyID: str
+    trackName: InternedStr
+    scheduleTrackUid: InternedStr
+    description_bytes: Annotated[bytes, PlainValidator(_validate_utf8)] = Field(
+        validation_alias="description"
+    )
+    scheduleUid: str
+    sessionUid: str
+    title: str
+    level: Decimal = -1
+    tag_keys: Annotated[Tuple[TagKey, ...], PlainValidator(_validate_tag_keys)] = Field(
+        validation_alias="tags"
+    )
+    topics: List[InternedStr] = []
+    industries: List[InternedStr] = []
+    roles: List[InternedStr] = []
+    areas_of_interest: List[InternedStr] = []
+    services: List[InternedStr] = []
+
+    @model_validator(mode="after")
+    def _classify(self) -> "LazyReInventSession":
+        _classify_tag_keys(self, self.tag_keys, _unmapped_lazy_parent_tags)
+        return self
+
+    @property
+    def description(self) -> str:
+        return self.description_bytes.decode("utf-8")
+
+    @property
+    def tags(self) -> List[ReInventSessionTag]:
+        return [_tag_from_key(key) for key in self.tag_keys]
+
+    def to_session(self) -> ReInventSession:
+        """The decoded session, without validating it again"""
+        fields = dict(self.__dict__)
+        del fields["description_bytes"], fields["tag_keys"]
+        return ReInventSession.model_construct(
+            description=self.description, tags=self.tags, **fields
+        )
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(type_: Any) -> TypeAdapter:
+    # Building an adapter compiles its validator, so every type gets one
+    return TypeAdapter(type_)
+
+
+class LazyReInventSessionListBody(TypedDict):
+    """The body of the sessions list response, for lazy sessions"""
+
+    data: List[LazyReInventSession]
+
+
+AnySession = Union[ReInventSession, LazyReInventSession]
+
+
+def classify_sessions(
+    raw_sessions: Iterable[Dict[str, Any]], lazy: bool = False
+) -> List[AnySession]:
+    """
+    Create the sessions of a list of raw sessions, e.g. of the sessions list
+    or of the database. Each unmapped parent tag is only reported once. With
+    lazy=True, the sessions are LazyReInventSession.
+    """
+    session_type = LazyReInventSession if lazy else ReInventSession
+    context = _validation_context()
+    # Validating the sessions one by one is faster than validating the list
+    # with a TypeAdapter, see benchmarks/bench_session_validation.py
+    return [
+        session_type.model_validate(raw_session, context=context)
+        for raw_session in raw_sessions
+    ]
+
+
+def validate_session_list_json(
+    body: Union[bytes, str], lazy: bool = False
+) -> List[AnySession]:
+    """
+    Create the sessions of the raw body of a sessions list response. The JSON
+    is parsed and validated by pydantic-core in one pass, without building the
+    intermediate dicts of the raw sessions. With lazy=True, the sessions are
+    LazyReInventSession.
+    """
+    list_body = LazyReInventSessionListBody if lazy else ReInventSessionListBody
+    validated_body = _type_adapter(list_body).validate_json(
+        body, context=_validation_context()
+    )
+    return validated_body["data"]
+
+
+def to_session(session: AnySession) -> ReInventSession:
+    """The decoded session of a lazy session, other sessions as they are"""
+    if isinstance(session, LazyReInventSession):
+        return session.to_session()
+    return session
+
+
+# Fields of a session hashed as they are, the other ones are hashed by
+# content_hash as sets, or as UTF-8 for the description
+CONTENT_HASH_FIELDS = (
+    "sessionType",
+    "thirdPartyID",
+    "trackName",
+    "scheduleTrackUid",
+    "scheduleUid",
+    "sessionUid",
+    "title",
+)
+
+
+def content_hash(session: AnySession) -> str:
+    """
+    A digest of the content of a session, equal for sessions without a diff.
+    Like the diff, it ignores the order and repetitions of the lists, but not
+    the type of the level. Sessions with different hashes can still have an
+    empty diff, e.g. with the levels Decimal("100") and Decimal("100.0").
+    """
+    if isinstance(session, LazyReInventSession):
+        description = session.description_bytes
+        tag_keys = session.tag_keys
+    else:
+        description = session.description.encode("utf-8")
+        tag_keys = [
+            (tag.scheduleTagUid, tag.tagName, tag.parentTagName, tag.parentTagUid)
+            for tag in session.tags
+        ]
+    canonical = [
+        type(session.level).__name__,
+        str(session.level),
+        [getattr(session, field) for field in CONTENT_HASH_FIELDS],
+        sorted(set(tag_keys)),
+        [sorted(set(getattr(session, field))) for field in TAG_FIELDS.values()],
+    ]
+    # The JSON delimits itself, so the description can follow it as it is
+    digest = hashlib.sha256(json.dumps(canonical, ensure_ascii=False).encode())
+    digest.update(description)
+    return digest.hexdigest()
+
+
+# Models built on first use, by the module defining them. Only the fetcher's
+# sync needs the diff models, the other functions don't pay for their schemas.
+_DEFERRED_MODELS = {
+    "ReInventSessionFieldDiff": "diff",
+    "ReInventSessionDiff": "diff",
+    "ReInventSessionListDiff": "diff",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _DEFERRED_MODELS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,29 @@
+"""
+The models of the diff between the sessions of the database and of the API.
+Only the fetcher's sync uses them, so the models package builds them on first
+use, see models.__getattr__.
+"""
+
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+from . import ReInventSession
+
+
+class ReInventSessionFieldDiff(BaseModel):
+    field: str
+    old_value: Any
+    new_value: Any
+
+
+class ReInventSessionDiff(BaseModel):
+    old_session: ReInventSession
+    new_session: ReInventSession
+    changed_fields: List[ReInventSessionFieldDiff]
+
+
+class ReInventSessionListDiff(BaseModel):
+    added_sessions: Dict[str, ReInventSession]
+    removed_sessions: Dict[str, ReInventSession]
+    updated_sessions: Dict[str, ReInventSessionDiff]
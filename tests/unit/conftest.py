@@ -0,0 +1,37 @@
+import pytest
+
+
+@pytest.fixture
+def raw_session():
+    """Builds a session as the sessions list response returns it"""
+
+    def build(uid: str, tags: list, **fields) -> dict:
+        return {
+            "sessionType": "Breakout Session",
+            "thirdPartyID": uid,
+            "trackName": "Breakout Session",
+            "scheduleTrackUid": "TRACK",
+            "description": "Description",
+            "scheduleUid": "SCHEDULE",
+            "sessionUid": uid,
+            "title": "Title",
+            "tags": tags,
+            **fields,
+        }
+
+    return build
+
+
+@pytest.fixture
+def tag():
+    """Builds a tag of a session as the sessions list response returns it"""
+
+    def build(schedule_tag_uid: str, name: str, parent_uid: str) -> dict:
+        return {
+            "scheduleTagUid": schedule_tag_uid,
+            "tagName": name,
+            "parentTagName": "Parent",
+            "parentTagUid": parent_uid,
+        }
+
+    return build
@@ -0,0 +1,70 @@
+import json
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def session_image(title: str, **attributes) -> dict:
+    return {
+        "PK": {"S": "ReInventSession"},
+        "SK": {"S": "A"},
+        "sessionUid": {"S": "A"},
+        "title": {"S": title},
+        "level": {"N": "200"},
+        **attributes,
+    }
+
+
+class TestEventGenerator:
+    """Tests for the events generated from the changes of the sessions table."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/event_generator")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/event_generator")
+        sys.path.remove("resources/layers/common/src")
+
+    @pytest.fixture
+    def index(self, monkeypatch):
+        monkeypatch.setenv("EVENT_BUS_NAME", "events")
+        import index
+
+        monkeypatch.setattr(index, "get_client", MagicMock())
+        yield index
+        # The fetcher has an index module too
+        del sys.modules["index"]
+
+    @staticmethod
+    def test_update_ignores_content_hash(index):
+        # 1. ARRANGE
+        event = {
+            "Records": [
+                {
+                    "eventName": "MODIFY",
+                    "dynamodb": {
+                        "Keys": {"PK": {"S": "ReInventSession"}, "SK": {"S": "A"}},
+                        # Stored before the content hash was
+                        "OldImage": session_image("Old title"),
+                        "NewImage": session_image(
+                            "New title", contentHash={"S": "abc"}
+                        ),
+                    },
+                }
+            ]
+        }
+
+        # 2. ACT
+        index.handler(event, None)
+
+        # 3. ASSERT
+        put_events = index.get_client.return_value.put_events
+        detail = json.loads(put_events.call_args.kwargs["Entries"][0]["Detail"])
+        assert detail["diff"] == {
+            "values_changed": {
+                "root['title']": {"new_value": "New title", "old_value": "Old title"}
+            }
+        }
+        assert "contentHash" not in detail["new"]
@@ -0,0 +1,70 @@
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+import pytest
+
+
+class TestResponseArchive:
+    """Tests for the content addressed archive of the sessions list responses."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+
+    @staticmethod
+    def test_store_is_compressed_and_deduplicated(tmp_path):
+        # 1. ARRANGE
+        from archive import LocalDirectoryArchive, ResponseArchive
+
+        archive = ResponseArchive(LocalDirectoryArchive(directory=str(tmp_path)))
+        body = b'{"data": [{"sessionUid": "A"}]}'
+        digest = hashlib.sha256(body).hexdigest()
+
+        # 2. ACT
+        for _ in range(2):
+            writer = archive.open_writer()
+            writer.write(body[:10])
+            writer.write(body[10:])
+            archive.store(writer, digest)
+
+        # 3. ASSERT
+        object_dir = tmp_path / "objects" / digest[:2]
+        assert os.listdir(object_dir) == [f"{digest}.json.gz"]
+        assert gzip.decompress((object_dir / f"{digest}.json.gz").read_bytes()) == body
+        index = (tmp_path / "index.jsonl").read_text().splitlines()
+        assert [json.loads(entry)["digest"] for entry in index] == [digest, digest]
+
+    @staticmethod
+    def test_add_run_without_object(tmp_path):
+        # 1. ARRANGE
+        from archive import LocalDirectoryArchive, ResponseArchive
+
+        archive = ResponseArchive(LocalDirectoryArchive(directory=str(tmp_path)))
+
+        # 2. ACT
+        archive.add_run("abc")
+
+        # 3. ASSERT
+        assert not (tmp_path / "objects").exists()
+        index = (tmp_path / "index.jsonl").read_text().splitlines()
+        assert json.loads(index[0])["digest"] == "abc"
+
+    @staticmethod
+    def test_incomplete_backend_is_not_instantiable():
+        # 1. ARRANGE
+        from archive import ArchiveBackend
+
+        class ReadOnlyArchive(ArchiveBackend):
+            def exists(self, key):
+                return False
+
+        # 2. ACT & 3. ASSERT
+        with pytest.raises(TypeError):
+            ReadOnlyArchive()
@@ -12,8 +12,10 @@ class TestSessionController:
     @pytest.fixture(autouse=True)
     def function_path(self):
         sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
         yield
         sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
 
     @staticmethod
     def test_get_session_from_list_by_id_not_found():
@@ -1328,3 +1330,135 @@ class TestSessionController:
                 )
             },
         )
+
+    @staticmethod
+    def test_generate_diff_lazy_sessions():
+        # 1. ARRANGE
+        from models import LazyReInventSession, ReInventSession
+        from controllers.session_controller import SessionController
+
+        raw_session = {
+            "sessionType": "standard",
+            "thirdPartyID": "AUT303",
+            "trackName": "Builders' Session",
+            "scheduleTrackUid": "3E4615D2-CDE9-ED11-81DB-A4AC1C44CA4E",
+            "description": "<p>Automakers collect hundreds of petabytes of drive data...",
+            "scheduleUid": "C50C7B1A-FF68-4C97-9AF4-00AE3D6F57BC",
+            "sessionUid": "0BA440C0-4774-40FA-A9B4-582ACB8668DA",
+            "title": "Using generative AI to add objects in model training scenarios in ADDF",
+            "tags": [
+                {
+                    "scheduleTagUid": "3DC75316-93EB-43DB-972C-594B6A06B18E",
+                    "tagName": "AI/ML",
+                    "parentTagName": "Topic",
+                    "parentTagUid": "F2BB2A9C-8783-4072-A0A4-5621D1A481A6",
+                }
+            ],
+        }
+        unchanged_session = raw_session | {"sessionUid": "UNCHANGED"}
+        changed_session = raw_session | {"title": "Changed title"}
+
+        SessionController._init_from_db = MagicMock()
+        SessionController._init_from_db.return_value = [
+            LazyReInventSession.model_validate(raw_session),
+            LazyReInventSession.model_validate(unchanged_session),
+        ]
+
+        controller = SessionController(ddb_table_name="ReInventSessions", lazy=True)
+
+        # 2. ACT
+        response = controller.generate_diff(
+            new_session_list=[
+                LazyReInventSession.model_validate(changed_session),
+                LazyReInventSession.model_validate(unchanged_session),
+            ]
+        )
+
+        # 3. ASSERT
+        assert response.added_sessions == {}
+        assert response.removed_sessions == {}
+        assert list(response.updated_sessions) == [raw_session["sessionUid"]]
+        session_diff = response.updated_sessions[raw_session["sessionUid"]]
+        assert session_diff.old_session == ReInventSession(**raw_session)
+        assert session_diff.new_session == ReInventSession(**changed_session)
+        assert [field.field for field in session_diff.changed_fields] == ["title"]
+
+    @staticmethod
+    def test_generate_diff_compares_stored_content_hashes():
+        # 1. ARRANGE
+        from boto3.dynamodb.types import TypeSerializer
+
+        from models import ReInventSession, classify_sessions
+        from controllers.session_controller import SessionController
+
+        tags = [
+            {
+                "scheduleTagUid": "3DC75316-93EB-43DB-972C-594B6A06B18E",
+                "tagName": "AI/ML",
+                "parentTagName": "Topic",
+                "parentTagUid": "F2BB2A9C-8783-4072-A0A4-5621D1A481A6",
+            },
+            {
+                "scheduleTagUid": "2CABCC3D-F2BB-490C-9265-8CBB7660C579",
+                "tagName": "300 - Advanced",
+                "parentTagName": "Level",
+                "parentTagUid": "2634F5B6-B8E0-4208-92C3-FAE426C930F7",
+            },
+        ]
+        raw_session = {
+            "sessionType": "standard",
+            "thirdPartyID": "AUT303",
+            "trackName": "Builders' Session",
+            "scheduleTrackUid": "3E4615D2-CDE9-ED11-81DB-A4AC1C44CA4E",
+            "description": "<p>Automakers collect hundreds of petabytes of drive data...",
+            "scheduleUid": "C50C7B1A-FF68-4C97-9AF4-00AE3D6F57BC",
+            "sessionUid": "0BA440C0-4774-40FA-A9B4-582ACB8668DA",
+            "title": "Using generative AI to add objects in model training scenarios in ADDF",
+            "tags": tags,
+        }
+        unchanged_session = raw_session | {"sessionUid": "UNCHANGED"}
+        changed_session = raw_session | {"title": "Changed title"}
+
+        # The items as written, then read back from the database
+        serializer = TypeSerializer()
+        pages = [
+            {
+                "Items": [
+                    {
+                        key: serializer.serialize(value)
+                        for key, value in SessionController._session_item(
+                            ReInventSession(**raw)
+                        ).items()
+                    }
+                    for raw in (raw_session, unchanged_session)
+                ]
+            }
+        ]
+        SessionController._init_from_db = MagicMock()
+        controller = SessionController(ddb_table_name="ReInventSessions")
+        controller.sessions = classify_sessions(controller._deserialize_items(pages))
+
+        # 2. ACT
+        response = controller.generate_diff(
+            new_session_list=classify_sessions(
+                [
+                    changed_session,
+                    unchanged_session | {"tags": tags[::-1] + tags[:1]},
+                ],
+                lazy=True,
+            )
+        )
+
+        # 3. ASSERT
+        assert set(controller._content_hashes) == {
+            "UNCHANGED",
+            raw_session["sessionUid"],
+        }
+        assert all(
+            "contentHash" not in session.__dict__ for session in controller.sessions
+        )
+        assert response.added_sessions == {}
+        assert response.removed_sessions == {}
+        assert list(response.updated_sessions) == [raw_session["sessionUid"]]
+        session_diff = response.updated_sessions[raw_session["sessionUid"]]
+        assert [field.field for field in session_diff.changed_fields] == ["title"]
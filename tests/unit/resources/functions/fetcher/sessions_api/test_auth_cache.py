@@ -0,0 +1,114 @@
+import base64
+import json
+import sys
+import time
+
+import pytest
+
+
+def make_token(expires_at: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": expires_at}).encode())
+    return "header." + payload.decode().rstrip("=") + ".signature"
+
+
+class TestAuthCache:
+    """Tests for the portal authentication cache."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+
+    @staticmethod
+    def test_auth_state_from_handshake():
+        # 1. ARRANGE
+        from requests.cookies import RequestsCookieJar
+        from sessions_api.auth_cache import AuthState
+
+        token_expiry = time.time() + 3600
+        cookie_expiry = int(time.time() + 1800)
+        cookies = RequestsCookieJar()
+        cookies.set("session", "abc", domain="hub.reinvent.awsevents.com", path="/")
+        cookies.set("remember", "xyz", expires=cookie_expiry)
+
+        # 2. ACT
+        auth_state = AuthState.from_handshake(
+            cookies=cookies, access_token=make_token(token_expiry)
+        )
+
+        # 3. ASSERT
+        assert auth_state.expires_at == cookie_expiry
+        assert auth_state.is_valid()
+        assert auth_state.cookie_jar().get("session") == "abc"
+        assert auth_state.cookie_jar().get("remember") == "xyz"
+
+    @staticmethod
+    def test_load_from_store(tmp_path):
+        # 1. ARRANGE
+        from requests.cookies import RequestsCookieJar
+        from sessions_api.auth_cache import AuthCache, AuthState
+        from sessions_api.state_store import FileStateStore
+
+        cookies = RequestsCookieJar()
+        cookies.set("session", "abc")
+        auth_state = AuthState.from_handshake(
+            cookies=cookies, access_token=make_token(time.time() + 3600)
+        )
+        AuthCache(store=FileStateStore(directory=str(tmp_path))).save(auth_state)
+
+        # 2. ACT
+        # A new cache, as a cold started container would create it
+        loaded_auth_state = AuthCache(
+            store=FileStateStore(directory=str(tmp_path))
+        ).load()
+
+        # 3. ASSERT
+        assert loaded_auth_state == auth_state
+
+    @staticmethod
+    def test_load_expired():
+        # 1. ARRANGE
+        from requests.cookies import RequestsCookieJar
+        from sessions_api.auth_cache import AuthCache, AuthState
+        from sessions_api.state_store import InMemoryStateStore
+
+        store = InMemoryStateStore()
+        auth_cache = AuthCache(store=store)
+        auth_cache.save(
+            AuthState.from_handshake(
+                cookies=RequestsCookieJar(), access_token=make_token(time.time() + 30)
+            )
+        )
+
+        # 2. ACT
+        loaded_auth_state = auth_cache.load()
+
+        # 3. ASSERT
+        assert loaded_auth_state is None
+        assert store.get("portal-auth") is not None
+
+    @staticmethod
+    def test_invalidate_keeps_refresh_token():
+        # 1. ARRANGE
+        from requests.cookies import RequestsCookieJar
+        from sessions_api.auth_cache import AuthCache, AuthState
+
+        auth_cache = AuthCache()
+        auth_cache.save(
+            AuthState.from_handshake(
+                cookies=RequestsCookieJar(),
+                access_token=make_token(time.time() + 3600),
+                refresh_token="refresh-token",
+            )
+        )
+
+        # 2. ACT
+        auth_cache.invalidate()
+
+        # 3. ASSERT
+        assert auth_cache.load() is None
+        assert auth_cache.get().has_valid_refresh_token()
+        assert auth_cache.get().refresh_token == "refresh-token"
@@ -0,0 +1,111 @@
+import sys
+
+import pytest
+
+
+class TestDeadline:
+    """Tests for the time budget of the invocation."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+
+    @staticmethod
+    def test_check_raises_when_exceeded():
+        # 1. ARRANGE
+        from sessions_api.deadline import Deadline, DeadlineExceededError
+
+        # The safety margin takes all of the budget
+        deadline = Deadline(1.0)
+
+        # 2. ACT & 3. ASSERT
+        deadline.check("Step", 0.0)
+        with pytest.raises(DeadlineExceededError):
+            deadline.check("Step")
+
+    @staticmethod
+    def test_timeout_is_capped_by_remaining_time():
+        # 1. ARRANGE
+        from sessions_api.deadline import Deadline
+
+        deadline = Deadline(4.0)
+
+        # 2. ACT
+        short_timeout = deadline.timeout("Step", 1.0)
+        capped_timeout = deadline.timeout("Step", 10.0)
+
+        # 3. ASSERT
+        assert short_timeout == 1.0
+        assert 2.5 < capped_timeout <= 3.0
+
+    @staticmethod
+    def test_call_retries_connection_errors():
+        # 1. ARRANGE
+        import requests
+
+        from sessions_api.deadline import Deadline
+
+        timeouts = []
+
+        def request(timeout):
+            timeouts.append(timeout)
+            if len(timeouts) == 1:
+                raise requests.ConnectionError()
+            return "response"
+
+        # 2. ACT
+        response = Deadline(30.0).call("Step", request, budget_seconds=5.0)
+
+        # 3. ASSERT
+        assert response == "response"
+        assert timeouts == [5.0, 5.0]
+
+    @staticmethod
+    def test_call_raises_after_last_attempt():
+        # 1. ARRANGE
+        import requests
+
+        from sessions_api.deadline import MAX_ATTEMPTS, Deadline
+
+        attempts = []
+
+        def request(timeout):
+            attempts.append(timeout)
+            raise requests.Timeout()
+
+        # 2. ACT & 3. ASSERT
+        with pytest.raises(requests.Timeout):
+            Deadline(30.0).call("Step", request, budget_seconds=5.0)
+        assert len(attempts) == MAX_ATTEMPTS
+
+    @staticmethod
+    def test_call_does_not_retry_other_errors():
+        # 1. ARRANGE
+        from sessions_api.deadline import Deadline
+
+        attempts = []
+
+        def request(timeout):
+            attempts.append(timeout)
+            raise ValueError()
+
+        # 2. ACT & 3. ASSERT
+        with pytest.raises(ValueError):
+            Deadline(30.0).call("Step", request, budget_seconds=5.0)
+        assert len(attempts) == 1
+
+    @staticmethod
+    def test_call_raises_when_exceeded():
+        # 1. ARRANGE
+        from sessions_api.deadline import Deadline, DeadlineExceededError
+
+        attempts = []
+
+        # 2. ACT & 3. ASSERT
+        with pytest.raises(DeadlineExceededError):
+            Deadline(1.0).call("Step", attempts.append, budget_seconds=5.0)
+        assert attempts == []
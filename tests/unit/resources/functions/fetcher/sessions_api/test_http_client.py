@@ -0,0 +1,79 @@
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *_args):
+        pass
+
+
+class TestHttpClient:
+    """Tests for the connection pool shared by the portal calls."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+
+    @pytest.fixture
+    def server_url(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+        server.shutdown()
+        server.server_close()
+
+    @staticmethod
+    def test_sessions_share_the_adapter(monkeypatch):
+        # 1. ARRANGE
+        from sessions_api import http_client
+
+        monkeypatch.setattr(http_client, "_http_adapter", None)
+
+        # 2. ACT
+        first_session = http_client.create_http_session()
+        second_session = http_client.create_http_session()
+
+        # 3. ASSERT
+        adapter = first_session.get_adapter("https://portal")
+        assert isinstance(adapter, http_client.InstrumentedHTTPAdapter)
+        assert second_session.get_adapter("https://portal") is adapter
+        assert second_session.get_adapter("http://portal") is adapter
+        # Each session keeps its own cookies
+        assert first_session.cookies is not second_session.cookies
+
+    @staticmethod
+    def test_sessions_reuse_pooled_connections(monkeypatch, server_url):
+        # 1. ARRANGE
+        from sessions_api import http_client
+
+        monkeypatch.setattr(http_client, "_http_adapter", None)
+
+        # 2. ACT
+        responses = [
+            http_client.create_http_session().get(server_url) for _ in range(3)
+        ]
+
+        # 3. ASSERT
+        assert [response.connection_reused for response in responses] == [
+            False,
+            True,
+            True,
+        ]
+        pool = http_client._http_adapter.poolmanager.connection_from_url(server_url)
+        assert pool.num_connections == 1
@@ -0,0 +1,70 @@
+import json
+import sys
+
+import pytest
+
+
+class TestJsonStream:
+    """Tests for the incremental JSON parsing of the sessions list."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+
+    @staticmethod
+    def test_iter_json_items_across_chunk_boundaries():
+        # 1. ARRANGE
+        from sessions_api.json_stream import iter_json_items
+
+        document = {
+            "data": [
+                {"sessionUid": "A", "title": "Sessión A", "level": 300},
+                {"sessionUid": "B", "title": "Session B", "tags": [{"tagName": "x"}]},
+            ],
+            "total": 2,
+        }
+        body = json.dumps(document, ensure_ascii=False).encode("utf-8")
+        # Split the body into 3 byte chunks, which also splits multi-byte characters
+        chunks = [body[i : i + 3] for i in range(0, len(body), 3)]
+
+        # 2. ACT
+        items = list(iter_json_items(chunks, "data.item"))
+
+        # 3. ASSERT
+        assert items == document["data"]
+
+    @staticmethod
+    def test_iter_json_items_is_lazy():
+        # 1. ARRANGE
+        from sessions_api.json_stream import iter_json_items
+
+        consumed_chunks = []
+
+        def chunks():
+            for chunk in [b'{"data": [{"id": 1},', b' {"id": 2}', b"]}"]:
+                consumed_chunks.append(chunk)
+                yield chunk
+
+        # 2. ACT
+        items = iter_json_items(chunks(), "data.item")
+        first_item = next(items)
+
+        # 3. ASSERT
+        assert first_item == {"id": 1}
+        assert len(consumed_chunks) == 1
+        assert list(items) == [{"id": 2}]
+
+    @staticmethod
+    def test_iter_json_items_empty_list():
+        # 1. ARRANGE
+        from sessions_api.json_stream import iter_json_items
+
+        # 2. ACT
+        items = list(iter_json_items([b'{"data": []}'], "data.item"))
+
+        # 3. ASSERT
+        assert items == []
@@ -0,0 +1,108 @@
+import gzip
+import io
+import json
+import sys
+from unittest.mock import MagicMock, call
+
+import pytest
+
+
+def gzip_response(body: bytes):
+    from requests import Response
+    from urllib3 import HTTPResponse
+
+    compressed = gzip.compress(body)
+    response = Response()
+    response.status_code = 200
+    response.headers["Content-Encoding"] = "gzip"
+    response.raw = HTTPResponse(
+        body=io.BytesIO(compressed),
+        headers={"Content-Encoding": "gzip"},
+        status=200,
+        preload_content=False,
+        decode_content=True,
+    )
+    return response, len(compressed)
+
+
+class TestSessionList:
+    """Tests for the streamed sessions list response."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+
+    @pytest.fixture
+    def metrics(self, monkeypatch):
+        from sessions_api import session_list
+
+        metrics = MagicMock()
+        monkeypatch.setattr(session_list, "metrics", metrics)
+        return metrics
+
+    @staticmethod
+    def test_compressed_response_counts_wire_and_decoded_bytes(metrics):
+        # 1. ARRANGE
+        from aws_lambda_powertools.metrics import MetricUnit
+
+        from sessions_api.deadline import Deadline
+        from sessions_api.session_list import SessionList
+
+        sessions = [{"sessionUid": str(uid), "title": "Title"} for uid in range(100)]
+        body = json.dumps({"data": sessions}).encode("utf-8")
+        response, compressed_bytes = gzip_response(body)
+        session_list = SessionList(response, Deadline(30))
+
+        # 2. ACT
+        streamed_sessions = list(session_list)
+
+        # 3. ASSERT
+        assert streamed_sessions == sessions
+        assert session_list.wire_bytes == compressed_bytes
+        assert session_list.decoded_bytes == len(body)
+        assert compressed_bytes < len(body)
+        metrics.add_metric.assert_has_calls(
+            [
+                call(
+                    name="SessionsListWireBytes",
+                    unit=MetricUnit.Bytes,
+                    value=compressed_bytes,
+                ),
+                call(
+                    name="SessionsListDecodedBytes",
+                    unit=MetricUnit.Bytes,
+                    value=len(body),
+                ),
+            ]
+        )
+
+    @staticmethod
+    def test_failing_chunk_listener_is_detached(metrics, monkeypatch):
+        # 1. ARRANGE
+        from sessions_api import session_list as session_list_module
+        from sessions_api.deadline import Deadline
+        from sessions_api.session_list import SessionList
+
+        # A body of several chunks
+        monkeypatch.setattr(session_list_module, "SESSIONS_STREAM_CHUNK_SIZE", 8)
+        body = json.dumps({"data": [{"sessionUid": "A"}]}).encode("utf-8")
+        response, _compressed_bytes = gzip_response(body)
+        session_list = SessionList(response, Deadline(30))
+        failing_listener = MagicMock(side_effect=OSError("No space left on device"))
+        chunks = []
+        session_list.add_chunk_listener(failing_listener)
+        session_list.add_chunk_listener(chunks.append)
+
+        # 2. ACT
+        read_body = session_list.read()
+
+        # 3. ASSERT
+        assert read_body == body
+        assert len(chunks) > 1
+        assert b"".join(chunks) == body
+        failing_listener.assert_called_once()
+        assert session_list.failed_listeners == [failing_listener]
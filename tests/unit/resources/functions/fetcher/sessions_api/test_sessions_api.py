@@ -0,0 +1,312 @@
+import json
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def authentication_result(**tokens) -> dict:
+    return {"AuthenticationResult": tokens}
+
+
+def session_list_response(*sessions: dict, status_code: int = 200) -> MagicMock:
+    body = json.dumps({"data": list(sessions)}).encode("utf-8")
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {}
+    response.iter_content.return_value = iter([body])
+    response.raw.tell.return_value = len(body)
+    return response
+
+
+def session(uid: str, session_type: str) -> dict:
+    return {"sessionUid": uid, "sessionType": session_type}
+
+
+class TestSessionsApi:
+    """Tests for the steps of the sessions fetch."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+
+    @pytest.fixture
+    def cognito_client(self, monkeypatch):
+        import boto3
+        import sessions_api
+
+        client = boto3.client("cognito-idp", region_name="us-east-1")
+        monkeypatch.setattr(
+            sessions_api, "get_client", lambda *_args, **_kwargs: client
+        )
+        return client
+
+    @pytest.fixture
+    def aws_srp(self, monkeypatch):
+        import sessions_api
+
+        aws_srp = MagicMock()
+        monkeypatch.setattr(sessions_api, "AWSSRP", aws_srp)
+        monkeypatch.setattr(sessions_api, "EPHEMERAL_KEY_POOL", MagicMock())
+        return aws_srp
+
+    @pytest.fixture
+    def handshake_steps(self, monkeypatch):
+        import sessions_api
+
+        steps = MagicMock()
+        steps.call_attendee_portal_url.return_value = "login-url"
+        steps.call_login_url.return_value = "authorize-url"
+        steps.call_authorize_url.return_value = ("code", "state")
+        for name in (
+            "create_http_session",
+            "call_attendee_portal_url",
+            "call_login_url",
+            "call_authorize_url",
+            "perform_storage_call",
+            "get_cookies",
+        ):
+            monkeypatch.setattr(sessions_api, name, getattr(steps, name))
+        return steps
+
+    @staticmethod
+    def test_get_tokens_with_refresh_token(cognito_client, aws_srp):
+        # 1. ARRANGE
+        from botocore.stub import Stubber
+
+        from sessions_api import COGNITO_CLIENT_ID, get_tokens
+        from sessions_api.deadline import Deadline
+
+        stubber = Stubber(cognito_client)
+        stubber.add_response(
+            "initiate_auth",
+            authentication_result(AccessToken="access", IdToken="id"),
+            {
+                "AuthFlow": "REFRESH_TOKEN_AUTH",
+                "AuthParameters": {"REFRESH_TOKEN": "refresh"},
+                "ClientId": COGNITO_CLIENT_ID,
+            },
+        )
+
+        # 2. ACT
+        with stubber:
+            tokens = get_tokens(
+                "user", "password", Deadline(30), refresh_token="refresh"
+            )
+
+        # 3. ASSERT
+        stubber.assert_no_pending_responses()
+        assert tokens == ("access", "refresh", "id")
+        aws_srp.assert_not_called()
+
+    @staticmethod
+    def test_get_tokens_falls_back_to_srp(cognito_client, aws_srp):
+        # 1. ARRANGE
+        from botocore.stub import Stubber
+
+        from sessions_api import get_tokens
+        from sessions_api.deadline import Deadline
+
+        stubber = Stubber(cognito_client)
+        stubber.add_client_error(
+            "initiate_auth", service_error_code="NotAuthorizedException"
+        )
+        aws_srp.return_value.authenticate_user.return_value = authentication_result(
+            AccessToken="access", RefreshToken="new refresh", IdToken="id"
+        )
+
+        # 2. ACT
+        with stubber:
+            tokens = get_tokens(
+                "user", "password", Deadline(30), refresh_token="expired"
+            )
+
+        # 3. ASSERT
+        stubber.assert_no_pending_responses()
+        assert tokens == ("access", "new refresh", "id")
+        assert aws_srp.call_args.kwargs["client"] is cognito_client
+        aws_srp.return_value.authenticate_user.assert_called_once_with()
+
+    @staticmethod
+    def test_fetch_session_partitions_merges_partitions(monkeypatch):
+        # 1. ARRANGE
+        import sessions_api
+        from sessions_api.deadline import Deadline
+        from sessions_api.session_list import SessionListPartitioning
+
+        partitioning = SessionListPartitioning(
+            parameter="sessionType", values=["Breakout", "Workshop"]
+        )
+        monkeypatch.setattr(
+            sessions_api,
+            "call_sessions_url",
+            lambda *_args, params, **_kwargs: session_list_response(
+                session("B", "Workshop"), session("C", "Workshop")
+            ),
+        )
+        first_response = session_list_response(
+            session("A", "Breakout"), session("B", "Breakout")
+        )
+
+        # 2. ACT
+        merged_sessions = sessions_api.fetch_session_partitions(
+            None, partitioning, first_response, Deadline(30)
+        )
+
+        # 3. ASSERT
+        # The duplicate is kept from the first partition it is in
+        assert list(merged_sessions) == [
+            session("A", "Breakout"),
+            session("B", "Breakout"),
+            session("C", "Workshop"),
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "first_partition, second_partition",
+        [
+            # A partition is not available
+            (
+                [session("A", "Breakout")],
+                session_list_response(status_code=500),
+            ),
+            # A partition is empty, e.g. the values are wrong
+            ([session("A", "Breakout")], session_list_response()),
+            # The parameter is ignored, and the sessions have no such field
+            (
+                [{"sessionUid": "A"}],
+                session_list_response({"sessionUid": "A"}),
+            ),
+            # The parameter is ignored, the partition has other sessions
+            (
+                [session("A", "Breakout"), session("B", "Workshop")],
+                session_list_response(
+                    session("B", "Workshop"), session("C", "Keynote")
+                ),
+            ),
+        ],
+    )
+    def test_fetch_session_partitions_without_coverage(
+        monkeypatch, first_partition, second_partition
+    ):
+        # 1. ARRANGE
+        import sessions_api
+        from sessions_api.deadline import Deadline
+        from sessions_api.session_list import SessionListPartitioning
+
+        partitioning = SessionListPartitioning(
+            parameter="sessionType", values=["Breakout", "Workshop"]
+        )
+        monkeypatch.setattr(
+            sessions_api,
+            "call_sessions_url",
+            lambda *_args, **_kwargs: second_partition,
+        )
+
+        # 2. ACT
+        merged_sessions = sessions_api.fetch_session_partitions(
+            None, partitioning, session_list_response(*first_partition), Deadline(30)
+        )
+
+        # 3. ASSERT
+        assert merged_sessions is None
+
+    @staticmethod
+    def test_fetch_sessions_falls_back_to_single_request(monkeypatch):
+        # 1. ARRANGE
+        import sessions_api
+        from sessions_api.deadline import Deadline
+        from sessions_api.session_list import SessionList, SessionListPartitioning
+
+        partitioning = SessionListPartitioning(
+            parameter="sessionType", values=["Breakout", "Workshop"]
+        )
+        responses = {
+            "Breakout": session_list_response(session("A", "Breakout")),
+            # An incomplete list of values, the portal has no such partition
+            "Workshop": session_list_response(),
+            None: session_list_response(
+                session("A", "Breakout"), session("B", "Workshop")
+            ),
+        }
+        requested_params = []
+
+        def call_sessions_url(cookies, stream, deadline, sync_state=None, params=None):
+            requested_params.append(params)
+            return responses[params["sessionType"] if params else None]
+
+        monkeypatch.setattr(sessions_api, "call_sessions_url", call_sessions_url)
+
+        # 2. ACT
+        sessions = sessions_api.fetch_sessions(
+            "user",
+            "password",
+            stream=True,
+            auth_cache=MagicMock(),
+            partitioning=partitioning,
+            deadline=Deadline(30),
+        )
+
+        # 3. ASSERT
+        assert isinstance(sessions, SessionList)
+        assert list(sessions) == [session("A", "Breakout"), session("B", "Workshop")]
+        assert requested_params[-1] is None
+
+    @staticmethod
+    def test_handshake_fails_without_waiting_for_cognito(
+        monkeypatch, capsys, handshake_steps
+    ):
+        # 1. ARRANGE
+        import threading
+
+        import sessions_api
+        from sessions_api.deadline import Deadline
+
+        release_tokens = threading.Event()
+        tokens_logged = threading.Event()
+
+        def get_tokens(*_args, **_kwargs):
+            release_tokens.wait(10)
+            raise RuntimeError("cognito")
+
+        def log_abandoned_tokens(tokens_future):
+            log_abandoned_tokens_of_module(tokens_future)
+            tokens_logged.set()
+
+        log_abandoned_tokens_of_module = sessions_api.log_abandoned_tokens
+        monkeypatch.setattr(sessions_api, "get_tokens", get_tokens)
+        monkeypatch.setattr(sessions_api, "log_abandoned_tokens", log_abandoned_tokens)
+        handshake_steps.call_login_url.side_effect = RuntimeError("redirect")
+
+        # 2. ACT & 3. ASSERT
+        # The cognito authentication is still running when the redirects fail
+        with pytest.raises(RuntimeError, match="redirect"):
+            sessions_api.perform_handshake("user", "password", Deadline(30))
+        release_tokens.set()
+        assert tokens_logged.wait(10)
+        assert "Abandoned cognito authentication failed: RuntimeError('cognito')" in (
+            capsys.readouterr().out
+        )
+        handshake_steps.perform_storage_call.assert_not_called()
+
+    @staticmethod
+    def test_handshake_raises_cognito_error(monkeypatch, handshake_steps):
+        # 1. ARRANGE
+        import sessions_api
+        from sessions_api.deadline import Deadline
+
+        def get_tokens(*_args, **_kwargs):
+            raise RuntimeError("cognito")
+
+        monkeypatch.setattr(sessions_api, "get_tokens", get_tokens)
+
+        # 2. ACT & 3. ASSERT
+        # The cognito authentication fails before the redirects complete
+        with pytest.raises(RuntimeError, match="cognito"):
+            sessions_api.perform_handshake("user", "password", Deadline(30))
+        handshake_steps.call_authorize_url.assert_called_once()
+        handshake_steps.perform_storage_call.assert_not_called()
@@ -0,0 +1,112 @@
+import sys
+
+import pytest
+
+
+class TestStateStore:
+    """Tests for the state stores kept across invocations."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+
+    @staticmethod
+    def test_file_state_store(tmp_path):
+        # 1. ARRANGE
+        from sessions_api.state_store import FileStateStore
+
+        store = FileStateStore(directory=str(tmp_path / "state"))
+
+        # 2. ACT
+        missing = store.get("sync")
+        store.put("sync", {"digest": "abc"})
+        stored = FileStateStore(directory=str(tmp_path / "state")).get("sync")
+        store.delete("sync")
+        store.delete("sync")
+
+        # 3. ASSERT
+        assert missing is None
+        assert stored == {"digest": "abc"}
+        assert store.get("sync") is None
+
+    @staticmethod
+    def test_incomplete_state_store_is_not_instantiable():
+        # 1. ARRANGE
+        from sessions_api.state_store import StateStore
+
+        class GetOnlyStateStore(StateStore):
+            def get(self, key):
+                return None
+
+        # 2. ACT & 3. ASSERT
+        with pytest.raises(TypeError):
+            GetOnlyStateStore()
+
+    @staticmethod
+    def test_secrets_manager_state_store():
+        # 1. ARRANGE
+        import json
+
+        from botocore.stub import Stubber
+
+        from aws_clients import get_client
+        from sessions_api.state_store import SecretsManagerStateStore
+
+        store = SecretsManagerStateStore(secret_id="FetcherAuth")
+        stubber = Stubber(get_client("secretsmanager"))
+        # A new secret holds a generated value
+        stubber.add_response(
+            "get_secret_value",
+            {"SecretString": "generated"},
+            {"SecretId": "FetcherAuth"},
+        )
+        stubber.add_response(
+            "put_secret_value",
+            {},
+            {
+                "SecretId": "FetcherAuth",
+                "SecretString": json.dumps({"portal-auth": {"expires_at": 1.0}}),
+            },
+        )
+        stubber.add_response(
+            "get_secret_value",
+            {"SecretString": json.dumps({"portal-auth": {"expires_at": 1.0}})},
+            {"SecretId": "FetcherAuth"},
+        )
+        stubber.add_client_error(
+            "get_secret_value", service_error_code="ResourceNotFoundException"
+        )
+
+        # 2. ACT
+        with stubber:
+            store.put("portal-auth", {"expires_at": 1.0})
+            stored = store.get("portal-auth")
+            missing = store.get("portal-auth")
+
+        # 3. ASSERT
+        stubber.assert_no_pending_responses()
+        assert stored == {"expires_at": 1.0}
+        assert missing is None
+
+    @staticmethod
+    def test_sync_state_conditional_headers():
+        # 1. ARRANGE
+        from sessions_api.session_list import SyncState
+
+        sync_state = SyncState(
+            etag='"etag"', last_modified="Mon, 27 Nov 2023 08:00:00 GMT", digest="ab"
+        )
+
+        # 2. ACT
+        headers = sync_state.conditional_headers()
+
+        # 3. ASSERT
+        assert headers == {
+            "If-None-Match": '"etag"',
+            "If-Modified-Since": "Mon, 27 Nov 2023 08:00:00 GMT",
+        }
+        assert SyncState(digest="ab").conditional_headers() == {}
@@ -0,0 +1,75 @@
+import sys
+
+import pytest
+
+
+class TestTiming:
+    """Tests for the phase timings of the fetch."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+
+    @staticmethod
+    def test_timed_records_failed_phase():
+        # 1. ARRANGE
+        from sessions_api.timing import phase_percentiles, timed
+
+        # 2. ACT
+        with pytest.raises(ValueError):
+            with timed("TestFailingPhase"):
+                raise ValueError()
+
+        # 3. ASSERT
+        assert phase_percentiles()["TestFailingPhase"]["count"] == 1
+
+    @staticmethod
+    def test_phase_percentiles():
+        # 1. ARRANGE
+        from sessions_api.timing import PhaseTiming, phase_percentiles, record_phase
+
+        for seconds in range(1, 101):
+            timing = PhaseTiming("TestPercentilePhase")
+            timing.seconds = float(seconds)
+            record_phase(timing)
+
+        # 2. ACT
+        percentiles = phase_percentiles((50, 90, 99))["TestPercentilePhase"]
+
+        # 3. ASSERT
+        assert percentiles == {"p50": 50.0, "p90": 90.0, "p99": 99.0, "count": 100}
+
+    @staticmethod
+    def test_instrumented_client_records_failed_call():
+        # 1. ARRANGE
+        import boto3
+        from botocore.config import Config
+        from botocore.exceptions import EndpointConnectionError
+
+        from sessions_api.timing import instrument_client, phase_percentiles
+
+        # Nothing listens on the discard port, the connection is refused
+        client = boto3.client(
+            "cognito-idp",
+            region_name="us-east-1",
+            endpoint_url="http://127.0.0.1:9",
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+            config=Config(retries={"total_max_attempts": 1}, connect_timeout=1),
+        )
+        instrument_client(client, "TestUnreachable")
+
+        # 2. ACT
+        with pytest.raises(EndpointConnectionError):
+            client.initiate_auth(
+                AuthFlow="REFRESH_TOKEN_AUTH",
+                AuthParameters={"REFRESH_TOKEN": "refresh"},
+                ClientId="client",
+            )
+
+        # 3. ASSERT
+        assert phase_percentiles()["TestUnreachableInitiateAuth"]["count"] == 1
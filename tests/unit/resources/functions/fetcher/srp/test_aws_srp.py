@@ -0,0 +1,207 @@
+import sys
+
+import pytest
+
+
+class TestAwsSrp:
+    """Tests for the SRP math of the Cognito authentication."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+
+    @staticmethod
+    def create_srp():
+        from srp.aws_srp import AWSSRP
+
+        return AWSSRP(
+            username="user",
+            password="secret",
+            pool_id="us-east-1_pool",
+            client_id="client",
+            client=object(),
+        )
+
+    @staticmethod
+    def test_group_constants():
+        # 1. ARRANGE
+        from srp.aws_srp import g_hex, hex_hash, hex_to_long, n_hex
+
+        # 2. ACT
+        srp = TestAwsSrp.create_srp()
+
+        # 3. ASSERT
+        assert srp.big_n == hex_to_long(n_hex)
+        assert srp.g == hex_to_long(g_hex)
+        assert srp.k == hex_to_long(hex_hash("00" + n_hex + "0" + g_hex))
+
+    @staticmethod
+    def test_bigint_backends_are_equivalent():
+        # 1. ARRANGE
+        from srp import bigint
+        from srp.aws_srp import BIG_N, G
+
+        if bigint.gmpy2 is None:
+            pytest.skip("gmpy2 is not installed")
+        python_mod_pow = bigint.load_backend("python")
+        gmpy2_mod_pow = bigint.load_backend("gmpy2")
+        srp = TestAwsSrp.create_srp()
+        server_b = python_mod_pow(2, 123456789, BIG_N)
+
+        # 2. ACT
+        results = {}
+        for name, mod_pow in (("python", python_mod_pow), ("gmpy2", gmpy2_mod_pow)):
+            bigint.mod_pow = mod_pow
+            results[name] = (
+                mod_pow(G, srp.small_a_value, BIG_N),
+                srp.get_password_authentication_key("user", "secret", server_b, "ab12"),
+                # The base of the exponentiation of S can be negative
+                mod_pow(-(BIG_N // 3), 65537, BIG_N),
+            )
+        bigint.mod_pow = bigint.load_backend(bigint.BACKEND)
+
+        # 3. ASSERT
+        assert results["python"] == results["gmpy2"]
+
+    @staticmethod
+    def test_unknown_bigint_backend():
+        # 1. ARRANGE
+        from srp import bigint
+
+        # 2. ACT & 3. ASSERT
+        with pytest.raises(ValueError):
+            bigint.load_backend("unknown")
+
+    @staticmethod
+    def test_key_pool_hands_out_keys_once():
+        # 1. ARRANGE
+        from srp.aws_srp import AWSSRP, BIG_N, G, generate_ephemeral_key
+        from srp.key_pool import EphemeralKeyPool
+
+        key_pool = EphemeralKeyPool(generate_ephemeral_key, size=2)
+        key_pool.fill()
+
+        # 2. ACT
+        srps = [
+            AWSSRP(
+                username="user",
+                password="secret",
+                pool_id="us-east-1_pool",
+                client_id="client",
+                client=object(),
+                key_pool=key_pool,
+            )
+            for _ in range(3)
+        ]
+
+        # 3. ASSERT
+        assert len(key_pool) == 0
+        assert len({srp.small_a_value for srp in srps}) == 3
+        for srp in srps:
+            assert srp.large_a_value == pow(G, srp.small_a_value, BIG_N)
+
+    @staticmethod
+    def test_key_pool_refill_in_background():
+        # 1. ARRANGE
+        from srp.aws_srp import generate_ephemeral_key
+        from srp.key_pool import EphemeralKeyPool
+
+        key_pool = EphemeralKeyPool(generate_ephemeral_key, size=2)
+
+        # 2. ACT
+        key_pool.refill_in_background()
+        key_pool._refill_thread.join()
+
+        # 3. ASSERT
+        assert len(key_pool) == 2
+
+    @staticmethod
+    def test_pad_bytes_matches_pad_hex():
+        # 1. ARRANGE
+        import random
+        from srp.aws_srp import BIG_N, pad_bytes, pad_hex, pad_hex_bytes
+
+        rng = random.Random(0)
+        numbers = [0, 1, 0x7F, 0x80, 0xFF, 0x100, 0x800, 0x8000, BIG_N]
+        numbers += [rng.getrandbits(rng.randint(1, 3072)) for _ in range(200)]
+        hex_strings = ["0", "f", "7f", "80", "00ab", "0080", "abc", "8abc", "ABCD"]
+
+        # 2. ACT & 3. ASSERT
+        for number in numbers:
+            assert pad_bytes(number) == bytes.fromhex(pad_hex(number))
+        for hex_string in hex_strings:
+            assert pad_hex_bytes(hex_string) == bytes.fromhex(pad_hex(hex_string))
+
+    @staticmethod
+    def test_bytes_hashing_matches_hex_hashing():
+        # 1. ARRANGE
+        from srp.aws_srp import (
+            BIG_N,
+            calculate_u,
+            compute_hkdf,
+            hash_sha256,
+            hex_hash,
+            hex_to_long,
+            long_to_hex,
+            pad_hex,
+        )
+
+        srp = TestAwsSrp.create_srp()
+        server_b = pow(2, 987654321, BIG_N)
+        # The salt has a leading zero byte, which must be kept
+        salt = "00e3b0c44298fc1c149afbf4c8996fb9"
+
+        def hex_password_authentication_key():
+            # The hex string based implementation the bytes one replaces
+            u_value = hex_to_long(
+                hex_hash(pad_hex(srp.large_a_value) + pad_hex(server_b))
+            )
+            username_password_hash = hash_sha256("pooluser:secret".encode("utf-8"))
+            x_value = hex_to_long(hex_hash(pad_hex(salt) + username_password_hash))
+            s_value = pow(
+                server_b - srp.k * pow(srp.g, x_value, srp.big_n),
+                srp.small_a_value + u_value * x_value,
+                srp.big_n,
+            )
+            return u_value, compute_hkdf(
+                bytearray.fromhex(pad_hex(s_value)),
+                bytearray.fromhex(pad_hex(long_to_hex(u_value))),
+            )
+
+        # 2. ACT
+        expected_u, expected_key = hex_password_authentication_key()
+        u_value = calculate_u(srp.large_a_value, server_b)
+        key = srp.get_password_authentication_key("user", "secret", server_b, salt)
+
+        # 3. ASSERT
+        assert u_value == expected_u
+        assert key == expected_key
+
+    @staticmethod
+    def test_unsupported_challenge():
+        # 1. ARRANGE
+        import asyncio
+        from unittest.mock import MagicMock
+
+        from srp.aws_srp import AWSSRP
+
+        client = MagicMock()
+        client.initiate_auth.return_value = {"ChallengeName": "SMS_MFA"}
+        srp = AWSSRP(
+            username="user",
+            password="secret",
+            pool_id="us-east-1_pool",
+            client_id="client",
+            client=client,
+        )
+
+        # 2. ACT & 3. ASSERT
+        with pytest.raises(NotImplementedError):
+            srp.authenticate_user()
+        with pytest.raises(NotImplementedError):
+            asyncio.run(srp.authenticate_user_async())
+        client.respond_to_auth_challenge.assert_not_called()
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def session_list_response(status_code: int, body: bytes = b"") -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {"ETag": '"etag"'}
+    response.iter_content.return_value = iter([body])
+    response.raw.tell.return_value = len(body)
+    return response
+
+
+def session_list_body(**fields) -> bytes:
+    session = {
+        "sessionType": "Breakout Session",
+        "thirdPartyID": "A",
+        "trackName": "Breakout Session",
+        "scheduleTrackUid": "TRACK",
+        "description": "Description",
+        "scheduleUid": "SCHEDULE",
+        "sessionUid": "A",
+        "title": "Title",
+        "tags": [],
+    }
+    return json.dumps({"data": [session | fields]}).encode("utf-8")
+
+
+def lambda_context() -> MagicMock:
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = 30000
+    return context
+
+
+class TestFetcherHandler:
+    """Tests for the short-circuits of the fetcher handler."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+
+    @pytest.fixture
+    def index(self, monkeypatch):
+        monkeypatch.setenv("CREDENTIAL_SECRET_NAME", "credentials")
+        monkeypatch.setenv("DDB_TABLE_NAME", "sessions")
+        for name in ("STATE_TABLE_NAME", "STATE_DIRECTORY", "AUTH_SECRET_NAME"):
+            monkeypatch.delenv(name, raising=False)
+        for name in ("ARCHIVE_BUCKET_NAME", "ARCHIVE_DIRECTORY"):
+            monkeypatch.delenv(name, raising=False)
+        from botocore.stub import Stubber
+
+        from aws_clients import get_client
+
+        # The module loads the credentials and creates the stores on import
+        stubber = Stubber(get_client("secretsmanager"))
+        stubber.add_response(
+            "get_secret_value",
+            {"SecretString": json.dumps({"username": "user", "password": "secret"})},
+            {"SecretId": "credentials"},
+        )
+        with stubber:
+            import index
+
+        monkeypatch.setattr(index, "SessionController", MagicMock())
+        yield index
+        # The event generator has an index module too
+        del sys.modules["index"]
+
+    @staticmethod
+    def test_not_modified_closes_the_response(index, monkeypatch):
+        # 1. ARRANGE
+        from sessions_api.deadline import Deadline
+        from sessions_api.session_list import SessionList
+
+        response = session_list_response(304)
+        monkeypatch.setattr(
+            index,
+            "fetch_sessions",
+            lambda **_kwargs: SessionList(response, Deadline(30)),
+        )
+
+        # 2. ACT
+        index.handler({}, lambda_context())
+
+        # 3. ASSERT
+        response.close.assert_called_once_with()
+        response.iter_content.assert_not_called()
+        index.SessionController.assert_not_called()
+
+    @staticmethod
+    def test_identical_digest_skips_the_sync(index, monkeypatch):
+        # 1. ARRANGE
+        from sessions_api.deadline import Deadline
+        from sessions_api.session_list import SessionList, SyncState
+
+        body = session_list_body()
+        digest = hashlib.sha256(body).hexdigest()
+        SyncState(digest=digest).save(index.STATE_STORE)
+        response = session_list_response(200, body)
+        monkeypatch.setattr(
+            index,
+            "fetch_sessions",
+            lambda **_kwargs: SessionList(response, Deadline(30)),
+        )
+        monkeypatch.setattr(index, "validate_session_list_json", MagicMock())
+
+        # 2. ACT
+        index.handler({}, lambda_context())
+
+        # 3. ASSERT
+        response.close.assert_called_once_with()
+        # The unchanged list is not validated
+        index.validate_session_list_json.assert_not_called()
+        index.SessionController.assert_not_called()
+        assert SyncState.load(index.STATE_STORE) == SyncState(
+            etag='"etag"', digest=digest
+        )
+
+    @staticmethod
+    def test_failing_archive_does_not_fail_the_sync(index, monkeypatch):
+        # 1. ARRANGE
+        from archive import ResponseArchive
+        from sessions_api.deadline import Deadline
+        from sessions_api.session_list import SessionList
+
+        backend = MagicMock()
+        backend.exists.side_effect = RuntimeError("archive is not available")
+        monkeypatch.setattr(index, "ARCHIVE", ResponseArchive(backend))
+        response = session_list_response(200, session_list_body())
+        monkeypatch.setattr(
+            index,
+            "fetch_sessions",
+            lambda **_kwargs: SessionList(response, Deadline(30)),
+        )
+
+        # 2. ACT
+        index.handler({}, lambda_context())
+
+        # 3. ASSERT
+        backend.exists.assert_called_once()
+        index.SessionController.assert_called_once()
+
+    @staticmethod
+    def test_invalid_response_is_not_archived(index, monkeypatch):
+        # 1. ARRANGE
+        from pydantic import ValidationError
+
+        from archive import ArchiveWriter, ResponseArchive
+        from sessions_api.deadline import Deadline
+        from sessions_api.session_list import SessionList
+
+        backend = MagicMock()
+        archive = ResponseArchive(backend)
+        writer = ArchiveWriter()
+        monkeypatch.setattr(archive, "open_writer", lambda: writer)
+        monkeypatch.setattr(index, "ARCHIVE", archive)
+        response = session_list_response(200, session_list_body(title=None))
+        monkeypatch.setattr(
+            index,
+            "fetch_sessions",
+            lambda **_kwargs: SessionList(response, Deadline(30)),
+        )
+
+        # 2. ACT
+        with pytest.raises(ValidationError):
+            index.handler({}, lambda_context())
+
+        # 3. ASSERT
+        assert writer._file.closed
+        backend.put.assert_not_called()
+        index.SessionController.assert_not_called()
+
+    @staticmethod
+    def test_failing_archive_writer_does_not_fail_the_sync(index, monkeypatch):
+        # 1. ARRANGE
+        from archive import ArchiveWriter, ResponseArchive
+        from sessions_api.deadline import Deadline
+        from sessions_api.session_list import SessionList
+
+        backend = MagicMock()
+        archive = ResponseArchive(backend)
+        writer = ArchiveWriter()
+        monkeypatch.setattr(archive, "open_writer", lambda: writer)
+        monkeypatch.setattr(index, "ARCHIVE", archive)
+        # The temporary file can't be written, e.g. the disk is full
+        monkeypatch.setattr(writer, "_file", MagicMock())
+        writer._file.write.side_effect = OSError("No space left on device")
+        response = session_list_response(200, session_list_body())
+        monkeypatch.setattr(
+            index,
+            "fetch_sessions",
+            lambda **_kwargs: SessionList(response, Deadline(30)),
+        )
+
+        # 2. ACT
+        index.handler({}, lambda_context())
+
+        # 3. ASSERT
+        # The partial copy of the response is not stored
+        backend.exists.assert_not_called()
+        backend.put.assert_not_called()
+        writer._file.close.assert_called_once_with()
+        index.SessionController.assert_called_once()
@@ -0,0 +1,199 @@
+import sys
+
+import pytest
+
+
+class TestSessionModel:
+    """Tests for the classification of the tags of the sessions."""
+
+    @pytest.fixture(autouse=True)
+    def layer_path(self):
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/layers/common/src")
+
+    @staticmethod
+    def test_tags_are_classified_in_order_without_duplicates(raw_session, tag):
+        # 1. ARRANGE
+        from models import PARENT_TAG_UIDS, ReInventSession
+
+        topic_uid = PARENT_TAG_UIDS["TOPIC"]
+        tags = [
+            tag("T1", "Serverless ", topic_uid),
+            tag("T2", "Analytics", topic_uid),
+            tag("T1", "Serverless", topic_uid),
+            tag("R1", "Developer", PARENT_TAG_UIDS["ROLE"]),
+            tag("0F1F69D2-692C-4B25-AEDA-89A0919B8167", "100", "LEVEL"),
+            tag("U1", "Unknown", "UNMAPPED"),
+        ]
+
+        # 2. ACT
+        session = ReInventSession(**raw_session("A", tags, topics=["Compute"]))
+
+        # 3. ASSERT
+        assert session.topics == ["Compute", "Serverless", "Analytics"]
+        assert session.roles == ["Developer"]
+        assert session.services == []
+        assert session.level == 100
+
+    @staticmethod
+    def test_classify_sessions_matches_construction(raw_session, tag):
+        # 1. ARRANGE
+        from models import PARENT_TAG_UIDS, ReInventSession, classify_sessions
+
+        raw_sessions = [
+            raw_session("A", [tag("S1", "AWS Lambda", PARENT_TAG_UIDS["SERVICES"])]),
+            raw_session("B", [tag("I1", "Retail", PARENT_TAG_UIDS["INDUSTRY"])]),
+            raw_session("C", []),
+        ]
+
+        # 2. ACT
+        sessions = classify_sessions(raw_sessions)
+
+        # 3. ASSERT
+        assert sessions == [ReInventSession(**raw) for raw in raw_sessions]
+        assert sessions[0].services == ["AWS Lambda"]
+        assert sessions[1].industries == ["Retail"]
+        assert sessions[2].services == []
+
+    @staticmethod
+    def test_classify_sessions_classifies_once(monkeypatch, capsys, raw_session, tag):
+        # 1. ARRANGE
+        import models
+
+        classified = []
+        classify_tags = models.classify_tags
+        monkeypatch.setattr(
+            models,
+            "classify_tags",
+            lambda session, *args: classified.append(session)
+            or classify_tags(session, *args),
+        )
+        raw_sessions = [
+            raw_session("A", [tag("U1", "Unknown", "UNMAPPED")]),
+            raw_session("B", [tag("U1", "Unknown", "UNMAPPED")]),
+        ]
+
+        # 2. ACT
+        sessions = models.classify_sessions(raw_sessions)
+
+        # 3. ASSERT
+        assert classified == sessions
+        assert capsys.readouterr().out.count("Did not find Parent tag UID") == 1
+
+    @staticmethod
+    def test_validate_session_list_json_matches_construction(raw_session, tag):
+        # 1. ARRANGE
+        import json
+
+        from models import PARENT_TAG_UIDS, ReInventSession, validate_session_list_json
+
+        role_uid = PARENT_TAG_UIDS["ROLE"]
+        raw_sessions = [
+            raw_session("A", [tag("R1", " Developer", role_uid)]),
+            raw_session("B", [tag("R1", "Developer", role_uid), tag("U1", "X", "U")]),
+        ]
+        body = json.dumps({"data": raw_sessions, "total": 2}).encode("utf-8")
+
+        # 2. ACT
+        sessions = validate_session_list_json(body)
+
+        # 3. ASSERT
+        assert sessions == [ReInventSession(**raw) for raw in raw_sessions]
+        assert [session.roles for session in sessions] == [["Developer"]] * 2
+
+    @staticmethod
+    def test_identical_tags_and_strings_are_shared(raw_session, tag):
+        # 1. ARRANGE
+        from pydantic import ValidationError
+
+        from models import PARENT_TAG_UIDS, classify_sessions
+
+        topic_uid = PARENT_TAG_UIDS["TOPIC"]
+        raw_sessions = [
+            raw_session(uid, [tag("T1", "Serverless", topic_uid)]) for uid in "AB"
+        ]
+
+        # 2. ACT
+        session_a, session_b = classify_sessions(raw_sessions)
+
+        # 3. ASSERT
+        assert session_a.tags[0] is session_b.tags[0]
+        assert session_a.topics[0] is session_b.topics[0]
+        assert session_a.trackName is session_b.trackName
+        with pytest.raises(ValidationError):
+            session_a.tags[0].tagName = "Changed"
+
+    @staticmethod
+    def test_lazy_session_decodes_on_read(raw_session, tag):
+        # 1. ARRANGE
+        import json
+
+        from models import PARENT_TAG_UIDS, ReInventSession, validate_session_list_json
+
+        raw = raw_session("A", [tag("S1", "AWS Lambda", PARENT_TAG_UIDS["SERVICES"])])
+        raw["description"] = "Serverless – it’s fast"
+        body = json.dumps({"data": [raw]}).encode("utf-8")
+
+        # 2. ACT
+        (lazy_session,) = validate_session_list_json(body, lazy=True)
+
+        # 3. ASSERT
+        assert lazy_session.description_bytes == raw["description"].encode("utf-8")
+        assert lazy_session.description == raw["description"]
+        assert lazy_session.services == ["AWS Lambda"]
+        assert lazy_session.tags == ReInventSession(**raw).tags
+        assert lazy_session.to_session() == ReInventSession(**raw)
+
+    @staticmethod
+    def test_content_hash(raw_session, tag):
+        # 1. ARRANGE
+        from decimal import Decimal
+
+        from models import PARENT_TAG_UIDS, classify_sessions, content_hash
+
+        tags = [
+            tag("T1", "Serverless", PARENT_TAG_UIDS["TOPIC"]),
+            tag("R1", "Developer", PARENT_TAG_UIDS["ROLE"]),
+        ]
+        raw_sessions = [
+            raw_session("A", tags),
+            raw_session("A", tags[::-1] + tags[:1]),
+            raw_session("A", tags, description="Changed"),
+            raw_session("A", tags[:1]),
+        ]
+
+        # 2. ACT
+        session, reordered, changed, fewer_tags = classify_sessions(raw_sessions)
+        lazy_session = classify_sessions(raw_sessions[:1], lazy=True)[0]
+        decimal_level = session.model_copy(update={"level": Decimal(-1)})
+
+        # 3. ASSERT
+        assert content_hash(session) == content_hash(reordered)
+        assert content_hash(session) == content_hash(lazy_session)
+        assert content_hash(session) != content_hash(changed)
+        assert content_hash(session) != content_hash(fewer_tags)
+        assert content_hash(session) != content_hash(decimal_level)
+
+    @staticmethod
+    def test_diff_models_are_deferred(monkeypatch):
+        # 1. ARRANGE
+        import importlib
+
+        # A fresh import of the package, the modules are restored afterwards
+        for module_name in ("models", "models.diff"):
+            monkeypatch.delitem(sys.modules, module_name, raising=False)
+
+        # 2. ACT
+        models = importlib.import_module("models")
+        loaded_on_import = "models.diff" in sys.modules
+        session_diff = models.ReInventSessionDiff
+
+        # 3. ASSERT
+        assert not loaded_on_import
+        diff = sys.modules["models.diff"]
+        assert session_diff is diff.ReInventSessionDiff
+        assert models.ReInventSessionListDiff is diff.ReInventSessionListDiff
+        assert vars(models)["ReInventSessionDiff"] is session_diff
+        with pytest.raises(AttributeError):
+            models.ReInventSessionUnknown
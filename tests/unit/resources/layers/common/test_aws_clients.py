@@ -0,0 +1,44 @@
+import sys
+
+import pytest
+
+
+class TestAwsClients:
+    """Tests for the registry of the boto3 clients of the common layer."""
+
+    @pytest.fixture(autouse=True)
+    def layer_path(self):
+        sys.path.append("resources/layers/common/src")
+        yield
+        sys.path.remove("resources/layers/common/src")
+
+    @staticmethod
+    def test_get_client_creates_client_once():
+        # 1. ARRANGE
+        from aws_clients import get_client
+
+        # 2. ACT
+        first = get_client("sqs", region_name="eu-west-1")
+        second = get_client("sqs", region_name="eu-west-1")
+        other_region = get_client("sqs", region_name="eu-central-1")
+
+        # 3. ASSERT
+        assert first is second
+        assert other_region is not first
+        assert other_region.meta.region_name == "eu-central-1"
+
+    @staticmethod
+    def test_get_client_merges_config():
+        # 1. ARRANGE
+        from aws_clients import MAX_POOL_CONNECTIONS, get_client
+        from botocore.config import Config
+
+        # 2. ACT
+        client = get_client(
+            "sns", region_name="eu-west-1", config=Config(read_timeout=1)
+        )
+
+        # 3. ASSERT
+        assert client.meta.config.read_timeout == 1
+        assert client.meta.config.max_pool_connections == MAX_POOL_CONNECTIONS
+        assert client.meta.config.retries["mode"] == "standard"
@@ -0,0 +1,146 @@
+import sys
+
+import pytest
+
+
+class TestSessionTable:
+    """Tests for the columnar representation of the sessions."""
+
+    @pytest.fixture(autouse=True)
+    def tool_path(self):
+        sys.path.append("resources/layers/common/src")
+        sys.path.append("tools/analysis")
+        yield
+        sys.path.remove("resources/layers/common/src")
+        sys.path.remove("tools/analysis")
+
+    @pytest.fixture
+    def sessions(self, raw_session, tag):
+        """Classifies four sessions, with tags of each kind"""
+
+        def classify(lazy: bool = False):
+            from models import LEVEL_MAPPING, PARENT_TAG_UIDS, classify_sessions
+
+            topic_uid = PARENT_TAG_UIDS["TOPIC"]
+            service_uid = PARENT_TAG_UIDS["SERVICES"]
+            level_200, level_300 = list(LEVEL_MAPPING)[1:3]
+            return classify_sessions(
+                [
+                    raw_session(
+                        "A",
+                        [
+                            tag("T1", "Serverless", topic_uid),
+                            tag("S1", "AWS Lambda", service_uid),
+                            tag(level_200, "200", "LEVEL"),
+                        ],
+                    ),
+                    raw_session(
+                        "B",
+                        [tag("T2", "Analytics", topic_uid), tag(level_300, "300", "L")],
+                        trackName="Workshop",
+                    ),
+                    raw_session("C", [], trackName="Workshop"),
+                    raw_session(
+                        "D",
+                        [
+                            tag("S1", "AWS Lambda", service_uid),
+                            tag("T1", "Serverless", topic_uid),
+                            tag("T2", "Analytics", topic_uid),
+                            tag(level_200, "200", "LEVEL"),
+                        ],
+                    ),
+                ],
+                lazy=lazy,
+            )
+
+        return classify
+
+    @staticmethod
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_round_trip(sessions, lazy: bool):
+        # 1. ARRANGE
+        from models import to_session
+        from session_table import SessionTable
+
+        sessions = sessions(lazy=lazy)
+
+        # 2. ACT
+        table = SessionTable.from_sessions(sessions)
+
+        # 3. ASSERT
+        assert len(table) == 4
+        assert table.to_sessions() == [to_session(session) for session in sessions]
+        assert table.to_sessions([3, 1]) == [to_session(sessions[i]) for i in (3, 1)]
+
+    @staticmethod
+    def test_filter(sessions):
+        # 1. ARRANGE
+        from session_table import SessionTable
+
+        sessions = sessions()
+        table = SessionTable.from_sessions(sessions)
+
+        # 2. ACT
+        serverless = table.contains("topics", "Serverless")
+        level_200 = table.equals("level", 200)
+        workshops = table.filter(table.isin("trackName", ["Workshop", "Unknown"]))
+
+        # 3. ASSERT
+        assert serverless.tolist() == [True, False, False, True]
+        assert table.contains("topics", "Unknown").tolist() == [False] * 4
+        assert table.filter(serverless & level_200).to_sessions() == [
+            sessions[0],
+            sessions[3],
+        ]
+        assert workshops.column("sessionUid").tolist() == ["B", "C"]
+        assert workshops.column("topics") == [["Analytics"], []]
+
+    @staticmethod
+    def test_aggregates(sessions):
+        # 1. ARRANGE
+        from session_table import SessionTable
+
+        table = SessionTable.from_sessions(sessions())
+
+        # 2. ACT
+        level_counts = table.value_counts("level")
+        topic_counts = table.value_counts("topics")
+        topic_groups = table.group_by("topics")
+        track_groups = table.group_by("trackName")
+
+        # 3. ASSERT
+        assert level_counts == {200: 2, 300: 1, -1: 1}
+        assert topic_counts == {"Serverless": 2, "Analytics": 2}
+        assert {topic: rows.tolist() for topic, rows in topic_groups.items()} == {
+            "Serverless": [0, 3],
+            "Analytics": [1, 3],
+        }
+        assert {track: rows.tolist() for track, rows in track_groups.items()} == {
+            "Breakout Session": [0, 3],
+            "Workshop": [1, 2],
+        }
+
+    @staticmethod
+    def test_aggregates_merge_equal_levels(sessions):
+        # 1. ARRANGE
+        from decimal import Decimal
+
+        from session_table import SessionTable
+
+        sessions = sessions()
+        # Levels read from DynamoDB are decimals
+        sessions[2] = sessions[2].model_copy(update={"level": Decimal(200)})
+        table = SessionTable.from_sessions(sessions)
+
+        # 2. ACT
+        level_counts = table.value_counts("level")
+        level_groups = table.group_by("level")
+
+        # 3. ASSERT
+        assert level_counts == {200: 3, 300: 1}
+        assert {level: rows.tolist() for level, rows in level_groups.items()} == {
+            200: [0, 2, 3],
+            300: [1],
+        }
+        # The rows keep the type of their level
+        assert type(table.to_sessions()[2].level) is Decimal
@@ -0,0 +1,111 @@
+import sys
+
+import pytest
+
+
+class TestPortalStandIn:
+    """Tests for the Cognito side of the portal stand-in of the replay mode."""
+
+    @pytest.fixture(autouse=True)
+    def function_path(self):
+        sys.path.append("resources/functions/fetcher")
+        sys.path.append("resources/layers/common/src")
+        sys.path.append("tools/replay")
+        yield
+        sys.path.remove("resources/functions/fetcher")
+        sys.path.remove("resources/layers/common/src")
+        sys.path.remove("tools/replay")
+
+    @pytest.fixture
+    def cognito_client(self):
+        import boto3
+        from server import PortalStandIn, start
+
+        server = PortalStandIn(sessions=[], username="user", password="secret")
+        server.configure_user_pool("us-east-1_pool")
+        start(server)
+        yield boto3.client(
+            "cognito-idp",
+            region_name="us-east-1",
+            endpoint_url=server.url,
+            aws_access_key_id="replay",
+            aws_secret_access_key="replay",
+        )
+        server.shutdown()
+        server.server_close()
+
+    @staticmethod
+    def test_srp_authentication(cognito_client):
+        # 1. ARRANGE
+        from srp.aws_srp import AWSSRP, authenticate_with_refresh_token
+
+        aws_srp = AWSSRP(
+            username="user",
+            password="secret",
+            pool_id="us-east-1_pool",
+            client_id="client",
+            client=cognito_client,
+        )
+
+        # 2. ACT
+        tokens = aws_srp.authenticate_user()
+        refreshed_tokens = authenticate_with_refresh_token(
+            client=cognito_client,
+            client_id="client",
+            refresh_token=tokens["AuthenticationResult"]["RefreshToken"],
+        )
+
+        # 3. ASSERT
+        assert "AccessToken" in tokens["AuthenticationResult"]
+        assert "AccessToken" in refreshed_tokens["AuthenticationResult"]
+
+    @staticmethod
+    def test_srp_authentication_wrong_password(cognito_client):
+        # 1. ARRANGE
+        from srp.aws_srp import AWSSRP
+
+        aws_srp = AWSSRP(
+            username="user",
+            password="wrong",
+            pool_id="us-east-1_pool",
+            client_id="client",
+            client=cognito_client,
+        )
+
+        # 2. ACT & 3. ASSERT
+        with pytest.raises(cognito_client.exceptions.NotAuthorizedException):
+            aws_srp.authenticate_user()
+
+    @staticmethod
+    def test_srp_authentication_async(cognito_client):
+        # 1. ARRANGE
+        import asyncio
+        from srp.aws_srp import AWSSRP
+
+        aws_srp = AWSSRP(
+            username="user",
+            password="secret",
+            pool_id="us-east-1_pool",
+            client_id="client",
+            client=cognito_client,
+        )
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0.001)
+
+        async def authenticate():
+            ticker_task = asyncio.create_task(ticker())
+            tokens = await aws_srp.authenticate_user_async()
+            ticker_task.cancel()
+            return tokens
+
+        # 2. ACT
+        tokens = asyncio.run(authenticate())
+
+        # 3. ASSERT
+        assert "AccessToken" in tokens["AuthenticationResult"]
+        # The event loop kept running other tasks during the authentication
+        assert len(ticks) > 1
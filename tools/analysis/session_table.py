@@ -0,0 +1,278 @@
+"""
+Columnar representation of a list of sessions, for filters and aggregates over
+the whole catalog with NumPy instead of a Python loop per session. It is not
+part of the common layer, NumPy is a development dependency only.
+"""
+
+from functools import cached_property
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from models import AnySession, ReInventSession, ReInventSessionTag, TagKey
+
+# Columns with one value per session, dictionary encoded
+CATEGORY_FIELDS = ("level", "sessionType", "trackName", "scheduleTrackUid")
+# Columns with a list of values per session, dictionary encoded in CSR layout
+LIST_FIELDS = ("topics", "industries", "roles", "areas_of_interest", "services")
+# Columns with a distinct value per session, kept as object arrays
+PLAIN_FIELDS = ("thirdPartyID", "description", "scheduleUid", "sessionUid", "title")
+
+Mask = Union[np.ndarray, Sequence[int], slice]
+
+
+def _level_key(level: Any) -> Hashable:
+    # Decimal(100) == 100, but the type of the level matters for the diff
+    return type(level), level
+
+
+def _tag_key(tag: ReInventSessionTag) -> TagKey:
+    return tag.scheduleTagUid, tag.tagName, tag.parentTagName, tag.parentTagUid
+
+
+class EncodedColumn:
+    """A column of codes into the array of its distinct values"""
+
+    values: np.ndarray
+
+    def codes_of(self, values: Iterable[Any]) -> np.ndarray:
+        """The codes of the values equal to one of values"""
+        values = list(values)
+        return np.array(
+            [code for code, value in enumerate(self.values) if value in values],
+            dtype=np.int32,
+        )
+
+
+class CategoryColumn(EncodedColumn):
+    """A column with one value per session"""
+
+    def __init__(self, codes: np.ndarray, values: np.ndarray):
+        self.codes = codes
+        self.values = values
+
+    @classmethod
+    def encode(cls, items: Iterable[Any], key=None) -> "CategoryColumn":
+        positions: Dict[Hashable, int] = {}
+        values: List[Any] = []
+        codes: List[int] = []
+        for item in items:
+            item_key = item if key is None else key(item)
+            code = positions.get(item_key)
+            if code is None:
+                code = positions[item_key] = len(values)
+                values.append(item)
+            codes.append(code)
+        return cls(np.array(codes, dtype=np.int32), _object_array(values))
+
+    def take(self, rows: np.ndarray) -> "CategoryColumn":
+        return CategoryColumn(self.codes[rows], self.values)
+
+    def decode(self) -> np.ndarray:
+        return self.values[self.codes]
+
+
+class ListColumn(EncodedColumn):
+    """
+    A column of lists, in CSR layout: the codes of the values of row i are
+    codes[offsets[i]:offsets[i + 1]], indexes into the array of distinct values.
+    """
+
+    def __init__(self, offsets: np.ndarray, codes: np.ndarray, values: np.ndarray):
+        self.offsets = offsets
+        self.codes = codes
+        self.values = values
+
+    @classmethod
+    def encode(cls, rows: Iterable[Iterable[Any]], key=None) -> "ListColumn":
+        positions: Dict[Hashable, int] = {}
+        values: List[Any] = []
+        codes: List[int] = []
+        offsets = [0]
+        for row in rows:
+            for item in row:
+                item_key = item if key is None else key(item)
+                code = positions.get(item_key)
+                if code is None:
+                    code = positions[item_key] = len(values)
+                    values.append(item)
+                codes.append(code)
+            offsets.append(len(codes))
+        return cls(
+            np.array(offsets, dtype=np.int64),
+            np.array(codes, dtype=np.int32),
+            _object_array(values),
+        )
+
+    @cached_property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @cached_property
+    def row_ids(self) -> np.ndarray:
+        """The row of every code"""
+        return np.repeat(np.arange(len(self.offsets) - 1), self.lengths)
+
+    def take(self, rows: np.ndarray) -> "ListColumn":
+        lengths = self.lengths[rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Position of every taken code in the codes of this column
+        positions = np.arange(offsets[-1]) + np.repeat(
+            self.offsets[:-1][rows] - offsets[:-1], lengths
+        )
+        return ListColumn(offsets, self.codes[positions], self.values)
+
+    def decode(self) -> List[List[Any]]:
+        values = self.values[self.codes].tolist()
+        bounds = self.offsets.tolist()
+        return [values[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    # np.array would turn e.g. a list of tuples into a 2D array
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class SessionTable:
+    """
+    The sessions of a list, column by column. The level, session type and
+    track columns are dictionary encoded, and the tag name lists are CSR
+    encoded, so filters and aggregates over them are NumPy operations on
+    integer codes:
+
+        table = SessionTable.from_sessions(sessions)
+        serverless = table.filter(table.contains("topics", "Serverless"))
+        serverless.value_counts("level")
+    """
+
+    def __init__(
+        self,
+        categories: Dict[str, CategoryColumn],
+        lists: Dict[str, ListColumn],
+        plain: Dict[str, np.ndarray],
+        tags: ListColumn,
+    ):
+        self.categories = categories
+        self.lists = lists
+        self.plain = plain
+        self.tags = tags
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[AnySession]) -> "SessionTable":
+        """The table of sessions, regular or lazy ones"""
+        sessions = list(sessions)
+        categories = {
+            field: CategoryColumn.encode(
+                (getattr(session, field) for session in sessions),
+                key=_level_key if field == "level" else None,
+            )
+            for field in CATEGORY_FIELDS
+        }
+        lists = {
+            field: ListColumn.encode(getattr(session, field) for session in sessions)
+            for field in LIST_FIELDS
+        }
+        plain = {
+            field: _object_array([getattr(session, field) for session in sessions])
+            for field in PLAIN_FIELDS
+        }
+        tags = ListColumn.encode((session.tags for session in sessions), key=_tag_key)
+        return cls(categories, lists, plain, tags)
+
+    def __len__(self) -> int:
+        return len(self.tags.offsets) - 1
+
+    def _column(self, field: str) -> EncodedColumn:
+        if field in self.categories:
+            return self.categories[field]
+        return self.lists[field]
+
+    def column(self, field: str) -> Union[np.ndarray, List[List[Any]]]:
+        """The decoded values of a field, one per session"""
+        if field in self.categories:
+            return self.categories[field].decode()
+        if field in self.lists:
+            return self.lists[field].decode()
+        if field == "tags":
+            return self.tags.decode()
+        return self.plain[field]
+
+    def equals(self, field: str, value: Any) -> np.ndarray:
+        """The mask of the sessions of which the field is value"""
+        return self.isin(field, [value])
+
+    def isin(self, field: str, values: Iterable[Any]) -> np.ndarray:
+        """The mask of the sessions of which the field is one of values"""
+        column = self.categories[field]
+        return np.isin(column.codes, column.codes_of(values))
+
+    def contains(self, field: str, value: Any) -> np.ndarray:
+        """The mask of the sessions of which the list field contains value"""
+        column = self.lists[field]
+        mask = np.zeros(len(self), dtype=bool)
+        mask[column.row_ids[np.isin(column.codes, column.codes_of([value]))]] = True
+        return mask
+
+    def filter(self, mask: Mask) -> "SessionTable":
+        """The table of the sessions of a mask, or of row indexes"""
+        rows = np.arange(len(self))[mask]
+        return SessionTable(
+            {field: column.take(rows) for field, column in self.categories.items()},
+            {field: column.take(rows) for field, column in self.lists.items()},
+            {field: column[rows] for field, column in self.plain.items()},
+            self.tags.take(rows),
+        )
+
+    def value_counts(self, field: str) -> Dict[Any, int]:
+        """The number of sessions per value of a field, without the absent ones"""
+        column = self._column(field)
+        counts = np.bincount(column.codes, minlength=len(column.values))
+        value_counts: Dict[Any, int] = {}
+        for code, count in enumerate(counts.tolist()):
+            if count:
+                # Distinct levels can be equal, like Decimal(200) and 200
+                value = column.values[code]
+                value_counts[value] = value_counts.get(value, 0) + count
+        return value_counts
+
+    def group_by(self, field: str) -> Dict[Any, np.ndarray]:
+        """
+        The row indexes of the sessions per value of a field. For a list
+        field, a session is in the group of each of its values.
+        """
+        column = self._column(field)
+        codes = column.codes
+        if isinstance(column, ListColumn):
+            rows = column.row_ids
+        else:
+            rows = np.arange(len(self))
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=len(column.values))
+        groups = np.split(rows[order], np.cumsum(counts)[:-1])
+        groups_by_value: Dict[Any, List[np.ndarray]] = {}
+        for code, group in enumerate(groups):
+            if len(group):
+                # Distinct levels can be equal, like Decimal(200) and 200
+                groups_by_value.setdefault(column.values[code], []).append(group)
+        return {
+            value: groups[0] if len(groups) == 1 else np.unique(np.concatenate(groups))
+            for value, groups in groups_by_value.items()
+        }
+
+    def to_sessions(self, rows: Optional[Mask] = None) -> List[ReInventSession]:
+        """The sessions of the table, or of some of its rows"""
+        table = self if rows is None else self.filter(rows)
+        columns = {
+            field: table.column(field).tolist()
+            for field in CATEGORY_FIELDS + PLAIN_FIELDS
+        }
+        columns |= {field: table.column(field) for field in LIST_FIELDS + ("tags",)}
+        return [
+            ReInventSession.model_construct(
+                **{field: values[row] for field, values in columns.items()}
+            )
+            for row in range(len(table))
+        ]
@@ -0,0 +1,131 @@
+import gzip
+import json
+import random
+import uuid
+from typing import Any, Dict, List, Optional
+
+from models import LEVEL_MAPPING, PARENT_TAG_UIDS
+
+# Namespace of the UUIDs of synthetic sessions and tags, so the same seed
+# always produces the same catalog
+SYNTHETIC_NAMESPACE = uuid.UUID("6b1c3f0e-9a55-4a3c-8d2a-2c2f3b7f6e10")
+# Number of sessions of the real catalog, the base of the scale factor
+REAL_SESSION_COUNT = 2500
+
+SESSION_TYPES = [
+    "Breakout Session",
+    "Chalk Talk",
+    "Workshop",
+    "Builders' Session",
+    "Code talk",
+    "Lightning talk",
+]
+PARENT_TAG_NAMES = {
+    "AREA_OF_INTEREST": "Area of Interest",
+    "TOPIC": "Topic",
+    "SERVICES": "Services",
+    "ROLE": "Role",
+    "INDUSTRY": "Industry",
+}
+# Number of distinct tags per parent tag
+TAGS_PER_PARENT = 40
+WORDS = (
+    "serverless event driven architecture data streaming analytics security "
+    "observability resilience migration modernization containers machine "
+    "learning generative developer productivity cost optimization networking "
+    "storage databases compute edge identity governance automation"
+).split()
+
+
+def _uid(name: str) -> str:
+    return str(uuid.uuid5(SYNTHETIC_NAMESPACE, name)).upper()
+
+
+def _tag_pool() -> Dict[str, List[Dict[str, str]]]:
+    pool = {
+        parent: [
+            {
+                "scheduleTagUid": _uid(f"tag/{parent}/{index}"),
+                "tagName": f"{parent_name} {index}",
+                "parentTagName": parent_name,
+                "parentTagUid": PARENT_TAG_UIDS[parent],
+            }
+            for index in range(TAGS_PER_PARENT)
+        ]
+        for parent, parent_name in PARENT_TAG_NAMES.items()
+    }
+    pool["LEVEL"] = [
+        {
+            "scheduleTagUid": tag_uid,
+            "tagName": f"{level} - {'Introductory' if level == 100 else 'Advanced'}",
+            "parentTagName": "Level",
+            "parentTagUid": PARENT_TAG_UIDS["LEVEL"],
+        }
+        for tag_uid, level in LEVEL_MAPPING.items()
+    ]
+    return pool
+
+
+def generate_sessions(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate a catalog of sessions shaped like the portal's sessions list"""
+    rng = random.Random(seed)
+    tag_pool = _tag_pool()
+    sessions = []
+    for index in range(count):
+        session_type = rng.choice(SESSION_TYPES)
+        tags = [rng.choice(tag_pool["LEVEL"])]
+        for parent in PARENT_TAG_NAMES:
+            tags.extend(rng.sample(tag_pool[parent], rng.randint(0, 3)))
+        sessions.append(
+            {
+                "sessionType": session_type,
+                "thirdPartyID": f"SYN{index:05d}",
+                "trackName": session_type,
+                "scheduleTrackUid": _uid(f"track/{session_type}"),
+                "description": " ".join(rng.choices(WORDS, k=rng.randint(40, 120))),
+                "scheduleUid": _uid(f"schedule/{index}"),
+                "sessionUid": _uid(f"session/{index}"),
+                "title": " ".join(rng.choices(WORDS, k=rng.randint(4, 10))).title(),
+                "tags": tags,
+            }
+        )
+    return sessions
+
+
+def load_sessions(path: str) -> List[Dict[str, Any]]:
+    """
+    Load the sessions of a recorded sessions list response. Gzip compressed
+    files, like the objects of the response archive, are decompressed.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as file:
+        return json.load(file)["data"]
+
+
+def scale_sessions(sessions: List[Dict[str, Any]], factor: int) -> List[Dict[str, Any]]:
+    """Repeat the sessions factor times, every copy with its own identifiers"""
+    scaled = list(sessions)
+    for copy in range(1, factor):
+        for session in sessions:
+            scaled.append(
+                session
+                | {
+                    "thirdPartyID": f"{session['thirdPartyID']}-{copy}",
+                    "scheduleUid": _uid(f"{session['scheduleUid']}/{copy}"),
+                    "sessionUid": _uid(f"{session['sessionUid']}/{copy}"),
+                }
+            )
+    return scaled
+
+
+def change_sessions(
+    sessions: List[Dict[str, Any]], ratio: float, seed: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Change the title of the given ratio of the sessions, as between two syncs"""
+    rng = random.Random(seed)
+    changed = list(sessions)
+    for index in rng.sample(range(len(sessions)), int(len(sessions) * ratio)):
+        changed[index] = sessions[index] | {
+            "title": f"{sessions[index]['title']} (updated {rng.randint(0, 10**6)})"
+        }
+    return changed
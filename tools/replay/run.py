@@ -0,0 +1,119 @@
+"""
+Run the fetcher handler offline against the portal stand-in, and report its
+throughput and memory use.
+
+    python tools/replay/run.py --scale 10 --runs 3 --changes 0.05
+
+The catalog is synthetic by default, or a recorded sessions list response
+(--catalog, e.g. an object of the response archive). It is multiplied by the
+scale factor, with new identifiers for every copy. Between runs, --changes
+updates the titles of that share of the sessions, so the runs after the first
+also exercise the diff and the database writes.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(ROOT, "resources", "functions", "fetcher"))
+sys.path.append(os.path.join(ROOT, "resources", "layers", "common", "src"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from catalog import (  # noqa: E402
+    REAL_SESSION_COUNT,
+    change_sessions,
+    generate_sessions,
+    load_sessions,
+    scale_sessions,
+)
+from server import PortalStandIn, apply_environment, start  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--catalog", help="recorded sessions list response (.json[.gz])"
+    )
+    parser.add_argument("--sessions", type=int, default=REAL_SESSION_COUNT)
+    parser.add_argument("--scale", type=int, default=1, help="catalog scale factor")
+    parser.add_argument("--runs", type=int, default=2, help="handler invocations")
+    parser.add_argument("--changes", type=float, default=0.0, help="share changed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="report the peak of Python allocations per run (slows the runs)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    base_sessions = (
+        load_sessions(args.catalog)
+        if args.catalog
+        else generate_sessions(args.sessions, seed=args.seed)
+    )
+    sessions = scale_sessions(base_sessions, args.scale)
+
+    server = PortalStandIn(sessions)
+    start(server)
+    apply_environment(server)
+    print(f"Portal stand-in at {server.url} serving {len(sessions)} sessions")
+
+    # The fetcher reads its configuration and credentials on import
+    from sessions_api import USER_POOL_ID
+
+    server.configure_user_pool(USER_POOL_ID)
+    import index
+
+    for run in range(1, args.runs + 1):
+        if run > 1 and args.changes:
+            sessions = change_sessions(sessions, args.changes, seed=args.seed + run)
+            server.set_sessions(sessions)
+
+        bytes_sent = server.stats.get("BytesSent", 0)
+        if args.trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        index.handler({}, None)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+        tracemalloc.stop()
+
+        print(
+            f"Run {run}: {len(sessions)} sessions in {elapsed:.2f}s "
+            f"({len(sessions) / elapsed:.0f} sessions/s), "
+            f"{server.stats.get('BytesSent', 0) - bytes_sent} bytes sent"
+            + (f", peak traced memory {peak / 2**20:.1f} MiB" if peak else "")
+        )
+
+    # ru_maxrss is in KiB on Linux
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Max RSS of the process: {max_rss:.1f} MiB")
+    from sessions_api.timing import phase_percentiles
+
+    print("Phase durations over the runs:")
+    for phase, percentiles in sorted(phase_percentiles().items()):
+        print(
+            f" - {phase}: "
+            + ", ".join(
+                f"{name} {value * 1000:.1f} ms"
+                for name, value in percentiles.items()
+                if name != "count"
+            )
+            + f" ({percentiles['count']} samples)"
+        )
+    print("Requests:")
+    for name, count in sorted(server.stats.items()):
+        if name != "BytesSent":
+            print(f" - {name}: {count}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""
+Local stand-in for the attendee portal and the AWS APIs the fetcher uses.
+
+The portal side replays the login flow as recorded from the real portal: the
+redirects from the attendee portal to the login and authorize pages, the call
+to the storage API and the session cookie. The AWS side answers the JSON
+protocol calls of the Cognito user pool (SRP and refresh token
+authentication), Secrets Manager and DynamoDB, so the fetcher handler runs
+without any network access. Point the fetcher at it with the environment of
+PortalStandIn.environment().
+"""
+
+import base64
+import datetime
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# SRP group of Cognito, see the fetcher's srp.aws_srp
+N_HEX = (
+    "FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD1"
+    "29024E088A67CC74020BBEA63B139B22514A08798E3404DD"
+    "EF9519B3CD3A431B302B0A6DF25F14374FE1356D6D51C245"
+    "E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED"
+    "EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3D"
+    "C2007CB8A163BF0598DA48361C55D39A69163FA8FD24CF5F"
+    "83655D23DCA3AD961C62F356208552BB9ED529077096966D"
+    "670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B"
+    "E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9"
+    "DE2BCBF6955817183995497CEA956AE515D2261898FA0510"
+    "15728E5A8AAAC42DAD33170D04507A33A85521ABDF1CBA64"
+    "ECFB850458DBEF0A8AEA71575D060C7DB3970F85A6E1E4C7"
+    "ABF5AE8CDB0933D71E8C94E04A25619DCEE3D2261AD2EE6B"
+    "F12FFA06D98A0864D87602733EC86A64521F2B18177B200C"
+    "BBE117577A615D6C770988C0BAD946E208E24FA074E5AB31"
+    "43DB5BFCE0FD108E4B82D120A93AD2CAFFFFFFFFFFFFFFFF"
+)
+BIG_N = int(N_HEX, 16)
+G = 2
+
+SESSION_COOKIE_NAME = "portal-session"
+TOKEN_VALIDITY_SECONDS = 3600
+SECRET_NAME = "replay-credentials"
+TABLE_NAME = "ReInventSessions"
+STATE_TABLE_NAME = "FetcherState"
+REGION = "us-east-1"
+
+
+def _pad_hex(value: Any) -> str:
+    hex_string = value if isinstance(value, str) else "%x" % value
+    if len(hex_string) % 2 == 1:
+        return "0" + hex_string
+    if hex_string[0] in "89ABCDEFabcdef":
+        return "00" + hex_string
+    return hex_string
+
+
+def _hex_hash(hex_string: str) -> str:
+    return hashlib.sha256(bytes.fromhex(hex_string)).hexdigest().rjust(64, "0")
+
+
+def _jwt(claims: Dict[str, Any]) -> str:
+    def encode(document: Dict[str, Any]) -> str:
+        raw = json.dumps(document).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    return f"{encode({'alg': 'none'})}.{encode(claims)}.signature"
+
+
+class SrpVerifier:
+    """Server side of the Cognito SRP authentication, for one user"""
+
+    K = int(_hex_hash("00" + N_HEX + "0" + "2"), 16)
+
+    def __init__(self, pool_id: str, username: str, password: str):
+        self.pool_name = pool_id.split("_")[1]
+        self.username = username
+        self.salt = secrets.token_hex(16)
+        identity = hashlib.sha256(
+            f"{self.pool_name}{username}:{password}".encode("utf-8")
+        ).hexdigest()
+        x = int(_hex_hash(_pad_hex(self.salt) + identity.rjust(64, "0")), 16)
+        self.verifier = pow(G, x, BIG_N)
+
+    def challenge(self, big_a: int) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """The PASSWORD_VERIFIER challenge, and the state to check the answer"""
+        small_b = secrets.randbelow(BIG_N)
+        big_b = (self.K * self.verifier + pow(G, small_b, BIG_N)) % BIG_N
+        secret_block = base64.standard_b64encode(secrets.token_bytes(64)).decode()
+        parameters = {
+            "SALT": self.salt,
+            "SRP_B": "%x" % big_b,
+            "SECRET_BLOCK": secret_block,
+            "USER_ID_FOR_SRP": self.username,
+            "USERNAME": self.username,
+        }
+        return parameters, {"A": big_a, "B": big_b, "b": small_b}
+
+    def verify(self, state: Dict[str, Any], responses: Dict[str, str]) -> bool:
+        u = int(_hex_hash(_pad_hex(state["A"]) + _pad_hex(state["B"])), 16)
+        s = pow(state["A"] * pow(self.verifier, u, BIG_N), state["b"], BIG_N)
+        prk = hmac.new(
+            bytes.fromhex(_pad_hex("%x" % u)), bytes.fromhex(_pad_hex(s)), "sha256"
+        ).digest()
+        hkdf = hmac.new(prk, b"Caldera Derived Key\x01", "sha256").digest()[:16]
+        message = (
+            self.pool_name.encode("utf-8")
+            + self.username.encode("utf-8")
+            + base64.standard_b64decode(responses["PASSWORD_CLAIM_SECRET_BLOCK"])
+            + responses["TIMESTAMP"].encode("utf-8")
+        )
+        signature = base64.standard_b64encode(
+            hmac.new(hkdf, message, "sha256").digest()
+        ).decode()
+        return hmac.compare_digest(signature, responses["PASSWORD_CLAIM_SIGNATURE"])
+
+
+class AwsError(Exception):
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class PortalStandIn(ThreadingHTTPServer):
+    """
+    The stand-in server. The catalog can be replaced between runs with
+    set_sessions, and the request counters and bytes sent are kept in stats.
+    The fetcher reads the URLs on import, so the user pool is configured after
+    the server is bound and the fetcher is imported with its environment.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        sessions: List[Dict[str, Any]],
+        username: str = "replay-user",
+        password: str = "replay-password",
+        port: int = 0,
+    ):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.username = username
+        self.password = password
+        self.srp: Optional[SrpVerifier] = None
+        self.lock = threading.RLock()
+        self.stats: Dict[str, int] = {}
+        self.srp_states: Dict[str, Dict[str, Any]] = {}
+        self.access_tokens: set = set()
+        self.refresh_tokens: set = set()
+        self.stored_codes: set = set()
+        self.session_cookies: set = set()
+        # DynamoDB items in their wire format, by table and (PK, SK)
+        self.tables: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {}
+        self._bodies: Dict[Tuple, Tuple[bytes, bytes, str]] = {}
+        self.set_sessions(sessions)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def environment(self) -> Dict[str, str]:
+        """Environment that points the fetcher at the stand-in"""
+        return {
+            "PORTAL_ROOT_URL": self.url,
+            "PORTAL_STORAGE_URL": f"{self.url}/storage",
+            "AWS_ENDPOINT_URL_COGNITO_IDENTITY_PROVIDER": self.url,
+            "AWS_ENDPOINT_URL_SECRETS_MANAGER": self.url,
+            "AWS_ENDPOINT_URL_DYNAMODB": self.url,
+            "AWS_DEFAULT_REGION": REGION,
+            "AWS_ACCESS_KEY_ID": "replay",
+            "AWS_SECRET_ACCESS_KEY": "replay",
+            "CREDENTIAL_SECRET_NAME": SECRET_NAME,
+            "DDB_TABLE_NAME": TABLE_NAME,
+            "STATE_TABLE_NAME": STATE_TABLE_NAME,
+        }
+
+    def configure_user_pool(self, pool_id: str) -> None:
+        self.srp = SrpVerifier(pool_id, self.username, self.password)
+
+    def set_sessions(self, sessions: List[Dict[str, Any]]) -> None:
+        with self.lock:
+            self.sessions = sessions
+            self._bodies = {}
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self.lock:
+            self.stats[name] = self.stats.get(name, 0) + value
+
+    def sessions_body(self, filters: Tuple) -> Tuple[bytes, bytes, str]:
+        """The plain and gzip compressed list body and its ETag, for a filter"""
+        with self.lock:
+            if filters not in self._bodies:
+                sessions = [
+                    session
+                    for session in self.sessions
+                    if all(str(session.get(key)) == value for key, value in filters)
+                ]
+                body = json.dumps({"data": sessions}).encode("utf-8")
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+                self._bodies[filters] = (body, gzip.compress(body, 6), etag)
+            return self._bodies[filters]
+
+    def issue_tokens(self, with_refresh_token: bool) -> Dict[str, Any]:
+        now = int(time.time())
+        claims = {"sub": self.username, "iat": now, "exp": now + TOKEN_VALIDITY_SECONDS}
+        result = {
+            "AccessToken": _jwt(claims | {"token_use": "access"}),
+            "IdToken": _jwt(claims | {"token_use": "id"}),
+            "ExpiresIn": TOKEN_VALIDITY_SECONDS,
+            "TokenType": "Bearer",
+        }
+        with self.lock:
+            self.access_tokens.add(result["AccessToken"])
+            if with_refresh_token:
+                result["RefreshToken"] = secrets.token_urlsafe(32)
+                self.refresh_tokens.add(result["RefreshToken"])
+        return {"AuthenticationResult": result, "ChallengeParameters": {}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: PortalStandIn
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, don't let them wait for an ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(
+        self,
+        status: int,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count("BytesSent", len(body))
+
+    def _redirect(self, location: str, headers: Optional[Dict[str, str]] = None):
+        self._send(302, headers={"Location": location} | (headers or {}))
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    # Portal
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.count(f"GET {url.path}")
+        base = self.server.url
+
+        if url.path == "/attendee-portal/":
+            self._redirect("/auth/login/?returnUrl=%2Fattendee-portal%2F")
+        elif url.path == "/auth/login/":
+            state = secrets.token_urlsafe(16)
+            self._redirect(f"{base}/oauth2/authorize?response_type=code&state={state}")
+        elif url.path == "/oauth2/authorize":
+            code = secrets.token_urlsafe(16)
+            callback = f"{base}/auth/login/cognito/"
+            self._redirect(
+                f"{base}/oauth2/idpresponse?redirect_uri={callback}"
+                f"?authorization_code={code}&state={query.get('state', '')}"
+            )
+        elif url.path == "/auth/login/cognito/":
+            with self.server.lock:
+                known_code = query.get("code") in self.server.stored_codes
+            if not known_code:
+                self._send(400, b"Unknown authorization code")
+                return
+            cookie = secrets.token_urlsafe(32)
+            with self.server.lock:
+                self.server.session_cookies.add(cookie)
+            self._redirect(
+                "/attendee-portal/",
+                {
+                    "Set-Cookie": f"{SESSION_COOKIE_NAME}={cookie}; Path=/; "
+                    f"Max-Age={TOKEN_VALIDITY_SECONDS}; HttpOnly"
+                },
+            )
+        elif url.path == "/attendee-portal-api/sessions/list/":
+            self._sessions_list(query)
+        else:
+            self._send(404)
+
+    def _sessions_list(self, query: Dict[str, str]) -> None:
+        cookies = dict(
+            re.findall(r"([^=;\s]+)=([^;]*)", self.headers.get("Cookie", ""))
+        )
+        with self.server.lock:
+            authenticated = (
+                cookies.get(SESSION_COOKIE_NAME) in self.server.session_cookies
+            )
+        if not authenticated:
+            self._redirect("/auth/login/")
+            return
+
+        body, compressed_body, etag = self.server.sessions_body(
+            tuple(sorted(query.items()))
+        )
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, headers={"ETag": etag})
+            return
+        headers = {"Content-Type": "application/json", "ETag": etag}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = compressed_body
+            headers["Content-Encoding"] = "gzip"
+        self._send(200, body, headers)
+
+    # Storage API and the AWS JSON protocol APIs
+
+    def do_POST(self) -> None:
+        body = self._read_body()
+        if self.path == "/storage":
+            self.server.count("POST /storage")
+            document = json.loads(body)
+            with self.server.lock:
+                known_token = document["access_token"] in self.server.access_tokens
+                if known_token:
+                    self.server.stored_codes.add(document["authorization_code"])
+            self._send(200 if known_token else 401, b"{}")
+            return
+
+        target = self.headers.get("X-Amz-Target", "")
+        self.server.count(target)
+        service, _, operation = target.partition(".")
+        handler = getattr(self, f"_{service}_{operation}", None)
+        if handler is None:
+            self._aws_error(AwsError("UnknownOperationException", target))
+            return
+        try:
+            result = handler(json.loads(body or b"{}"))
+        except AwsError as error:
+            self._aws_error(error)
+            return
+        self._send(
+            200,
+            json.dumps(result).encode("utf-8"),
+            {"Content-Type": "application/x-amz-json-1.1"},
+        )
+
+    def _aws_error(self, error: AwsError) -> None:
+        document = {"__type": error.code, "message": str(error)}
+        self._send(
+            400,
+            json.dumps(document).encode("utf-8"),
+            {"Content-Type": "application/x-amz-json-1.1"},
+        )
+
+    def _AWSCognitoIdentityProviderService_InitiateAuth(self, request: Dict) -> Dict:
+        parameters = request["AuthParameters"]
+        if request["AuthFlow"] == "REFRESH_TOKEN_AUTH":
+            with self.server.lock:
+                known_token = parameters["REFRESH_TOKEN"] in self.server.refresh_tokens
+            if not known_token:
+                raise AwsError("NotAuthorizedException", "Invalid Refresh Token")
+            return self.server.issue_tokens(with_refresh_token=False)
+
+        if parameters["USERNAME"] != self.server.username:
+            raise AwsError("UserNotFoundException", "User does not exist.")
+        challenge, state = self.server.srp.challenge(int(parameters["SRP_A"], 16))
+        with self.server.lock:
+            self.server.srp_states[challenge["SECRET_BLOCK"]] = state
+        return {"ChallengeName": "PASSWORD_VERIFIER", "ChallengeParameters": challenge}
+
+    def _AWSCognitoIdentityProviderService_RespondToAuthChallenge(
+        self, request: Dict
+    ) -> Dict:
+        responses = request["ChallengeResponses"]
+        # The timestamp is part of the signature, check it has Cognito's format
+        datetime.datetime.strptime(responses["TIMESTAMP"], "%a %b %d %H:%M:%S UTC %Y")
+        with self.server.lock:
+            state = self.server.srp_states.pop(
+                responses["PASSWORD_CLAIM_SECRET_BLOCK"], None
+            )
+        if state is None or not self.server.srp.verify(state, responses):
+            raise AwsError("NotAuthorizedException", "Incorrect username or password.")
+        return self.server.issue_tokens(with_refresh_token=True)
+
+    def _secretsmanager_GetSecretValue(self, request: Dict) -> Dict:
+        if request["SecretId"] != SECRET_NAME:
+            raise AwsError("ResourceNotFoundException", "Secret not found")
+        return {
+            "Name": SECRET_NAME,
+            "SecretString": json.dumps(
+                {"username": self.server.username, "password": self.server.password}
+            ),
+        }
+
+    def _table(self, request: Dict) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        with self.server.lock:
+            return self.server.tables.setdefault(request["TableName"], {})
+
+    @staticmethod
+    def _key(item: Dict[str, Any]) -> Tuple[str, str]:
+        return item["PK"]["S"], item["SK"]["S"]
+
+    def _DynamoDB_20120810_GetItem(self, request: Dict) -> Dict:
+        item = self._table(request).get(self._key(request["Key"]))
+        return {"Item": item} if item is not None else {}
+
+    def _DynamoDB_20120810_PutItem(self, request: Dict) -> Dict:
+        table = self._table(request)
+        key = self._key(request["Item"])
+        with self.server.lock:
+            # The only condition the fetcher uses is that the item does not exist
+            if "attribute_not_exists" in request.get("ConditionExpression", ""):
+                if key in table:
+                    raise AwsError(
+                        "ConditionalCheckFailedException",
+                        "The conditional request failed",
+                    )
+            table[key] = request["Item"]
+        return {}
+
+    def _DynamoDB_20120810_DeleteItem(self, request: Dict) -> Dict:
+        with self.server.lock:
+            self._table(request).pop(self._key(request["Key"]), None)
+        return {}
+
+    def _DynamoDB_20120810_Query(self, request: Dict) -> Dict:
+        # The fetcher only queries by partition key
+        partition_key = list(request["ExpressionAttributeValues"].values())[0]["S"]
+        with self.server.lock:
+            items = [
+                item
+                for (pk, _), item in sorted(self._table(request).items())
+                if pk == partition_key
+            ]
+        return {"Items": items, "Count": len(items), "ScannedCount": len(items)}
+
+
+def start(server: PortalStandIn) -> threading.Thread:
+    """Serve the stand-in in a background thread"""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def apply_environment(server: PortalStandIn) -> None:
+    """Point the fetcher, which reads its configuration on import, at the server"""
+    os.environ.update(server.environment())